@@ -0,0 +1,206 @@
+"""탐지 핫패스 벤치마크.
+
+target_samples 버튼으로 합성한 결과 화면(1080p/1440p/4K/Retina 2x)에서
+locate_image, _attempt_booking, _detect_reservation_state(예약 단계 탐지기), 매크로 1틱의 지연(p50/p95/p99)과
+호출당 메모리 할당량을 측정해 JSON으로 저장한다.
+
+    python -m benchmarks.bench_detection
+    python -m benchmarks.bench_detection --compare runtime/benchmarks/<이전 결과>.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from benchmarks.synthetic_pages import RESOLUTIONS, SCENARIOS, Resolution, build_page, load_scaled_samples, write_templates
+from srt_macro_reservation.capture_backend import SyntheticCaptureBackend
+from srt_macro_reservation.config import SRTConfig
+from srt_macro_reservation.input_backend import RecordingInputBackend
+from srt_macro_reservation.srt_macro_agent import SRTMacroAgent
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_OUTPUT_DIR = BASE_DIR / "runtime" / "benchmarks"
+
+
+class _SilentNotifier:
+    def notify_success(self, success_type: str):
+        pass
+
+    def close(self):
+        pass
+
+
+class _BenchContext:
+    def __init__(self, resolution: Resolution, work_dir: Path):
+        samples = load_scaled_samples(resolution)
+        target_dir = work_dir / resolution.name / "targets"
+        write_templates(samples, target_dir)
+
+        self.pages = {scenario: build_page(resolution, scenario, samples) for scenario in SCENARIOS}
+        result_region = self.pages["sold_out"].result_region
+        region_file = work_dir / resolution.name / "result_region.json"
+        region_file.write_text(
+            json.dumps(dict(zip(("x", "y", "width", "height"), result_region))),
+            encoding="utf-8",
+        )
+
+        self.capture = SyntheticCaptureBackend([page.image for page in self.pages.values()])
+        self._scenario_index = {scenario: index for index, scenario in enumerate(self.pages)}
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.agent = SRTMacroAgent(
+                SRTConfig(),
+                capture_backend=self.capture,
+                input_backend=RecordingInputBackend((resolution.width, resolution.height)),
+                target_dir=target_dir,
+                result_region_file=region_file,
+            )
+            self.agent.prepare()
+        self.agent._notifier = _SilentNotifier()
+        self.screen = self.agent._screen
+
+    def show(self, scenario: str):
+        self.capture.select(self._scenario_index[scenario])
+        self.screen.invalidate_frame()
+
+
+def _bench_cases(context: _BenchContext) -> dict[str, tuple[str, Callable[[], object]]]:
+    agent = context.agent
+    templates = agent._templates
+
+    def locate_image():
+        context.screen.invalidate_frame()
+        return context.screen.locate_image(templates.sold_out, region=None, retries=1, confidence=0.8)
+
+    def attempt_booking():
+        context.screen.invalidate_frame()
+        return agent._attempt_booking()
+
+    def detect_reservation_state():
+        context.screen.invalidate_frame()
+        return agent._detect_reservation_state()
+
+    def macro_tick():
+        agent.start_cycle()
+        agent._start_reservation_phase()
+        return agent.run_tick()
+
+    return {
+        "locate_image": ("sold_out", locate_image),
+        "attempt_booking": ("bookable", attempt_booking),
+        "detect_reservation_state": ("sold_out", detect_reservation_state),
+        "macro_tick": ("sold_out", macro_tick),
+    }
+
+
+def _measure(call: Callable[[], object], iterations: int, alloc_iterations: int) -> dict:
+    with contextlib.redirect_stdout(io.StringIO()):
+        call()
+        durations_ms = []
+        for _ in range(iterations):
+            started_at = time.perf_counter()
+            call()
+            durations_ms.append((time.perf_counter() - started_at) * 1000)
+
+        tracemalloc.start()
+        peaks_kib = []
+        for _ in range(alloc_iterations):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            call()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks_kib.append((peak - baseline) / 1024)
+        tracemalloc.stop()
+
+    durations = np.asarray(durations_ms)
+    return {
+        "iterations": iterations,
+        "mean_ms": round(float(durations.mean()), 3),
+        "p50_ms": round(float(np.percentile(durations, 50)), 3),
+        "p95_ms": round(float(np.percentile(durations, 95)), 3),
+        "p99_ms": round(float(np.percentile(durations, 99)), 3),
+        "peak_alloc_kib_per_call": round(float(np.median(peaks_kib)), 1),
+    }
+
+
+def run_benchmarks(resolutions: tuple[Resolution, ...], iterations: int, tick_iterations: int) -> dict:
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for resolution in resolutions:
+            context = _BenchContext(resolution, Path(tmpdir))
+            for bench_name, (scenario, call) in _bench_cases(context).items():
+                context.show(scenario)
+                bench_iterations = tick_iterations if bench_name == "macro_tick" else iterations
+                measured = _measure(call, bench_iterations, alloc_iterations=min(5, bench_iterations))
+                results.append({"resolution": resolution.name, "benchmark": bench_name, "scenario": scenario, **measured})
+                print(
+                    f"{resolution.name:>9} {bench_name:<24} p50={measured['p50_ms']:8.2f}ms "
+                    f"p95={measured['p95_ms']:8.2f}ms p99={measured['p99_ms']:8.2f}ms "
+                    f"alloc={measured['peak_alloc_kib_per_call']:9.1f}KiB"
+                )
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "opencv": cv2.__version__,
+        },
+        "results": results,
+    }
+
+
+def compare_results(current: dict, previous: dict):
+    previous_by_key = {(row["resolution"], row["benchmark"]): row for row in previous.get("results", [])}
+    print("\n이전 결과 대비 p50 변화")
+    for row in current["results"]:
+        before = previous_by_key.get((row["resolution"], row["benchmark"]))
+        if before is None or before["p50_ms"] <= 0:
+            continue
+        change = (row["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100
+        print(f"{row['resolution']:>9} {row['benchmark']:<21} {before['p50_ms']:8.2f}ms → {row['p50_ms']:8.2f}ms ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SRT 매크로 탐지 핫패스 벤치마크")
+    parser.add_argument("--iterations", type=int, default=30, help="벤치마크별 반복 횟수")
+    parser.add_argument("--tick-iterations", type=int, default=10, help="매크로 1틱 반복 횟수")
+    parser.add_argument(
+        "--resolutions",
+        default=",".join(resolution.name for resolution in RESOLUTIONS),
+        help="측정할 해상도 (쉼표 구분: 1080p,1440p,4k,retina2x)",
+    )
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (기본: runtime/benchmarks/<시각>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 경로")
+    args = parser.parse_args()
+
+    selected_names = {name.strip() for name in args.resolutions.split(",") if name.strip()}
+    resolutions = tuple(resolution for resolution in RESOLUTIONS if resolution.name in selected_names)
+    if not resolutions:
+        parser.error("알 수 없는 해상도입니다.")
+
+    report = run_benchmarks(resolutions, max(1, args.iterations), max(1, args.tick_iterations))
+
+    output_file = Path(args.output) if args.output else DEFAULT_OUTPUT_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    output_file.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n결과 저장: {output_file}")
+
+    if args.compare:
+        previous = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        compare_results(report, previous)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from srt_macro_reservation.models import Region
+
+SAMPLES_DIR = Path(__file__).resolve().parents[1] / "target_samples"
+
+# target_samples/*.png는 2배율(Retina) 화면에서 캡처되었으므로, 1배율 화면은 0.5배로 줄여 합성한다.
+SAMPLE_DEVICE_SCALE = 2.0
+
+# 매진.png 샘플 안에서 두 번째(일반실) 열 버튼 셀의 중심 좌표와 행 간격 (샘플 픽셀 기준)
+_SOLD_OUT_CELL_CENTER = (313, 64)
+_SOLD_OUT_ROW_PITCH = 114.5
+
+
+@dataclass(frozen=True)
+class Resolution:
+    name: str
+    width: int
+    height: int
+    device_scale: float
+
+    @property
+    def sample_scale(self) -> float:
+        return self.device_scale / SAMPLE_DEVICE_SCALE
+
+
+RESOLUTIONS = (
+    Resolution("1080p", 1920, 1080, 1.0),
+    Resolution("1440p", 2560, 1440, 1.0),
+    Resolution("4k", 3840, 2160, 2.0),
+    Resolution("retina2x", 2880, 1800, 2.0),
+)
+
+SCENARIOS = ("sold_out", "bookable", "connection_wait")
+
+
+@dataclass(frozen=True)
+class SyntheticPage:
+    resolution: Resolution
+    scenario: str
+    image: np.ndarray
+    result_region: Region
+
+
+def load_scaled_samples(resolution: Resolution) -> dict[str, np.ndarray]:
+    samples: dict[str, np.ndarray] = {}
+    for sample_path in sorted(SAMPLES_DIR.glob("*.png")):
+        with Image.open(sample_path) as image:
+            rgb = image.convert("RGB")
+            if resolution.sample_scale != 1.0:
+                scaled_size = (
+                    max(1, int(round(rgb.width * resolution.sample_scale))),
+                    max(1, int(round(rgb.height * resolution.sample_scale))),
+                )
+                rgb = rgb.resize(scaled_size, Image.Resampling.LANCZOS)
+            samples[sample_path.stem] = np.asarray(rgb)
+    return samples
+
+
+def write_templates(samples: dict[str, np.ndarray], target_dir: Path):
+    target_dir.mkdir(parents=True, exist_ok=True)
+    for name, image in samples.items():
+        Image.fromarray(image).save(target_dir / f"{name}.png")
+
+
+def build_page(resolution: Resolution, scenario: str, samples: dict[str, np.ndarray], seed: int = 0) -> SyntheticPage:
+    """target_samples 버튼을 합성해 SRT 조회 결과 화면과 비슷한 RGB 프레임을 만든다."""
+
+    rng = np.random.default_rng(seed)
+    width, height = resolution.width, resolution.height
+    scale = resolution.sample_scale
+    page = np.full((height, width, 3), 255, dtype=np.uint8)
+
+    header_height = int(120 * scale)
+    page[:header_height] = (38, 38, 60)
+    _paste(page, samples["조회하기"], int(width * 0.42), int(height * 0.12))
+
+    table = samples["매진"]
+    table_left = int(width * 0.35)
+    table_top = int(height * 0.25)
+    _paste(page, table, table_left, table_top)
+    _draw_text_columns(page, rng, table_left, table_top, table.shape[0], scale)
+
+    if scenario == "bookable":
+        center_x, center_y = _SOLD_OUT_CELL_CENTER
+        row_center_y = center_y + _SOLD_OUT_ROW_PITCH * 3
+        button = samples["예약하기"]
+        _paste(
+            page,
+            button,
+            table_left + int(center_x * scale) - button.shape[1] // 2,
+            table_top + int(row_center_y * scale) - button.shape[0] // 2,
+        )
+    elif scenario == "connection_wait":
+        overlay = samples["접속대기"]
+        _paste(page, overlay, (width - overlay.shape[1]) // 2, (height - overlay.shape[0]) // 2)
+
+    result_region = (
+        table_left,
+        table_top,
+        min(table.shape[1], width - table_left),
+        min(table.shape[0], height - table_top),
+    )
+    return SyntheticPage(resolution=resolution, scenario=scenario, image=page, result_region=result_region)
+
+
+def _draw_text_columns(page: np.ndarray, rng: np.random.Generator, table_left: int, table_top: int, table_height: int, scale: float):
+    # 열차번호/출발/도착 시각 등 버튼 왼쪽 텍스트 열을 짧은 회색 막대로 흉내 낸다.
+    row_pitch = int(_SOLD_OUT_ROW_PITCH * scale)
+    column_width = int(150 * scale)
+    text_height = max(2, int(18 * scale))
+    for row_top in range(table_top + row_pitch // 3, table_top + table_height - text_height, row_pitch):
+        for column in range(4):
+            bar_left = max(0, table_left - (column + 1) * column_width)
+            bar_width = int(rng.integers(column_width // 3, column_width - 4))
+            shade = int(rng.integers(40, 120))
+            page[row_top : row_top + text_height, bar_left : bar_left + bar_width] = shade
+
+
+def _paste(page: np.ndarray, image: np.ndarray, left: int, top: int):
+    height = min(image.shape[0], page.shape[0] - top)
+    width = min(image.shape[1], page.shape[1] - left)
+    if height <= 0 or width <= 0:
+        return
+    page[top : top + height, left : left + width] = image[:height, :width]
@@ -0,0 +1,45 @@
+import argparse
+from pathlib import Path
+
+from srt_macro_reservation.capture_backend import create_capture_backend
+from srt_macro_reservation.detection_profile import compile_detection_profile
+from srt_macro_reservation.input_backend import PyAutoGuiInputBackend
+from srt_macro_reservation.screen_controller import ScreenController
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시작 속도를 위한 탐지 프로필(템플릿/배율/ROI 묶음) 생성")
+    parser.add_argument("--target-dir", help="템플릿 폴더 (기본값: targets/)")
+    parser.add_argument("--state-dir", help="ROI/배율 파일 폴더이자 프로필 저장 폴더 (기본값: runtime/)")
+    parser.add_argument("--capture-backend", default="pyautogui", help="캡처 방식 (pyautogui/mss)")
+    args = parser.parse_args()
+
+    base_dir = Path(__file__).resolve().parent
+    target_dir = Path(args.target_dir) if args.target_dir else base_dir / "targets"
+    state_dir = Path(args.state_dir) if args.state_dir else base_dir / "runtime"
+    profile_file = state_dir / "detection_profile.npz"
+
+    print("\n현재 화면 해상도/좌표 배율을 확인합니다. 예매에 쓸 모니터에서 실행하세요.")
+    screen = ScreenController(
+        base_confidence=0.9,
+        capture_backend=create_capture_backend(args.capture_backend),
+        input_backend=PyAutoGuiInputBackend(),
+    )
+    try:
+        profile = compile_detection_profile(profile_file, target_dir, screen.screen_size(), screen.coordinate_scale)
+    except ValueError as error:
+        print(f"탐지 프로필 생성 실패: {error}")
+        return
+
+    width, height = profile.screen_size
+    print(f"- 화면: {width}x{height}, 좌표 배율 x{profile.coordinate_scale[0]:.3f}, y{profile.coordinate_scale[1]:.3f}")
+    print(f"- 템플릿: {len(profile.template_images)}개, 템플릿 배율 x{profile.template_scale:.2f}")
+    if profile.result_region:
+        print(f"- ROI: {profile.result_region}")
+    elif profile.auto_roi:
+        print(f"- ROI(자동): {profile.auto_roi.region}")
+    print(f"탐지 프로필 저장 완료: {profile_file}")
+
+
+if __name__ == "__main__":
+    main()
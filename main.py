@@ -1,10 +1,14 @@
 import argparse
 import os
+from pathlib import Path
 
-import dotenv
+from srt_macro_reservation.startup_report import startup_report
 
-from srt_macro_reservation.config import load_config_from_env
-from srt_macro_reservation.srt_macro_agent import SRTMacroAgent
+# 실행 모드별로 필요한 모듈만 import하고, 모듈별 import 시간을 시작 시간 분석에 남긴다.
+with startup_report.phase("import dotenv"):
+    import dotenv
+with startup_report.phase("import config (pydantic, numpy)"):
+    from srt_macro_reservation.config import load_config_from_env
 
 
 def _parse_bool_arg(value: str) -> bool:
@@ -26,6 +30,10 @@ def parse_cli_args(argv: list[str] | None = None) -> argparse.Namespace:
         type=_parse_bool_arg,
         help="예약대기(신청하기) 자동 시도 여부 (true/false)",
     )
+    parser.add_argument(
+        "--booking-priority",
+        help="예약 버튼 선택 우선순위 (쉼표 구분: template, earliest, latest, standard, first)",
+    )
     parser.add_argument(
         "--roi-enabled",
         type=_parse_bool_arg,
@@ -41,6 +49,96 @@ def parse_cli_args(argv: list[str] | None = None) -> argparse.Namespace:
         type=float,
         help="조회 버튼 클릭 후 결과 렌더링 대기 시간(초)",
     )
+    parser.add_argument(
+        "--refresh-rate-per-minute",
+        type=float,
+        help="분당 조회하기 클릭 상한 (0이면 제한 없음)",
+    )
+    parser.add_argument(
+        "--fast-refresh-enabled",
+        type=_parse_bool_arg,
+        help="조회하기 버튼 위치를 기억해 스크롤/전체 탐색 없이 바로 누를지 여부 (true/false)",
+    )
+    parser.add_argument(
+        "--auto-roi-enabled",
+        type=_parse_bool_arg,
+        help="ROI 파일이 없을 때 결과 영역 자동 탐색 여부 (true/false)",
+    )
+    parser.add_argument(
+        "--spatial-memory-enabled",
+        type=_parse_bool_arg,
+        help="버튼을 마지막으로 찾은 위치 주변 우선 탐색 여부 (true/false)",
+    )
+    parser.add_argument(
+        "--change-gate-enabled",
+        type=_parse_bool_arg,
+        help="화면 변화가 없으면 예약 단계 매칭 생략 여부 (true/false)",
+    )
+    parser.add_argument(
+        "--pyramid-matching-enabled",
+        type=_parse_bool_arg,
+        help="전체 화면 탐색 시 축소 화면 후보 탐색 후 원본 검증 여부 (true/false)",
+    )
+    parser.add_argument(
+        "--detector-workers",
+        type=int,
+        help="예약 단계 탐지를 동시에 실행할 스레드 수 (0/1이면 순차 실행)",
+    )
+    parser.add_argument(
+        "--template-scale-enabled",
+        type=_parse_bool_arg,
+        help="조회하기 버튼을 못 찾으면 여러 배율로 찾아 템플릿 크기 자동 보정 여부 (true/false)",
+    )
+    parser.add_argument(
+        "--detection-profile-enabled",
+        type=_parse_bool_arg,
+        help="탐지 프로필(runtime/detection_profile.npz) 사용 여부 (true/false)",
+    )
+    parser.add_argument(
+        "--warmup",
+        dest="warmup_enabled",
+        type=_parse_bool_arg,
+        nargs="?",
+        const=True,
+        help="단축키 대기 전에 화면 캡처/템플릿 준비를 미리 실행 (값 생략 시 true)",
+    )
+    parser.add_argument(
+        "--armed-warm-interval-sec",
+        type=float,
+        help="시작 단축키 대기 중 템플릿 캐시/매칭 경로를 데우는 주기(초, 0이면 사용 안 함)",
+    )
+    parser.add_argument(
+        "--multi-session-file",
+        help="멀티 세션 설정 JSON 파일 (예: runtime/sessions.json)",
+    )
+    parser.add_argument(
+        "--adaptive-settle-enabled",
+        type=_parse_bool_arg,
+        help="조회 후 결과 영역 변화 감지로 대기 시간 자동 조절 여부 (true/false)",
+    )
+    parser.add_argument("--settle-max-delay-sec", type=float, help="자동 대기 모드의 최대 대기 시간(초)")
+    parser.add_argument(
+        "--capture-backend",
+        choices=("pyautogui", "mss", "region", "synthetic"),
+        help="화면 캡처 방식 (pyautogui/mss/region/synthetic)",
+    )
+    parser.add_argument(
+        "--input-backend",
+        choices=("pyautogui", "teleport"),
+        help="클릭 입력 방식 (pyautogui/teleport)",
+    )
+    parser.add_argument("--synthetic-frames-dir", help="synthetic 캡처 백엔드가 사용할 PNG 프레임 폴더")
+    parser.add_argument(
+        "--enable-latency-stats",
+        type=_parse_bool_arg,
+        help="구간별 지연 통계 출력 여부 (true/false)",
+    )
+    parser.add_argument("--latency-stats-interval-sec", type=float, help="지연 통계 출력 주기(초)")
+    parser.add_argument(
+        "--enable-latency-trace",
+        type=_parse_bool_arg,
+        help="지연 구간 JSONL 트레이스 저장 여부 (true/false)",
+    )
     parser.add_argument(
         "--enable-telegram-notification",
         type=_parse_bool_arg,
@@ -48,6 +146,18 @@ def parse_cli_args(argv: list[str] | None = None) -> argparse.Namespace:
     )
     parser.add_argument("--telegram-bot-token", help="텔레그램 봇 토큰")
     parser.add_argument("--telegram-chat-id", help="텔레그램 채팅 ID")
+    parser.add_argument(
+        "--telegram-screenshot-enabled",
+        type=_parse_bool_arg,
+        help="성공 알림에 클릭 직전 화면(ROI) 사진 첨부 여부 (true/false)",
+    )
+    parser.add_argument("--replay", help="녹화된 세션 폴더로 오프라인 리플레이 실행 (예: runtime/sessions/<id>/)")
+    parser.add_argument("--replay-report", help="리플레이 결과 JSON 저장 경로")
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="실행부터 단축키 대기까지 import/초기화 단계별 시간 출력",
+    )
     return parser.parse_args(argv)
 
 
@@ -57,12 +167,34 @@ def apply_cli_overrides(args: argparse.Namespace) -> None:
         "stop_hotkey": "STOP_HOTKEY",
         "image_match_confidence": "IMAGE_MATCH_CONFIDENCE",
         "enable_waiting_list": "ENABLE_WAITING_LIST",
+        "booking_priority": "BOOKING_PRIORITY",
         "roi_enabled": "ROI_ENABLED",
         "reservation_scan_timeout_sec": "RESERVATION_SCAN_TIMEOUT_SEC",
         "refresh_settle_delay_sec": "REFRESH_SETTLE_DELAY_SEC",
+        "refresh_rate_per_minute": "REFRESH_RATE_PER_MINUTE",
+        "fast_refresh_enabled": "FAST_REFRESH_ENABLED",
+        "auto_roi_enabled": "AUTO_ROI_ENABLED",
+        "spatial_memory_enabled": "SPATIAL_MEMORY_ENABLED",
+        "change_gate_enabled": "CHANGE_GATE_ENABLED",
+        "pyramid_matching_enabled": "PYRAMID_MATCHING_ENABLED",
+        "detector_workers": "DETECTOR_WORKERS",
+        "template_scale_enabled": "TEMPLATE_SCALE_ENABLED",
+        "detection_profile_enabled": "DETECTION_PROFILE_ENABLED",
+        "warmup_enabled": "WARMUP_ENABLED",
+        "armed_warm_interval_sec": "ARMED_WARM_INTERVAL_SEC",
+        "multi_session_file": "MULTI_SESSION_FILE",
+        "adaptive_settle_enabled": "ADAPTIVE_SETTLE_ENABLED",
+        "settle_max_delay_sec": "SETTLE_MAX_DELAY_SEC",
+        "capture_backend": "CAPTURE_BACKEND",
+        "input_backend": "INPUT_BACKEND",
+        "synthetic_frames_dir": "SYNTHETIC_FRAMES_DIR",
+        "enable_latency_stats": "ENABLE_LATENCY_STATS",
+        "latency_stats_interval_sec": "LATENCY_STATS_INTERVAL_SEC",
+        "enable_latency_trace": "ENABLE_LATENCY_TRACE",
         "enable_telegram_notification": "ENABLE_TELEGRAM_NOTIFICATION",
         "telegram_bot_token": "TELEGRAM_BOT_TOKEN",
         "telegram_chat_id": "TELEGRAM_CHAT_ID",
+        "telegram_screenshot_enabled": "TELEGRAM_SCREENSHOT_ENABLED",
     }
     for field, env_key in arg_to_env.items():
         value = getattr(args, field, None)
@@ -79,7 +211,26 @@ if __name__ == "__main__":
 
     cli_args = parse_cli_args()
     apply_cli_overrides(cli_args)
+    startup_report.enabled = cli_args.startup_report
+
+    with startup_report.phase("설정 읽기"):
+        srt_config = load_config_from_env()
+    if cli_args.replay:
+        from srt_macro_reservation.replay import run_replay
+
+        run_replay(
+            Path(cli_args.replay),
+            srt_config,
+            report_file=Path(cli_args.replay_report) if cli_args.replay_report else None,
+        )
+    elif srt_config.multi_session_file:
+        from srt_macro_reservation.multi_session import MultiSessionRunner, load_session_specs
 
-    srt_config = load_config_from_env()
-    macro_agent = SRTMacroAgent(srt_config)
-    macro_agent.run()
+        session_specs = load_session_specs(Path(srt_config.multi_session_file), Path(__file__).resolve().parent)
+        MultiSessionRunner(srt_config, session_specs).run()
+    else:
+        with startup_report.phase("import srt_macro_agent"):
+            from srt_macro_reservation.srt_macro_agent import SRTMacroAgent
+        with startup_report.phase("에이전트 생성"):
+            macro_agent = SRTMacroAgent(srt_config)
+        macro_agent.run()
@@ -0,0 +1,55 @@
+import argparse
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+from PIL import Image
+
+from srt_macro_reservation.capture_backend import create_capture_backend
+
+
+def main():
+    parser = argparse.ArgumentParser(description="리플레이용 화면 세션 녹화")
+    parser.add_argument("--duration-sec", type=float, default=10.0, help="녹화 시간(초)")
+    parser.add_argument("--interval-sec", type=float, default=0.1, help="프레임 캡처 간격(초)")
+    parser.add_argument("--capture-backend", default="pyautogui", help="캡처 방식 (pyautogui/mss)")
+    args = parser.parse_args()
+
+    base_dir = Path(__file__).resolve().parent
+    session_dir = base_dir / "runtime" / "sessions" / datetime.now().strftime("%Y%m%d-%H%M%S")
+    session_dir.mkdir(parents=True, exist_ok=True)
+
+    capture = create_capture_backend(args.capture_backend)
+    print(f"\n{args.duration_sec:.1f}초 동안 화면을 녹화합니다. 브라우저에서 평소처럼 조작하세요.")
+
+    captured: list[tuple[str, float]] = []
+    started_at = time.monotonic()
+    while time.monotonic() - started_at < args.duration_sec:
+        captured_at = time.monotonic() - started_at
+        frame = capture.grab(None)
+        file_name = f"{len(captured):05d}.png"
+        Image.fromarray(frame.image).save(session_dir / file_name)
+        captured.append((file_name, captured_at))
+        time.sleep(max(0.0, args.interval_sec - (time.monotonic() - started_at - captured_at)))
+    capture.close()
+
+    frames = []
+    for index, (file_name, captured_at) in enumerate(captured):
+        next_at = captured[index + 1][1] if index + 1 < len(captured) else None
+        frames.append(
+            {
+                "file": file_name,
+                "hold_sec": round(next_at - captured_at, 4) if next_at is not None else None,
+                "advance_on_click": False,
+                "page": None,
+            }
+        )
+
+    manifest_file = session_dir / "session.json"
+    manifest_file.write_text(json.dumps({"frames": frames}, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"세션 저장 완료: {session_dir} ({len(frames)}프레임)")
+
+
+if __name__ == "__main__":
+    main()
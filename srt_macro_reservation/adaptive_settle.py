@@ -0,0 +1,100 @@
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+
+from srt_macro_reservation.frame_fingerprint import mean_abs_difference
+
+
+@dataclass(frozen=True)
+class SettleResult:
+    elapsed_sec: float
+    changed: bool
+    stabilized: bool
+
+
+class AdaptiveSettle:
+    """조회하기 클릭 후 결과 영역이 바뀌었다가 멈출 때까지만 기다리는 대기 전략.
+
+    화면 변화가 보이지 않으면 관측된 렌더링 시간으로 학습한 상한까지만 기다리고,
+    상한은 고정 대기 시간(base_delay_sec) 아래로 내려가지 않는다.
+    """
+
+    def __init__(
+        self,
+        base_delay_sec: float,
+        max_delay_sec: float,
+        poll_interval_sec: float = 0.015,
+        change_threshold: float = 2.0,
+        stable_polls: int = 2,
+        history_size: int = 50,
+    ):
+        self._base_delay_sec = base_delay_sec
+        self._max_delay_sec = max(base_delay_sec, max_delay_sec)
+        self._poll_interval_sec = poll_interval_sec
+        self._change_threshold = change_threshold
+        self._stable_polls = stable_polls
+        self._render_times: deque[float] = deque(maxlen=history_size)
+
+    @property
+    def upper_bound_sec(self) -> float:
+        if not self._render_times:
+            return self._base_delay_sec
+        learned = float(np.percentile(self._render_times, 90)) * 1.25
+        return min(self._max_delay_sec, max(self._base_delay_sec, learned))
+
+    @property
+    def render_estimate_sec(self) -> float | None:
+        if not self._render_times:
+            return None
+        return float(np.median(self._render_times))
+
+    def wait(
+        self,
+        baseline: np.ndarray | None,
+        sample: Callable[[], np.ndarray | None],
+        sleep: Callable[[float], None] = time.sleep,
+        should_stop: Callable[[], bool] | None = None,
+    ) -> SettleResult:
+        """should_stop이 True를 돌려주면 (중지/종료 요청) 화면을 더 보지 않고 바로 돌아온다."""
+
+        started_at = time.monotonic()
+        if baseline is None:
+            sleep(self._base_delay_sec)
+            return SettleResult(elapsed_sec=time.monotonic() - started_at, changed=False, stabilized=False)
+
+        upper_bound_sec = self.upper_bound_sec
+        previous = baseline
+        last_change_at: float | None = None
+        stable_count = 0
+        while True:
+            elapsed_sec = time.monotonic() - started_at
+            deadline_sec = self._max_delay_sec if last_change_at is not None else upper_bound_sec
+            if elapsed_sec >= deadline_sec:
+                return SettleResult(elapsed_sec=elapsed_sec, changed=last_change_at is not None, stabilized=False)
+
+            sleep(min(self._poll_interval_sec, deadline_sec - elapsed_sec))
+            if should_stop is not None and should_stop():
+                return SettleResult(
+                    elapsed_sec=time.monotonic() - started_at,
+                    changed=last_change_at is not None,
+                    stabilized=False,
+                )
+            current = sample()
+            if current is None:
+                continue
+            now = time.monotonic()
+            if last_change_at is None:
+                if mean_abs_difference(current, baseline) >= self._change_threshold:
+                    last_change_at = now
+            elif mean_abs_difference(current, previous) >= self._change_threshold:
+                last_change_at = now
+                stable_count = 0
+            else:
+                stable_count += 1
+                if stable_count >= self._stable_polls:
+                    self._render_times.append(last_change_at - started_at)
+                    return SettleResult(elapsed_sec=now - started_at, changed=True, stabilized=True)
+            previous = current
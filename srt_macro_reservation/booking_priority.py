@@ -0,0 +1,16 @@
+# 설정 검증(config)에서도 쓰므로 numpy 등 무거운 모듈을 import하지 않는다.
+
+# 예약 우선순위 규칙. 앞에 적은 규칙일수록 먼저 비교한다.
+#  template: 예약하기 템플릿 파일 순서 (기존 동작)
+#  earliest/latest: 위쪽(이른 출발)/아래쪽(늦은 출발) 행
+#  standard/first: 일반실/특실 좌석
+PRIORITY_RULES = ("template", "earliest", "latest", "standard", "first")
+DEFAULT_PRIORITY = ("template", "earliest")
+
+
+def parse_priority(value: str) -> tuple[str, ...]:
+    rules = tuple(rule.strip().lower() for rule in value.split(",") if rule.strip())
+    unknown = [rule for rule in rules if rule not in PRIORITY_RULES]
+    if unknown:
+        raise ValueError(f"알 수 없는 예약 우선순위 규칙: {', '.join(unknown)} (사용 가능: {', '.join(PRIORITY_RULES)})")
+    return rules or DEFAULT_PRIORITY
@@ -0,0 +1,307 @@
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from srt_macro_reservation.models import Region
+
+
+@dataclass(frozen=True)
+class Frame:
+    image: np.ndarray
+    left: int = 0
+    top: int = 0
+    partial: bool = False
+
+    @property
+    def width(self) -> int:
+        return int(self.image.shape[1])
+
+    @property
+    def height(self) -> int:
+        return int(self.image.shape[0])
+
+    def covers(self, region: Region | None) -> bool:
+        if region is None:
+            return not self.partial
+        left, top, width, height = region
+        return (
+            left >= self.left
+            and top >= self.top
+            and left + width <= self.left + self.width
+            and top + height <= self.top + self.height
+        )
+
+    def crop(self, region: Region) -> "Frame":
+        """region과 겹치는 부분만 잘라낸 부분 프레임 (이미지는 복사하지 않은 뷰)."""
+
+        left, top, width, height = region
+        crop_left = min(self.width, max(0, left - self.left))
+        crop_top = min(self.height, max(0, top - self.top))
+        crop_right = min(self.width, max(crop_left, left + width - self.left))
+        crop_bottom = min(self.height, max(crop_top, top + height - self.top))
+        return Frame(
+            image=self.image[crop_top:crop_bottom, crop_left:crop_right],
+            left=self.left + crop_left,
+            top=self.top + crop_top,
+            partial=True,
+        )
+
+
+def to_gray(image: np.ndarray) -> np.ndarray:
+    """RGB/RGBA 배열을 그레이스케일로 변환 (이미 2차원이면 그대로 반환)."""
+
+    if image.ndim == 2:
+        return image
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_RGBA2GRAY)
+    return cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+
+
+class CaptureBackend:
+    name = "base"
+    captures_region_only = False
+
+    def grab(self, region: Region | None) -> Frame:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PyAutoGuiCaptureBackend(CaptureBackend):
+    name = "pyautogui"
+
+    def __init__(self):
+        import pyautogui  # noqa: PLC0415
+
+        self._pyautogui = pyautogui
+
+    def grab(self, region: Region | None) -> Frame:
+        screenshot = self._pyautogui.screenshot(region=region)
+        image = to_gray(np.asarray(screenshot.convert("RGB")))
+        if region is None:
+            return Frame(image=image)
+        return Frame(image=image, left=region[0], top=region[1], partial=True)
+
+
+class MssCaptureBackend(CaptureBackend):
+    """mss(X11 SHM/GDI/CoreGraphics)로 캡처해 BGRA 버퍼를 복사 없이 NumPy 뷰로 받는 백엔드."""
+
+    name = "mss"
+
+    def __init__(self):
+        import mss  # noqa: PLC0415
+
+        self._mss_module = mss
+        self._local = threading.local()
+        # close()에서 모든 스레드의 인스턴스를 닫을 수 있도록 만든 것을 모두 기억한다.
+        self._grabbers: set = set()
+        self._grabbers_lock = threading.Lock()
+        self._scale_x = 1.0
+        self._scale_y = 1.0
+        self._scale_measured = False
+
+    def grab(self, region: Region | None) -> Frame:
+        grabber = self._grabber()
+        monitor = grabber.monitors[1]
+        if not self._scale_measured:
+            self._measure_scale(grabber, monitor)
+
+        if region is None:
+            return Frame(image=self._grab_gray(grabber, monitor))
+
+        left, top, width, height = region
+        target = {
+            "left": monitor["left"] + int(left * self._scale_x),
+            "top": monitor["top"] + int(top * self._scale_y),
+            "width": max(1, int(round(width * self._scale_x))),
+            "height": max(1, int(round(height * self._scale_y))),
+        }
+        image = self._grab_gray(grabber, target)
+        return Frame(image=image, left=left, top=top, partial=True)
+
+    def close(self):
+        with self._grabbers_lock:
+            grabbers = list(self._grabbers)
+            self._grabbers.clear()
+        for grabber in grabbers:
+            grabber.close()
+        self._local.grabber = None
+
+    def _grabber(self):
+        # mss 인스턴스는 스레드마다 별도 디바이스 컨텍스트가 필요하다. close()로 닫힌 것은 새로 만든다.
+        grabber = getattr(self._local, "grabber", None)
+        if grabber is None or grabber not in self._grabbers:
+            grabber = self._mss_module.mss()
+            with self._grabbers_lock:
+                self._grabbers.add(grabber)
+            self._local.grabber = grabber
+        return grabber
+
+    def _measure_scale(self, grabber, monitor: dict):
+        shot = grabber.grab(monitor)
+        if shot.width > 0 and shot.height > 0:
+            self._scale_x = monitor["width"] / shot.width
+            self._scale_y = monitor["height"] / shot.height
+        self._scale_measured = True
+
+    @staticmethod
+    def _grab_gray(grabber, monitor: dict) -> np.ndarray:
+        bgra = np.asarray(grabber.grab(monitor))
+        return cv2.cvtColor(bgra, cv2.COLOR_BGRA2GRAY)
+
+
+class RegionCaptureBackend(CaptureBackend):
+    """탐색 영역(ROI)만 캡처하는 백엔드. 전체 화면 탐색 요청일 때만 전체를 캡처."""
+
+    captures_region_only = True
+
+    def __init__(self, inner: CaptureBackend):
+        self._inner = inner
+        self.name = f"region+{inner.name}"
+
+    def grab(self, region: Region | None) -> Frame:
+        return self._inner.grab(region)
+
+    def close(self):
+        self._inner.close()
+
+
+class SharedCaptureSource:
+    """여러 세션이 한 번의 전체 화면 캡처를 나눠 쓰게 하는 공유 캡처 원본.
+
+    세션마다 view()로 받은 백엔드를 쓰며, 최근 max_age_sec 안에 찍은 프레임 중 그 세션이 아직 받지
+    않은 것이 있으면 새로 캡처하지 않고 돌려준다. 입력(클릭/스크롤) 후에는 expire()로 프레임을 버린다.
+    """
+
+    def __init__(self, inner: CaptureBackend, max_age_sec: float = 0.05):
+        self._inner = inner
+        self._max_age_sec = max_age_sec
+        self._lock = threading.Lock()
+        self._frame: Frame | None = None
+        self._captured_at = 0.0
+        self._generation = 0
+        self.capture_count = 0
+
+    def view(self) -> "SharedCaptureView":
+        return SharedCaptureView(self, f"shared+{self._inner.name}")
+
+    def expire(self):
+        with self._lock:
+            self._frame = None
+
+    def grab_for(self, view: "SharedCaptureView") -> Frame:
+        # 캡처를 잠금 안에서 해, 동시에 요청한 세션들은 한 번의 캡처를 기다렸다가 같이 쓴다.
+        with self._lock:
+            stale = (
+                self._frame is None
+                or view.seen_generation == self._generation
+                or time.monotonic() - self._captured_at > self._max_age_sec
+            )
+            if stale:
+                self._frame = self._inner.grab(None)
+                self._captured_at = time.monotonic()
+                self._generation += 1
+                self.capture_count += 1
+            view.seen_generation = self._generation
+            return self._frame
+
+    def close(self):
+        self._inner.close()
+
+
+class SharedCaptureView(CaptureBackend):
+    """SharedCaptureSource의 세션별 캡처 백엔드. 같은 프레임을 한 세션에 두 번 주지 않는다."""
+
+    def __init__(self, source: SharedCaptureSource, name: str):
+        self._source = source
+        self.name = name
+        self.seen_generation = -1
+
+    def grab(self, region: Region | None) -> Frame:
+        return self._source.grab_for(self)
+
+
+class SyntheticCaptureBackend(CaptureBackend):
+    """PNG 파일이나 배열로 준비한 프레임을 화면 대신 돌려주는 백엔드 (헤드리스 실행/벤치마크용)."""
+
+    name = "synthetic"
+
+    def __init__(self, frames: list[np.ndarray | Path] | tuple[np.ndarray | Path, ...], loop: bool = True):
+        if not frames:
+            raise ValueError("synthetic 캡처 백엔드에는 프레임이 최소 1개 필요합니다.")
+        self._frames = [self._prepare(frame) for frame in frames]
+        self._index = 0
+        self._loop = loop
+        self.grab_count = 0
+
+    @classmethod
+    def from_directory(cls, frames_dir: Path, loop: bool = True) -> "SyntheticCaptureBackend":
+        frame_paths = sorted(frames_dir.glob("*.png"))
+        if not frame_paths:
+            raise ValueError(f"synthetic 프레임 폴더에 PNG 파일이 없습니다: {frames_dir}")
+        return cls(frame_paths, loop=loop)
+
+    @property
+    def current(self) -> np.ndarray:
+        return self._frames[self._index]
+
+    def set_frame(self, frame: np.ndarray | Path):
+        self._frames[self._index] = self._prepare(frame)
+
+    def select(self, index: int):
+        if not 0 <= index < len(self._frames):
+            raise IndexError(f"synthetic 프레임 번호가 범위를 벗어났습니다: {index}")
+        self._index = index
+
+    def advance(self) -> bool:
+        if self._index + 1 < len(self._frames):
+            self._index += 1
+            return True
+        if self._loop:
+            self._index = 0
+            return True
+        return False
+
+    def grab(self, region: Region | None) -> Frame:
+        self.grab_count += 1
+        image = self.current
+        if region is None:
+            return Frame(image=image)
+
+        left, top, width, height = region
+        cropped = image[max(0, top) : max(0, top + height), max(0, left) : max(0, left + width)]
+        return Frame(image=cropped, left=max(0, left), top=max(0, top), partial=True)
+
+    @staticmethod
+    def _prepare(frame: np.ndarray | Path) -> np.ndarray:
+        if isinstance(frame, Path):
+            with Image.open(frame) as image:
+                frame = np.asarray(image.convert("RGB"))
+        gray = np.ascontiguousarray(to_gray(np.asarray(frame)), dtype=np.uint8)
+        gray.setflags(write=False)
+        return gray
+
+
+def create_capture_backend(name: str, synthetic_frames_dir: Path | None = None) -> CaptureBackend:
+    if name == "synthetic":
+        if synthetic_frames_dir is None:
+            raise ValueError("synthetic 캡처 백엔드는 SYNTHETIC_FRAMES_DIR 설정이 필요합니다.")
+        return SyntheticCaptureBackend.from_directory(synthetic_frames_dir)
+
+    if name in {"mss", "region"}:
+        try:
+            fast_backend: CaptureBackend = MssCaptureBackend()
+        except ImportError:
+            print("- mss 패키지가 없어 pyautogui 캡처로 대체합니다. (pip install mss)")
+            fast_backend = PyAutoGuiCaptureBackend()
+        if name == "region":
+            return RegionCaptureBackend(fast_backend)
+        return fast_backend
+
+    return PyAutoGuiCaptureBackend()
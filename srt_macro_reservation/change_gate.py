@@ -0,0 +1,40 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+
+
+class ChangeGate:
+    """탐지 결과가 '아무것도 없음'이었던 화면 지문을 기억해, 같은 화면에서는 템플릿 매칭을 건너뛴다.
+
+    매칭은 같은 프레임에 대해 항상 같은 결과를 내므로, 버튼/매진/접속대기가 없던 화면과
+    지문이 같으면 다시 매칭할 필요가 없다. 단, 매칭 조건(템플릿 배율, ROI, 버튼 위치 기록)이
+    바뀌면 같은 화면에서도 결과가 달라질 수 있으므로 기억을 버린다 (sync_context).
+    """
+
+    def __init__(self, max_entries: int = 8):
+        self._max_entries = max(1, max_entries)
+        self._idle_fingerprints: OrderedDict[bytes, None] = OrderedDict()
+        self._context: Hashable = None
+        self.skipped_count = 0
+
+    def sync_context(self, context: Hashable):
+        """매칭 조건이 지난번과 다르면 기억한 지문을 모두 버린다."""
+
+        if context != self._context:
+            self._context = context
+            self._idle_fingerprints.clear()
+
+    def is_known_idle(self, fingerprint: bytes) -> bool:
+        if fingerprint not in self._idle_fingerprints:
+            return False
+        self._idle_fingerprints.move_to_end(fingerprint)
+        self.skipped_count += 1
+        return True
+
+    def remember_idle(self, fingerprint: bytes):
+        self._idle_fingerprints[fingerprint] = None
+        self._idle_fingerprints.move_to_end(fingerprint)
+        while len(self._idle_fingerprints) > self._max_entries:
+            self._idle_fingerprints.popitem(last=False)
+
+    def clear(self):
+        self._idle_fingerprints.clear()
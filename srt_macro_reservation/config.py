@@ -1,7 +1,10 @@
 import os
+from typing import Literal
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
+from srt_macro_reservation.booking_priority import parse_priority
+
 
 class SRTConfig(BaseModel):
     start_hotkey: str = Field("f9", description="매크로 시작 단축키")
@@ -16,6 +19,10 @@ class SRTConfig(BaseModel):
         True,
         description="예약대기(신청하기) 자동 시도 여부",
     )
+    booking_priority: str = Field(
+        "template,earliest",
+        description="예약 버튼 선택 우선순위 (쉼표 구분: template, earliest, latest, standard, first)",
+    )
     roi_enabled: bool = Field(
         True,
         description="저장된 결과 영역(ROI) 사용 여부",
@@ -32,6 +39,96 @@ class SRTConfig(BaseModel):
         le=2.0,
         description="조회 클릭 후 결과 렌더링 대기 시간(초)",
     )
+    refresh_rate_per_minute: float = Field(
+        0.0,
+        ge=0.0,
+        le=600.0,
+        description="분당 조회하기 클릭 상한 (접속대기가 보이면 자동으로 낮춤, 0이면 제한 없음)",
+    )
+    fast_refresh_enabled: bool = Field(
+        True,
+        description="조회하기 버튼 위치를 기억해, 다음 조회는 스크롤/전체 탐색 없이 그 자리만 확인하고 누를지 여부",
+    )
+    auto_roi_enabled: bool = Field(
+        True,
+        description="ROI 파일이 없을 때 조회하기 버튼 기준으로 결과 영역을 자동으로 찾을지 여부",
+    )
+    spatial_memory_enabled: bool = Field(
+        True,
+        description="버튼을 마지막으로 찾은 위치 주변을 먼저 탐색할지 여부",
+    )
+    change_gate_enabled: bool = Field(
+        True,
+        description="화면이 그대로면 예약 단계 템플릿 매칭을 건너뛸지 여부",
+    )
+    pyramid_matching_enabled: bool = Field(
+        True,
+        description="전체 화면 탐색 시 축소 화면에서 후보를 찾은 뒤 원본으로 검증할지 여부",
+    )
+    detector_workers: int = Field(
+        4,
+        ge=0,
+        le=16,
+        description="예약 단계 탐지(예약/예약대기/접속대기/매진)를 동시에 실행할 스레드 수 (0/1이면 순차 실행)",
+    )
+    template_scale_enabled: bool = Field(
+        True,
+        description="조회하기 버튼을 못 찾으면 여러 배율로 찾아 템플릿 크기를 화면(브라우저 확대/HiDPI)에 맞출지 여부",
+    )
+    detection_profile_enabled: bool = Field(
+        True,
+        description="runtime/detection_profile.npz 탐지 프로필이 있으면 시작 시 사용할지 여부",
+    )
+    warmup_enabled: bool = Field(
+        False,
+        description="단축키 대기 전에 화면 캡처/템플릿 디코딩 등 첫 틱 준비를 미리 할지 여부 (끄면 첫 틱에서 준비)",
+    )
+    armed_warm_interval_sec: float = Field(
+        1.0,
+        ge=0.0,
+        le=60.0,
+        description="시작 단축키를 기다리는 동안 템플릿 캐시/매칭 경로를 데우는 주기(초, 0이면 사용 안 함)",
+    )
+    multi_session_file: str | None = Field(
+        None,
+        description="멀티 세션 설정 JSON 파일 (지정하면 여러 창/노선을 한 프로세스에서 함께 조회)",
+    )
+    adaptive_settle_enabled: bool = Field(
+        False,
+        description="조회 후 결과 영역 변화를 감지해 대기 시간을 자동 조절할지 여부",
+    )
+    settle_max_delay_sec: float = Field(
+        1.5,
+        ge=0.1,
+        le=5.0,
+        description="자동 대기 모드의 최대 대기 시간(초)",
+    )
+    capture_backend: Literal["pyautogui", "mss", "region", "synthetic"] = Field(
+        "pyautogui",
+        description="화면 캡처 방식 (pyautogui/mss/region/synthetic)",
+    )
+    input_backend: Literal["pyautogui", "teleport"] = Field(
+        "pyautogui",
+        description="클릭 입력 방식 (pyautogui: 커서 이동 후 클릭, teleport: 이동 없이 목표 좌표에 바로 클릭)",
+    )
+    synthetic_frames_dir: str | None = Field(
+        None,
+        description="synthetic 캡처 백엔드가 사용할 PNG 프레임 폴더",
+    )
+    enable_latency_stats: bool = Field(
+        False,
+        description="캡처/매칭/클릭/대기 구간 지연 통계 출력 여부",
+    )
+    latency_stats_interval_sec: float = Field(
+        5.0,
+        ge=1.0,
+        le=60.0,
+        description="지연 통계 출력 주기(초)",
+    )
+    enable_latency_trace: bool = Field(
+        False,
+        description="지연 구간 JSONL 트레이스(runtime/traces/) 저장 여부",
+    )
     enable_telegram_notification: bool = Field(
         False,
         description="텔레그램 알림 사용 여부",
@@ -44,6 +141,10 @@ class SRTConfig(BaseModel):
         None,
         description="텔레그램 채팅 ID",
     )
+    telegram_screenshot_enabled: bool = Field(
+        True,
+        description="성공 알림에 클릭 직전 화면(ROI) 사진 첨부 여부",
+    )
 
     @field_validator("start_hotkey", "stop_hotkey")
     @classmethod
@@ -53,10 +154,22 @@ class SRTConfig(BaseModel):
             raise ValueError("단축키는 비어 있을 수 없습니다.")
         return normalized
 
+    @field_validator("booking_priority")
+    @classmethod
+    def validate_booking_priority(cls, value: str) -> str:
+        return ",".join(parse_priority(value))
+
+    @field_validator("capture_backend", "input_backend", mode="before")
+    @classmethod
+    def normalize_backend_name(cls, value: str) -> str:
+        return value.strip().lower() if isinstance(value, str) else value
+
     @model_validator(mode="after")
     def validate_config(self):
         if self.start_hotkey == self.stop_hotkey:
             raise ValueError("시작/중지 단축키는 서로 달라야 합니다.")
+        if self.capture_backend == "synthetic" and not self.synthetic_frames_dir:
+            raise ValueError("synthetic 캡처 백엔드는 SYNTHETIC_FRAMES_DIR 설정이 필요합니다.")
         return self
 
 
@@ -83,6 +196,16 @@ def _parse_float_env(key: str, default: float) -> float:
         raise ValueError(f"{key} 환경변수는 숫자여야 합니다.") from exc
 
 
+def _parse_int_env(key: str, default: int) -> int:
+    raw_value = os.getenv(key)
+    if raw_value is None or not raw_value.strip():
+        return default
+    try:
+        return int(raw_value)
+    except ValueError as exc:
+        raise ValueError(f"{key} 환경변수는 정수여야 합니다.") from exc
+
+
 def _parse_str_env(key: str, default: str) -> str:
     raw_value = os.getenv(key)
     if raw_value is None:
@@ -107,10 +230,32 @@ def load_config_from_env() -> SRTConfig:
         stop_hotkey=_parse_str_env("STOP_HOTKEY", "esc"),
         image_match_confidence=_parse_float_env("IMAGE_MATCH_CONFIDENCE", 0.88),
         enable_waiting_list=_parse_bool_env("ENABLE_WAITING_LIST", True),
+        booking_priority=_parse_str_env("BOOKING_PRIORITY", "template,earliest"),
         roi_enabled=_parse_bool_env("ROI_ENABLED", True),
         reservation_scan_timeout_sec=_parse_float_env("RESERVATION_SCAN_TIMEOUT_SEC", 5.0),
         refresh_settle_delay_sec=_parse_float_env("REFRESH_SETTLE_DELAY_SEC", 0.18),
+        refresh_rate_per_minute=_parse_float_env("REFRESH_RATE_PER_MINUTE", 0.0),
+        fast_refresh_enabled=_parse_bool_env("FAST_REFRESH_ENABLED", True),
+        auto_roi_enabled=_parse_bool_env("AUTO_ROI_ENABLED", True),
+        spatial_memory_enabled=_parse_bool_env("SPATIAL_MEMORY_ENABLED", True),
+        change_gate_enabled=_parse_bool_env("CHANGE_GATE_ENABLED", True),
+        pyramid_matching_enabled=_parse_bool_env("PYRAMID_MATCHING_ENABLED", True),
+        detector_workers=_parse_int_env("DETECTOR_WORKERS", 4),
+        template_scale_enabled=_parse_bool_env("TEMPLATE_SCALE_ENABLED", True),
+        detection_profile_enabled=_parse_bool_env("DETECTION_PROFILE_ENABLED", True),
+        warmup_enabled=_parse_bool_env("WARMUP_ENABLED", False),
+        armed_warm_interval_sec=_parse_float_env("ARMED_WARM_INTERVAL_SEC", 1.0),
+        multi_session_file=_parse_optional_str_env("MULTI_SESSION_FILE"),
+        adaptive_settle_enabled=_parse_bool_env("ADAPTIVE_SETTLE_ENABLED", False),
+        settle_max_delay_sec=_parse_float_env("SETTLE_MAX_DELAY_SEC", 1.5),
+        capture_backend=_parse_str_env("CAPTURE_BACKEND", "pyautogui"),
+        input_backend=_parse_str_env("INPUT_BACKEND", "pyautogui"),
+        synthetic_frames_dir=_parse_optional_str_env("SYNTHETIC_FRAMES_DIR"),
+        enable_latency_stats=_parse_bool_env("ENABLE_LATENCY_STATS", False),
+        latency_stats_interval_sec=_parse_float_env("LATENCY_STATS_INTERVAL_SEC", 5.0),
+        enable_latency_trace=_parse_bool_env("ENABLE_LATENCY_TRACE", False),
         enable_telegram_notification=_parse_bool_env("ENABLE_TELEGRAM_NOTIFICATION", False),
         telegram_bot_token=_parse_optional_str_env("TELEGRAM_BOT_TOKEN"),
         telegram_chat_id=_parse_optional_str_env("TELEGRAM_CHAT_ID"),
+        telegram_screenshot_enabled=_parse_bool_env("TELEGRAM_SCREENSHOT_ENABLED", True),
     )
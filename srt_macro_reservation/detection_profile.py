@@ -0,0 +1,175 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from srt_macro_reservation.models import Region, TemplateSet
+from srt_macro_reservation.result_region import DiscoveredRegion, load_discovered_region, load_manual_region
+from srt_macro_reservation.template_scale import display_key, load_template_scale
+from srt_macro_reservation.template_store import TemplateStore
+
+PROFILE_VERSION = 1
+# 프로필에 함께 묶는 runtime 상태 파일. 이 파일이 바뀌면(mtime/크기) 프로필을 다시 만들어야 한다.
+STATE_FILE_NAMES = ("result_region.json", "result_region_auto.json", "template_scale.json")
+
+
+@dataclass(frozen=True)
+class DetectionProfile:
+    """시작 시 필요한 탐지 준비물(템플릿 목록/그레이스케일 배열/배율/ROI)을 한 파일로 묶은 것."""
+
+    templates: TemplateSet
+    template_images: dict[Path, np.ndarray]
+    template_scale: float
+    screen_size: tuple[int, int]
+    coordinate_scale: tuple[float, float]
+    result_region: Region | None
+    auto_roi: DiscoveredRegion | None
+
+
+def compile_detection_profile(
+    profile_file: Path,
+    target_dir: Path,
+    screen_size: tuple[int, int],
+    coordinate_scale: tuple[float, float],
+) -> DetectionProfile:
+    """target_dir 템플릿과 profile_file 폴더의 ROI/배율 상태 파일을 읽어 프로필을 만들고 저장."""
+
+    # 템플릿 디코딩(OpenCV/PIL)은 프로필을 만들 때만 필요하므로, 읽기만 하는 에이전트 생성 시에는 불러오지 않는다.
+    from srt_macro_reservation.template_cache import TemplateCache  # noqa: PLC0415
+
+    state_dir = profile_file.parent
+    store = TemplateStore(target_dir)
+    templates = store.load()
+    cache = TemplateCache(max_entries=len(templates.all_paths()) or 1)
+    template_images = {}
+    for image_path in templates.all_paths():
+        prepared = cache.get(image_path)
+        if prepared is None:
+            raise ValueError(f"템플릿을 읽을 수 없어 프로필을 만들 수 없습니다: {image_path}")
+        template_images[image_path] = prepared.image
+
+    saved_scale = load_template_scale(state_dir / "template_scale.json", display_key(screen_size, coordinate_scale))
+    profile = DetectionProfile(
+        templates=templates,
+        template_images=template_images,
+        template_scale=saved_scale if saved_scale is not None else 1.0,
+        screen_size=tuple(screen_size),
+        coordinate_scale=tuple(coordinate_scale),
+        result_region=load_manual_region(state_dir / "result_region.json"),
+        auto_roi=load_discovered_region(state_dir / "result_region_auto.json"),
+    )
+
+    names = [image_path.name for image_path in template_images]
+    meta = {
+        "version": PROFILE_VERSION,
+        "screen": {"width": profile.screen_size[0], "height": profile.screen_size[1]},
+        "scale": {"x": profile.coordinate_scale[0], "y": profile.coordinate_scale[1]},
+        "template_scale": profile.template_scale,
+        "targets": _target_hashes(store.image_paths()),
+        "target_stats": _target_stats(store.image_paths()),
+        "state_files": _state_file_stats(state_dir),
+        "templates": names,
+        "template_set": {
+            "booking": [image_path.name for image_path in templates.booking],
+            "waiting": templates.waiting.name if templates.waiting else None,
+            "refresh": templates.refresh.name if templates.refresh else None,
+            "sold_out": templates.sold_out.name if templates.sold_out else None,
+            "connection_wait": templates.connection_wait.name if templates.connection_wait else None,
+        },
+        "result_region": list(profile.result_region) if profile.result_region else None,
+        "auto_roi": profile.auto_roi.to_dict() if profile.auto_roi else None,
+    }
+    arrays = {f"template_{index}": image for index, image in enumerate(template_images.values())}
+    profile_file.parent.mkdir(parents=True, exist_ok=True)
+    # 압축하지 않은 npz라 불러올 때 배열을 필요한 것만 바로 읽을 수 있다.
+    with profile_file.open("wb") as output:
+        np.savez(output, meta=np.array(json.dumps(meta, ensure_ascii=False)), **arrays)
+    return profile
+
+
+def load_detection_profile(profile_file: Path, target_dir: Path) -> DetectionProfile | None:
+    """프로필을 읽고, 템플릿 PNG/상태 파일이 만들 때와 같을 때만 돌려준다.
+
+    화면 크기는 입력 장치를 열어야 알 수 있으므로 여기서 보지 않는다. 호출한 쪽이 screen_size와 비교해
+    다르면 화면에 묶인 값(좌표 배율/템플릿 배율/자동 ROI)만 버린다.
+    """
+
+    if not profile_file.exists():
+        return None
+
+    try:
+        with np.load(profile_file, allow_pickle=False) as archive:
+            meta = json.loads(str(archive["meta"]))
+            if meta["version"] != PROFILE_VERSION:
+                print("\n탐지 프로필 형식이 달라 사용하지 않습니다. (python compile_profile.py로 다시 만드세요)")
+                return None
+            stale_reason = _stale_reason(meta, target_dir, profile_file.parent)
+            if stale_reason is not None:
+                print(f"\n탐지 프로필을 사용하지 않습니다: {stale_reason} (python compile_profile.py로 다시 만드세요)")
+                return None
+            template_images = {
+                target_dir / name: archive[f"template_{index}"] for index, name in enumerate(meta["templates"])
+            }
+    except (OSError, ValueError, TypeError, KeyError, json.JSONDecodeError) as error:
+        print(f"\n탐지 프로필 파싱 실패: {error}")
+        return None
+
+    template_set = meta["template_set"]
+
+    def resolve(name: str | None) -> Path | None:
+        return target_dir / name if name else None
+
+    return DetectionProfile(
+        templates=TemplateSet(
+            booking=tuple(target_dir / name for name in template_set["booking"]),
+            waiting=resolve(template_set["waiting"]),
+            refresh=resolve(template_set["refresh"]),
+            sold_out=resolve(template_set["sold_out"]),
+            connection_wait=resolve(template_set["connection_wait"]),
+        ),
+        template_images=template_images,
+        template_scale=float(meta["template_scale"]),
+        screen_size=(int(meta["screen"]["width"]), int(meta["screen"]["height"])),
+        coordinate_scale=(float(meta["scale"]["x"]), float(meta["scale"]["y"])),
+        result_region=tuple(int(value) for value in meta["result_region"]) if meta["result_region"] else None,
+        auto_roi=DiscoveredRegion.from_dict(meta["auto_roi"]) if meta["auto_roi"] else None,
+    )
+
+
+def _stale_reason(meta: dict, target_dir: Path, state_dir: Path) -> str | None:
+    image_paths = TemplateStore(target_dir).image_paths()
+    # 파일 목록/크기/수정 시각이 만들 때와 같으면 내용을 다시 해시하지 않는다. 다를 때만(복사/touch 등) 해시로 확인.
+    if meta.get("target_stats") != _target_stats(image_paths) and meta["targets"] != _target_hashes(image_paths):
+        return "템플릿 이미지가 바뀌었습니다"
+    if meta["state_files"] != _state_file_stats(state_dir):
+        return "ROI/배율 설정 파일이 바뀌었습니다"
+    return None
+
+
+def _target_hashes(image_paths: tuple[Path, ...]) -> dict[str, str]:
+    return {
+        image_path.name: hashlib.blake2b(image_path.read_bytes(), digest_size=16).hexdigest()
+        for image_path in image_paths
+    }
+
+
+def _target_stats(image_paths: tuple[Path, ...]) -> dict[str, list[int]]:
+    stats = {}
+    for image_path in image_paths:
+        stat = image_path.stat()
+        stats[image_path.name] = [stat.st_mtime_ns, stat.st_size]
+    return stats
+
+
+def _state_file_stats(state_dir: Path) -> dict[str, list[int] | None]:
+    stats = {}
+    for name in STATE_FILE_NAMES:
+        state_file = state_dir / name
+        if state_file.exists():
+            stat = state_file.stat()
+            stats[name] = [stat.st_mtime_ns, stat.st_size]
+        else:
+            stats[name] = None
+    return stats
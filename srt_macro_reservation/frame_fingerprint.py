@@ -0,0 +1,47 @@
+import hashlib
+
+import cv2
+import numpy as np
+
+from srt_macro_reservation.capture_backend import Frame
+from srt_macro_reservation.models import Region
+
+
+def downsample_region(frame: Frame, region: Region | None, target_width: int = 160) -> np.ndarray | None:
+    """프레임의 region 부분을 작은 그레이스케일 썸네일로 줄인다 (변화 감지용)."""
+
+    image = frame.image
+    if region is not None:
+        left, top, width, height = region
+        left = max(0, left - frame.left)
+        top = max(0, top - frame.top)
+        image = image[top : top + height, left : left + width]
+    if image.size == 0:
+        return None
+
+    height, width = image.shape[:2]
+    if width <= target_width:
+        return image.astype(np.int16)
+    scaled_height = max(1, int(round(height * target_width / width)))
+    return cv2.resize(image, (target_width, scaled_height), interpolation=cv2.INTER_AREA).astype(np.int16)
+
+
+def mean_abs_difference(first: np.ndarray | None, second: np.ndarray | None) -> float:
+    if first is None or second is None or first.shape != second.shape:
+        return float("inf")
+    return float(np.abs(first - second).mean())
+
+
+def frame_digest(frame: Frame, block_size: int = 8) -> bytes:
+    """프레임을 block_size 블록 평균으로 줄인 뒤 해시한 지문. 픽셀이 같으면 지문도 같다."""
+
+    image = frame.image
+    height, width = image.shape[:2]
+    reduced = cv2.resize(
+        image,
+        (max(1, width // block_size), max(1, height // block_size)),
+        interpolation=cv2.INTER_AREA,
+    )
+    digest = hashlib.blake2b(np.ascontiguousarray(reduced).data, digest_size=16)
+    digest.update(f"{frame.left},{frame.top},{width},{height}".encode())
+    return digest.digest()
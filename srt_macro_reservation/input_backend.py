@@ -0,0 +1,244 @@
+import math
+import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+# 클릭 직후 커서가 요청 좌표에서 이보다 멀면(px) 입력이 막힌 것으로 본다 (권한 문제).
+_CURSOR_TOLERANCE = 16
+
+
+def warn_if_cursor_missed(requested: tuple[int, int], actual: tuple[int, int]) -> bool:
+    if math.hypot(actual[0] - requested[0], actual[1] - requested[1]) <= _CURSOR_TOLERANCE:
+        return False
+    print("\n마우스 이동이 요청 좌표와 다릅니다. 손쉬운 사용/입력 모니터링 권한을 확인하세요.")
+    return True
+
+
+class InputBackend:
+    name = "base"
+
+    def screen_size(self) -> tuple[int, int]:
+        raise NotImplementedError
+
+    def click(self, x: int, y: int, move_duration: float) -> tuple[int, int]:
+        """(x, y)를 클릭하고 클릭 직후 커서 위치를 반환."""
+
+        raise NotImplementedError
+
+    def scroll_to_top(self, at: tuple[int, int] | None = None):
+        """페이지를 맨 위로 스크롤. at이 있으면 그 위치의 창을 휠로 스크롤한다 (키보드 입력 없음)."""
+
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PyAutoGuiInputBackend(InputBackend):
+    name = "pyautogui"
+
+    def __init__(self):
+        import pyautogui  # noqa: PLC0415
+
+        pyautogui.FAILSAFE = True
+        pyautogui.PAUSE = 0.03
+        self._pyautogui = pyautogui
+        self._keyboard_controller = self._create_keyboard_controller()
+
+    def screen_size(self) -> tuple[int, int]:
+        screen_width, screen_height = self._pyautogui.size()
+        return screen_width, screen_height
+
+    def click(self, x: int, y: int, move_duration: float) -> tuple[int, int]:
+        self._pyautogui.moveTo(x, y, duration=move_duration)
+        self._pyautogui.click()
+        current_x, current_y = self._pyautogui.position()
+        return current_x, current_y
+
+    def scroll_to_top(self, at: tuple[int, int] | None = None):
+        if at is not None:
+            # 여러 창을 함께 쓸 때는 포커스와 무관하게 커서 아래 창만 스크롤되도록 휠만 사용한다.
+            for _ in range(3):
+                self._pyautogui.scroll(3000, x=at[0], y=at[1])
+                time.sleep(0.05)
+            return
+
+        for _ in range(3):
+            self._pyautogui.scroll(3000)
+            time.sleep(0.05)
+
+        try:
+            if platform.system() == "Darwin" and self._keyboard_controller is not None:
+                from pynput import keyboard  # noqa: PLC0415
+
+                with self._keyboard_controller.pressed(keyboard.Key.cmd):
+                    self._keyboard_controller.press(keyboard.Key.up)
+                    self._keyboard_controller.release(keyboard.Key.up)
+            elif platform.system() != "Darwin":
+                self._pyautogui.press("home")
+        except Exception:
+            pass
+
+        time.sleep(0.08)
+
+    @staticmethod
+    def _create_keyboard_controller():
+        try:
+            from pynput import keyboard  # noqa: PLC0415
+
+            return keyboard.Controller()
+        except Exception:
+            return None
+
+
+class TeleportInputBackend(InputBackend):
+    """커서를 옮기는 애니메이션/PAUSE 없이 목표 좌표에 누르기/떼기 한 쌍만 보내는 저지연 클릭 백엔드.
+
+    Linux(X11)에서는 XTest로 이동/누르기/떼기를 한 번에 보내고, 그 밖에는 pynput 마우스 Controller를 쓴다.
+    클릭 후 커서 위치 확인은 별도 스레드에서 하므로 click()은 요청 좌표를 바로 돌려준다.
+    화면 크기와 스크롤은 클릭 지연과 무관하므로 pyautogui 백엔드에 맡긴다.
+    """
+
+    name = "teleport"
+
+    def __init__(self, fallback: InputBackend | None = None):
+        from pynput import mouse  # noqa: PLC0415
+
+        self._fallback = fallback if fallback is not None else PyAutoGuiInputBackend()
+        self._mouse = mouse.Controller()
+        self._left_button = mouse.Button.left
+        self._xtest = self._open_xtest() if platform.system() == "Linux" else None
+        self._verifier = ThreadPoolExecutor(max_workers=1, thread_name_prefix="SRTClickVerify")
+        if self._xtest is not None:
+            self.name = "teleport+xtest"
+
+    def screen_size(self) -> tuple[int, int]:
+        return self._fallback.screen_size()
+
+    def click(self, x: int, y: int, move_duration: float) -> tuple[int, int]:
+        if self._xtest is not None:
+            display, xtest, events = self._xtest
+            xtest.fake_input(display, events.MotionNotify, x=x, y=y)
+            xtest.fake_input(display, events.ButtonPress, 1)
+            xtest.fake_input(display, events.ButtonRelease, 1)
+            display.flush()
+        else:
+            self._mouse.position = (x, y)
+            self._mouse.press(self._left_button)
+            self._mouse.release(self._left_button)
+        self._verifier.submit(self._verify_cursor, (x, y))
+        return x, y
+
+    def scroll_to_top(self, at: tuple[int, int] | None = None):
+        self._fallback.scroll_to_top(at)
+
+    def close(self):
+        self._verifier.shutdown(wait=False, cancel_futures=True)
+        if self._xtest is not None:
+            self._xtest[0].close()
+            self._xtest = None
+
+    def _verify_cursor(self, requested: tuple[int, int]):
+        # 이벤트가 반영될 시간을 조금 준 뒤 확인한다. 그 사이 사용자가 마우스를 움직이면 경고가 날 수 있다.
+        time.sleep(0.05)
+        x, y = self._mouse.position
+        warn_if_cursor_missed(requested, (int(x), int(y)))
+
+    @staticmethod
+    def _open_xtest():
+        try:
+            from Xlib import X, display  # noqa: PLC0415
+            from Xlib.ext import xtest  # noqa: PLC0415
+
+            connection = display.Display()
+            if not connection.has_extension("XTEST"):
+                connection.close()
+                return None
+            return connection, xtest, X
+        except Exception:
+            return None
+
+
+def create_input_backend(name: str) -> InputBackend:
+    if name == "teleport":
+        try:
+            return TeleportInputBackend()
+        except ImportError:
+            print("- pynput 패키지가 없어 pyautogui 입력으로 대체합니다. (pip install pynput)")
+        except Exception as error:
+            # 디스플레이 연결 실패(Xlib 오류, OSError 등)는 pynput import나 Controller 생성 시점에 난다.
+            print(f"- pynput 입력을 초기화하지 못해 pyautogui 입력으로 대체합니다: {error}")
+    return PyAutoGuiInputBackend()
+
+
+@dataclass(frozen=True)
+class RecordedClick:
+    x: int
+    y: int
+    at: float
+
+
+class RecordingInputBackend(InputBackend):
+    """실제 입력 대신 클릭을 기록하는 입력 백엔드 (리플레이/헤드리스 실행용)."""
+
+    name = "recording"
+
+    def __init__(self, screen_size: tuple[int, int], on_click=None):
+        self._screen_size = screen_size
+        self._on_click = on_click
+        self._lock = threading.Lock()
+        self.clicks: list[RecordedClick] = []
+        self.scroll_count = 0
+
+    def screen_size(self) -> tuple[int, int]:
+        return self._screen_size
+
+    def click(self, x: int, y: int, move_duration: float) -> tuple[int, int]:
+        recorded = RecordedClick(x=x, y=y, at=time.monotonic())
+        with self._lock:
+            self.clicks.append(recorded)
+        if self._on_click is not None:
+            self._on_click(recorded)
+        return x, y
+
+    def scroll_to_top(self, at: tuple[int, int] | None = None):
+        self.scroll_count += 1
+
+
+class InputArbiter(InputBackend):
+    """여러 세션이 한 커서를 두고 다투지 않도록 클릭/스크롤을 한 번에 하나씩 실행하는 입력 백엔드.
+
+    입력이 끝날 때마다 on_input을 호출해 (예: 공유 캡처 프레임 폐기) 다른 세션이 입력 전 화면을 보지 않게 한다.
+    """
+
+    def __init__(self, inner: InputBackend, on_input=None):
+        self._inner = inner
+        self._on_input = on_input
+        self._lock = threading.Lock()
+        self.name = f"arbiter+{inner.name}"
+
+    def screen_size(self) -> tuple[int, int]:
+        return self._inner.screen_size()
+
+    def click(self, x: int, y: int, move_duration: float) -> tuple[int, int]:
+        with self._lock:
+            try:
+                return self._inner.click(x, y, move_duration)
+            finally:
+                self._notify_input()
+
+    def scroll_to_top(self, at: tuple[int, int] | None = None):
+        with self._lock:
+            try:
+                self._inner.scroll_to_top(at)
+            finally:
+                self._notify_input()
+
+    def close(self):
+        self._inner.close()
+
+    def _notify_input(self):
+        if self._on_input is not None:
+            self._on_input()
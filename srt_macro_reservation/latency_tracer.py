@@ -0,0 +1,141 @@
+import json
+import time
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+
+
+class _Span:
+    __slots__ = ("_tracer", "_key", "_started_at")
+
+    def __init__(self, tracer: "LatencyTracer", key: str):
+        self._tracer = tracer
+        self._key = key
+        self._started_at = 0.0
+
+    def __enter__(self):
+        self._started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self._tracer.record(self._key, time.perf_counter() - self._started_at)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+# 상태 줄에 표시할 구간 순서 (match:<템플릿>은 capture 다음에 이어서 표시)
+_REPORT_ORDER = ("tick", "capture", "match", "click", "settle")
+
+
+class LatencyTracer:
+    """캡처/매칭/클릭/대기 구간 시간을 링 버퍼에 모아 주기적으로 백분위 상태 줄을 출력.
+
+    비활성화 상태에서는 span()이 공용 no-op 컨텍스트를 돌려주므로 측정 비용이 거의 없다.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        ring_size: int = 2048,
+        report_interval_sec: float = 5.0,
+        trace_file: Path | None = None,
+    ):
+        self.enabled = enabled
+        self._ring_size = ring_size
+        self._report_interval_sec = report_interval_sec
+        self._samples: dict[str, deque[float]] = {}
+        self._event_counts: dict[str, int] = {}
+        self._trace_file = trace_file if enabled else None
+        self._trace_buffer: list[str] = []
+        self._status_sources: list[Callable[[], str]] = []
+        self._origin = time.perf_counter()
+        self._last_report_at = time.monotonic()
+
+    def span(self, name: str, label: str | None = None):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, f"{name}:{label}" if label else name)
+
+    def record(self, key: str, duration_sec: float):
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples.setdefault(key, deque(maxlen=self._ring_size))
+        samples.append(duration_sec)
+        if self._trace_file is not None:
+            self._trace_buffer.append(
+                f'{{"t": {time.perf_counter() - self._origin:.6f}, "span": {json.dumps(key, ensure_ascii=False)}, '
+                f'"ms": {duration_sec * 1000:.3f}}}'
+            )
+
+    def event(self, name: str, **fields):
+        if not self.enabled:
+            return
+        self._event_counts[name] = self._event_counts.get(name, 0) + 1
+        if self._trace_file is not None:
+            record = {"t": round(time.perf_counter() - self._origin, 6), "event": name, **fields}
+            self._trace_buffer.append(json.dumps(record, ensure_ascii=False))
+
+    def add_status_source(self, source: Callable[[], str]):
+        """상태 줄 끝에 붙일 문자열을 돌려주는 함수를 등록 (예: 조회 속도)."""
+
+        self._status_sources.append(source)
+
+    def percentiles(self, key: str) -> tuple[float, float, float] | None:
+        samples = self._samples.get(key)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        last_index = len(ordered) - 1
+        return tuple(ordered[min(last_index, int(round(last_index * ratio)))] for ratio in (0.5, 0.95, 0.99))
+
+    def status_line(self) -> str:
+        parts = []
+        for key in self._ordered_keys():
+            stats = self.percentiles(key)
+            if stats is None:
+                continue
+            p50, p95, p99 = (value * 1000 for value in stats)
+            parts.append(f"{key} p50 {p50:.1f}/p95 {p95:.1f}/p99 {p99:.1f}ms")
+        for name, count in sorted(self._event_counts.items()):
+            parts.append(f"{name} {count}회")
+        if self.enabled:
+            parts.extend(status for status in (source() for source in self._status_sources) if status)
+        return " | ".join(parts)
+
+    def maybe_report(self):
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        if now - self._last_report_at < self._report_interval_sec:
+            return
+        self._last_report_at = now
+        status = self.status_line()
+        if status:
+            print(f"\n[지연 통계] {status}")
+        self.flush()
+
+    def flush(self):
+        if self._trace_file is None or not self._trace_buffer:
+            return
+        lines, self._trace_buffer = self._trace_buffer, []
+        self._trace_file.parent.mkdir(parents=True, exist_ok=True)
+        with self._trace_file.open("a", encoding="utf-8") as trace:
+            trace.write("\n".join(lines) + "\n")
+
+    def _ordered_keys(self) -> list[str]:
+        def sort_key(key: str) -> tuple[int, str]:
+            name = key.split(":", 1)[0]
+            rank = _REPORT_ORDER.index(name) if name in _REPORT_ORDER else len(_REPORT_ORDER)
+            return rank, key
+
+        return sorted(self._samples, key=sort_key)
@@ -25,3 +25,33 @@ class TemplateSet:
     refresh: Path | None
     sold_out: Path | None
     connection_wait: Path | None
+
+    def all_paths(self) -> tuple[Path, ...]:
+        optional_paths = (self.waiting, self.refresh, self.sold_out, self.connection_wait)
+        return self.booking + tuple(path for path in optional_paths if path is not None)
+
+
+@dataclass(frozen=True)
+class TemplateMatch:
+    image_path: Path
+    left: int
+    top: int
+    width: int
+    height: int
+    score: float
+
+    @property
+    def center(self) -> tuple[int, int]:
+        return int(self.left + self.width / 2), int(self.top + self.height / 2)
+
+
+@dataclass(frozen=True)
+class DetectorSearch:
+    """한 틱에서 같은 프레임으로 함께 실행할 탐색 1건."""
+
+    image_paths: tuple[Path, ...]
+    region: Region | None
+    confidence: float
+    whole_region: bool = False
+    # 못 찾으면 화면을 새로 캡처해 다시 보는 횟수 (첫 시도 포함)
+    retries: int = 1
@@ -0,0 +1,216 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from srt_macro_reservation.capture_backend import CaptureBackend, SharedCaptureSource, create_capture_backend
+from srt_macro_reservation.config import SRTConfig
+from srt_macro_reservation.input_backend import InputArbiter, InputBackend, create_input_backend
+from srt_macro_reservation.models import Region
+from srt_macro_reservation.srt_macro_agent import SRTMacroAgent, _load_keyboard_module, key_to_name
+from srt_macro_reservation.startup_report import startup_report
+from srt_macro_reservation.template_cache import TemplateCache
+
+
+@dataclass(frozen=True)
+class SessionSpec:
+    """멀티 세션 모드의 세션 하나 (브라우저 창 하나에서 한 노선/날짜를 조회)."""
+
+    name: str
+    window: Region
+    target_dir: Path
+    state_dir: Path
+
+
+def load_session_specs(sessions_file: Path, base_dir: Path) -> tuple[SessionSpec, ...]:
+    """세션 설정 JSON을 읽는다. 상대 경로는 base_dir 기준이다.
+
+    target_dir가 없으면 targets/, state_dir(ROI/자동 ROI/버튼 위치 기록 파일 폴더)가 없으면
+    runtime/multi_session/<name>/을 쓴다.
+    """
+
+    try:
+        data = json.loads(sessions_file.read_text(encoding="utf-8"))
+        specs = []
+        for entry in data["sessions"]:
+            name = str(entry["name"]).strip()
+            window = entry["window"]
+            region = (int(window["x"]), int(window["y"]), int(window["width"]), int(window["height"]))
+            target_dir = Path(entry["target_dir"]) if entry.get("target_dir") else Path("targets")
+            state_dir = Path(entry["state_dir"]) if entry.get("state_dir") else Path("runtime") / "multi_session" / name
+            specs.append(
+                SessionSpec(
+                    name=name,
+                    window=region,
+                    target_dir=target_dir if target_dir.is_absolute() else base_dir / target_dir,
+                    state_dir=state_dir if state_dir.is_absolute() else base_dir / state_dir,
+                )
+            )
+    except OSError as error:
+        raise ValueError(f"세션 설정 파일을 읽을 수 없습니다: {error}") from error
+    except (ValueError, TypeError, KeyError, AttributeError, json.JSONDecodeError) as error:
+        raise ValueError(f"세션 설정 파일 파싱 실패: {error}") from error
+
+    if not specs:
+        raise ValueError(f"세션 설정 파일에 세션이 없습니다: {sessions_file}")
+    names = [spec.name for spec in specs]
+    if "" in names or len(set(names)) != len(names):
+        raise ValueError("세션 이름은 비어 있지 않고 서로 달라야 합니다.")
+    for spec in specs:
+        if spec.window[2] <= 0 or spec.window[3] <= 0:
+            raise ValueError(f"세션 '{spec.name}'의 window width/height 값이 잘못되었습니다.")
+    return tuple(specs)
+
+
+class MultiSessionRunner:
+    """여러 세션(창마다 다른 노선/날짜)을 한 프로세스에서 동시에 돌린다.
+
+    세션마다 ROI/템플릿/단계 상태를 따로 갖고, 전체 화면 캡처와 템플릿 캐시는 함께 쓴다.
+    클릭/스크롤은 InputArbiter를 거쳐 한 번에 하나씩 실행되므로 세션끼리 커서를 두고 다투지 않는다.
+    """
+
+    def __init__(
+        self,
+        config: SRTConfig,
+        specs: tuple[SessionSpec, ...],
+        capture_backend: CaptureBackend | None = None,
+        input_backend: InputBackend | None = None,
+    ):
+        self.config = config
+        self._frames = SharedCaptureSource(
+            capture_backend if capture_backend is not None else self._create_capture_backend()
+        )
+        self._input = InputArbiter(
+            input_backend if input_backend is not None else create_input_backend(config.input_backend),
+            on_input=self._frames.expire,
+        )
+        template_cache = TemplateCache(max_entries=64 * len(specs))
+        self.sessions = tuple(
+            SRTMacroAgent(
+                config,
+                capture_backend=self._frames.view(),
+                input_backend=self._input,
+                target_dir=spec.target_dir,
+                result_region_file=spec.state_dir / "result_region.json",
+                window_region=spec.window,
+                template_cache=template_cache,
+                session_name=spec.name,
+            )
+            for spec in specs
+        )
+
+        self._start_signals: dict[str, asyncio.Event] = {}
+        self._shutdown_signal: asyncio.Event | None = None
+        self._listener = None
+        self._last_key_press_at: dict[str, float] = {}
+
+    @property
+    def capture_count(self) -> int:
+        return self._frames.capture_count
+
+    def run(self):
+        print(f"\nSRT 이미지 매크로 멀티 세션({len(self.sessions)}개) 대기 중입니다.")
+        print(f"- 시작 단축키: {self.config.start_hotkey} (모든 세션)")
+        print(f"- 중지 단축키: {self.config.stop_hotkey} (모든 세션)")
+        print("- 종료: 터미널에서 Ctrl+C")
+        if self.config.warmup_enabled:
+            for session in self.sessions:
+                session.prepare()
+        for session in self.sessions:
+            print(f"\n[{session.session_name}]")
+            session.print_target_status()
+
+        if not any(session.has_refresh_template for session in self.sessions):
+            print("\n조회하기 템플릿이 있는 세션이 없어 매크로를 시작할 수 없습니다.")
+            return
+
+        try:
+            asyncio.run(self._run_async())
+        except KeyboardInterrupt:
+            print("\n프로그램을 종료합니다.")
+
+    def start_all(self):
+        for session in self.sessions:
+            if not session.has_refresh_template:
+                continue
+            session.start_cycle()
+            signal = self._start_signals.get(session.session_name)
+            if signal is not None:
+                signal.set()
+
+    def stop_all(self):
+        for session in self.sessions:
+            session.stop_cycle()
+
+    async def _run_async(self):
+        """세션마다 전용 틱 스레드 1개를 두고, 단축키는 이벤트 루프에서 모든 세션에 한 번에 전달."""
+
+        loop = asyncio.get_running_loop()
+        self._shutdown_signal = asyncio.Event()
+        executors = []
+        tasks = []
+        for index, session in enumerate(self.sessions):
+            self._start_signals[session.session_name] = asyncio.Event()
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"SRTSession{index}")
+            executors.append(executor)
+            tasks.append(asyncio.create_task(self._session_task(session, executor)))
+
+        try:
+            keyboard = _load_keyboard_module()
+            self._listener = keyboard.Listener(
+                on_press=lambda key: loop.call_soon_threadsafe(self._on_key_press, key),
+            )
+            self._listener.start()
+            startup_report.print_report("단축키 대기까지")
+        except Exception as error:
+            print(f"\n전역 단축키 리스너를 시작할 수 없습니다: {error}")
+            self._shutdown_signal.set()
+
+        try:
+            await self._shutdown_signal.wait()
+        finally:
+            self.stop_all()
+            for task in tasks:
+                task.cancel()
+            if self._listener:
+                self._listener.stop()
+            for executor in executors:
+                executor.shutdown(wait=False, cancel_futures=True)
+            for session in self.sessions:
+                session.close()
+            self._frames.close()
+            self._input.close()
+
+    async def _session_task(self, session: SRTMacroAgent, executor: ThreadPoolExecutor):
+        loop = asyncio.get_running_loop()
+        start_signal = self._start_signals[session.session_name]
+        while True:
+            if not session.is_running:
+                start_signal.clear()
+                await session.wait_armed(start_signal, executor)
+            await loop.run_in_executor(executor, session.run_tick)
+
+    def _on_key_press(self, key):
+        key_name = key_to_name(key)
+        if not key_name:
+            return
+        now = time.time()
+        last_pressed_at = self._last_key_press_at.get(key_name, 0.0)
+        self._last_key_press_at[key_name] = now
+        if now - last_pressed_at < 0.25:
+            return
+
+        if key_name == self.config.start_hotkey:
+            self.start_all()
+            print("\n모든 세션의 매크로를 시작합니다.")
+            return
+
+        if key_name == self.config.stop_hotkey:
+            self.stop_all()
+            print("\n모든 세션의 매크로를 중지했습니다.")
+
+    def _create_capture_backend(self) -> CaptureBackend:
+        synthetic_frames_dir = Path(self.config.synthetic_frames_dir) if self.config.synthetic_frames_dir else None
+        return create_capture_backend(self.config.capture_backend, synthetic_frames_dir)
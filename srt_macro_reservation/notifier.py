@@ -1,11 +1,13 @@
-import json
 import platform
 import subprocess
 import threading
 import time
 from pathlib import Path
-from urllib import parse as urllib_parse
-from urllib import request as urllib_request
+
+import numpy as np
+
+from srt_macro_reservation.models import Region
+from srt_macro_reservation.telegram_dispatcher import TELEGRAM_API_URL, TelegramDispatcher
 
 
 class ReservationNotifier:
@@ -17,61 +19,58 @@ class ReservationNotifier:
         enable_telegram: bool,
         telegram_bot_token: str | None,
         telegram_chat_id: str | None,
+        session_name: str | None = None,
+        telegram_api_url: str = TELEGRAM_API_URL,
     ):
         self._enable_telegram = enable_telegram
+        self._session_name = session_name
         self._telegram_bot_token = self._normalize_optional_str(telegram_bot_token)
         self._telegram_chat_id = self._normalize_optional_str(telegram_chat_id)
         self._telegram_failure_reported = False
         self._telegram_ready = self._prepare_telegram()
+        self._dispatcher: TelegramDispatcher | None = None
+        if self._telegram_ready:
+            # 전송 스레드가 바로 연결을 열어 두므로 첫 알림도 TLS 연결을 기다리지 않는다.
+            self._dispatcher = TelegramDispatcher(
+                bot_token=self._telegram_bot_token,
+                chat_id=self._telegram_chat_id,
+                api_base_url=telegram_api_url,
+                on_sent=self._on_telegram_sent,
+                on_failure=self._on_telegram_failure,
+            )
+
+    def notify_success(self, success_type: str, screenshot: np.ndarray | None = None, highlight: Region | None = None):
+        """screenshot(클릭 직전 화면)이 있으면 텔레그램 사진으로 함께 보낸다. 인코딩/업로드는 전송 스레드에서 한다."""
 
-    def notify_success(self, success_type: str):
         if success_type == "booking":
             message = "예약하기 버튼 클릭을 시도했습니다. 다음 화면을 확인하세요."
         else:
             message = "예약대기 버튼 클릭을 시도했습니다. 다음 화면을 확인하세요."
+        if self._session_name:
+            message = f"[{self._session_name}] {message}"
 
         print(f"\n{message}")
-        if self._telegram_ready:
-            self._send_telegram_alert_async(message)
+        dispatcher = self._dispatcher
+        if self._telegram_ready and dispatcher is not None and dispatcher.submit(message, screenshot, highlight):
             return
         self._play_local_beep_async()
 
-    def _send_telegram_alert_async(self, text: str):
-        if not self._telegram_ready:
-            self._play_local_beep_async()
-            return
-
-        def _runner():
-            try:
-                self._send_telegram_alert_sync(text=text)
-            except Exception as error:
-                self._disable_telegram(f"{error}")
-                self._play_local_beep_async()
-
-        threading.Thread(
-            target=_runner,
-            name="SRTTelegramNotifier",
-            daemon=True,
-        ).start()
+    def close(self):
+        if self._dispatcher is not None:
+            self._dispatcher.close()
+            self._dispatcher = None
 
-    def _send_telegram_alert_sync(self, text: str):
-        payload = urllib_parse.urlencode(
-            {
-                "chat_id": self._telegram_chat_id,
-                "text": text,
-            }
-        ).encode("utf-8")
-        url = f"https://api.telegram.org/bot{self._telegram_bot_token}/sendMessage"
-        request = urllib_request.Request(url=url, data=payload, method="POST")
-
-        with urllib_request.urlopen(request, timeout=8) as response:
-            body = response.read().decode("utf-8", errors="ignore")
-            data = json.loads(body) if body else {}
-
-        if not data.get("ok"):
-            raise RuntimeError("Telegram API 응답이 실패로 반환되었습니다.")
+    def _on_telegram_sent(self):
         print("\n텔레그램 알림 전송 완료")
 
+    def _on_telegram_failure(self, error: Exception, permanent: bool):
+        if permanent:
+            self._disable_telegram(f"{error}")
+        else:
+            # 일시적인 네트워크 오류라면 다음 알림은 다시 텔레그램으로 보낸다.
+            print(f"\n텔레그램 알림 전송 실패 ({error}). 이번 알림은 PC 알림음으로 대신합니다.")
+        self._play_local_beep_async()
+
     def _prepare_telegram(self) -> bool:
         if not self._enable_telegram:
             return False
@@ -0,0 +1,99 @@
+import time
+from collections import deque
+from collections.abc import Callable
+
+
+class RefreshGovernor:
+    """조회하기 클릭 속도를 토큰 버킷으로 분당 target_per_minute회 이하로 맞추고, 접속대기가 보이면 속도를 낮춘다.
+
+    접속대기를 만날 때마다 현재 목표 속도를 절반으로(최소 min_per_minute) 줄이고, 접속대기 없이 조회할
+    때마다 원래 목표의 recovery_ratio만큼 다시 올린다 (AIMD). 붐빌 때 조회를 몰아 보내 대기열에 더
+    자주 걸리는 것보다, 대기열에 걸리지 않는 속도로 꾸준히 조회하는 편이 실제 조회 수가 많다.
+    """
+
+    def __init__(
+        self,
+        target_per_minute: float,
+        burst: int = 2,
+        min_per_minute: float = 6.0,
+        recovery_ratio: float = 0.05,
+        window_sec: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._target_per_minute = target_per_minute
+        self._min_per_minute = min(min_per_minute, target_per_minute)
+        self._recovery_per_refresh = target_per_minute * recovery_ratio
+        self._burst = max(1, burst)
+        self._window_sec = window_sec
+        self._clock = clock
+        self._rate_per_minute = target_per_minute
+        self._tokens = float(self._burst)
+        self._refilled_at = clock()
+        self._started_at = self._refilled_at
+        # 최근 window_sec 동안의 조회 시각과 접속대기 여부
+        self._refreshes: deque[tuple[float, bool]] = deque()
+        self.backoff_count = 0
+
+    @property
+    def rate_per_minute(self) -> float:
+        """접속대기 감속이 반영된 현재 목표 속도."""
+
+        return self._rate_per_minute
+
+    def delay_sec(self) -> float:
+        """다음 조회를 보낼 수 있을 때까지 남은 시간 (지금 보낼 수 있으면 0)."""
+
+        self._refill()
+        if self._tokens >= 1.0:
+            return 0.0
+        return (1.0 - self._tokens) * 60.0 / self._rate_per_minute
+
+    def record_refresh(self, connection_wait: bool = False):
+        """조회하기를 한 번 누름 (토큰 1개 사용). connection_wait이면 그 조회가 접속대기에 걸린 것."""
+
+        self._refill()
+        self._tokens = max(0.0, self._tokens - 1.0)
+        now = self._clock()
+        self._refreshes.append((now, connection_wait))
+        self._trim(now)
+        if connection_wait:
+            self.record_connection_wait()
+        else:
+            self._rate_per_minute = min(self._target_per_minute, self._rate_per_minute + self._recovery_per_refresh)
+
+    def record_connection_wait(self):
+        """조회 후 예약 탐색 중에 접속대기를 만났을 때도 감속한다."""
+
+        self._refill()
+        self._rate_per_minute = max(self._min_per_minute, self._rate_per_minute / 2)
+        self.backoff_count += 1
+
+    def achieved_per_minute(self) -> float:
+        now = self._clock()
+        self._trim(now)
+        elapsed = min(self._window_sec, now - self._started_at)
+        if elapsed <= 0:
+            return 0.0
+        return len(self._refreshes) * 60.0 / elapsed
+
+    def connection_wait_ratio(self) -> float:
+        self._trim(self._clock())
+        if not self._refreshes:
+            return 0.0
+        return sum(1 for _, waited in self._refreshes if waited) / len(self._refreshes)
+
+    def status(self) -> str:
+        return (
+            f"조회 {self.achieved_per_minute():.1f}/분 "
+            f"(목표 {self._rate_per_minute:.1f}/분, 설정 {self._target_per_minute:g}/분, "
+            f"접속대기 {self.connection_wait_ratio() * 100:.0f}%)"
+        )
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(float(self._burst), self._tokens + (now - self._refilled_at) * self._rate_per_minute / 60.0)
+        self._refilled_at = now
+
+    def _trim(self, now: float):
+        while self._refreshes and now - self._refreshes[0][0] > self._window_sec:
+            self._refreshes.popleft()
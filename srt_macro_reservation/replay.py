@@ -0,0 +1,272 @@
+import json
+import shutil
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from srt_macro_reservation.capture_backend import CaptureBackend, Frame, SyntheticCaptureBackend
+from srt_macro_reservation.config import SRTConfig
+from srt_macro_reservation.input_backend import RecordedClick, RecordingInputBackend
+from srt_macro_reservation.models import Region
+from srt_macro_reservation.srt_macro_agent import SRTMacroAgent
+
+MANIFEST_FILE_NAME = "session.json"
+
+
+@dataclass(frozen=True)
+class ReplayFrame:
+    image_path: Path
+    hold_sec: float | None
+    advance_on_click: bool
+    page: str | None
+
+
+@dataclass(frozen=True)
+class ReplaySession:
+    session_dir: Path
+    frames: tuple[ReplayFrame, ...]
+
+    @classmethod
+    def load(cls, session_dir: Path) -> "ReplaySession":
+        """session.json(있으면)과 PNG 프레임으로 녹화 세션을 읽어온다.
+
+        session.json이 없으면 PNG 파일명 순서대로, 클릭할 때마다 다음 프레임으로 넘어가는 세션으로 간주한다.
+        """
+
+        manifest_file = session_dir / MANIFEST_FILE_NAME
+        if not manifest_file.exists():
+            frame_paths = sorted(session_dir.glob("*.png"))
+            frames = tuple(
+                ReplayFrame(image_path=frame_path, hold_sec=None, advance_on_click=True, page=None)
+                for frame_path in frame_paths
+            )
+        else:
+            try:
+                data = json.loads(manifest_file.read_text(encoding="utf-8"))
+                frames = tuple(
+                    ReplayFrame(
+                        image_path=session_dir / str(entry["file"]),
+                        hold_sec=float(entry["hold_sec"]) if entry.get("hold_sec") is not None else None,
+                        advance_on_click=bool(entry.get("advance_on_click", False)),
+                        page=str(entry["page"]) if entry.get("page") else None,
+                    )
+                    for entry in data["frames"]
+                )
+            except (ValueError, TypeError, KeyError, json.JSONDecodeError) as error:
+                raise ValueError(f"리플레이 세션 파일 파싱 실패: {error}") from error
+
+        if not frames:
+            raise ValueError(f"리플레이 세션에 프레임이 없습니다: {session_dir}")
+        return cls(session_dir=session_dir, frames=frames)
+
+
+class ReplayCaptureBackend(CaptureBackend):
+    """녹화된 프레임을 시간(hold_sec)과 클릭(advance_on_click)에 맞춰 넘겨주는 캡처 백엔드."""
+
+    name = "replay"
+
+    def __init__(self, session: ReplaySession):
+        self._session = session
+        self._frames = SyntheticCaptureBackend([frame.image_path for frame in session.frames], loop=False)
+        self._index = 0
+        self._shown_at = time.monotonic()
+        self.shown_at: list[float | None] = [None] * len(session.frames)
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def current(self) -> ReplayFrame:
+        return self._session.frames[self._index]
+
+    @property
+    def current_shown_at(self) -> float:
+        return self._shown_at
+
+    @property
+    def is_last_frame(self) -> bool:
+        return self._index + 1 >= len(self._session.frames)
+
+    @property
+    def screen_size(self) -> tuple[int, int]:
+        image = self._frames.current
+        return int(image.shape[1]), int(image.shape[0])
+
+    def start(self):
+        self._index = 0
+        self._show_current()
+
+    def grab(self, region: Region | None) -> Frame:
+        self._advance_by_time()
+        return self._frames.grab(region)
+
+    def on_click(self, _click: RecordedClick):
+        if self.current.advance_on_click:
+            self._advance()
+
+    def _advance_by_time(self):
+        now = time.monotonic()
+        while self.current.hold_sec is not None and now - self._shown_at >= self.current.hold_sec:
+            if not self._advance(shown_at=self._shown_at + self.current.hold_sec):
+                return
+
+    def _advance(self, shown_at: float | None = None) -> bool:
+        if self.is_last_frame:
+            return False
+        self._index += 1
+        self._frames.advance()
+        self._show_current(shown_at)
+        return True
+
+    def _show_current(self, shown_at: float | None = None):
+        self._shown_at = shown_at if shown_at is not None else time.monotonic()
+        self.shown_at[self._index] = self._shown_at
+
+
+@dataclass
+class ReplayClick:
+    at_sec: float
+    x: int
+    y: int
+    frame_index: int
+    page: str | None
+    latency_sec: float
+
+
+@dataclass
+class ReplayReport:
+    session_dir: str
+    outcome: str = "timeout"
+    elapsed_sec: float = 0.0
+    ticks: int = 0
+    clicks: list[ReplayClick] = field(default_factory=list)
+    phase_transitions: list[tuple[float, str]] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def summary_lines(self) -> list[str]:
+        lines = [
+            f"- 결과: {self.outcome}",
+            f"- 경과 시간: {self.elapsed_sec:.3f}초, 틱 {self.ticks}회",
+            "- 단계 전환: " + " → ".join(phase for _, phase in self.phase_transitions),
+        ]
+        for click in self.clicks:
+            page_label = click.page or f"frame#{click.frame_index}"
+            lines.append(
+                f"- 클릭 {click.at_sec:.3f}초: ({click.x}, {click.y}) {page_label}, 화면 표시 후 {click.latency_sec * 1000:.1f}ms"
+            )
+        return lines
+
+
+class ReplayHarness:
+    def __init__(
+        self,
+        session: ReplaySession,
+        config: SRTConfig,
+        target_dir: Path | None = None,
+        timeout_sec: float = 30.0,
+        idle_after_last_frame_sec: float = 2.0,
+    ):
+        self._session = session
+        self._timeout_sec = timeout_sec
+        self._idle_after_last_frame_sec = idle_after_last_frame_sec
+        self._capture = ReplayCaptureBackend(session)
+        self._input = RecordingInputBackend(self._capture.screen_size, on_click=self._on_click)
+        self._report = ReplayReport(session_dir=str(session.session_dir))
+        self._started_at = 0.0
+
+        session_targets = session.session_dir / "targets"
+        if target_dir is None and session_targets.exists():
+            target_dir = session_targets
+        # 에이전트가 ROI 파일 옆에 쓰는 상태 파일(버튼 위치 기록/자동 ROI/템플릿 배율/탐지 프로필)이 녹화 폴더에
+        # 남아 다음 리플레이 결과를 바꾸지 않도록, 매번 빈 임시 폴더에 수동 ROI만 복사해 쓴다.
+        self._state_dir = tempfile.TemporaryDirectory(prefix="srt-replay-")
+        region_file = Path(self._state_dir.name) / "result_region.json"
+        session_region_file = session.session_dir / "result_region.json"
+        if session_region_file.exists():
+            shutil.copyfile(session_region_file, region_file)
+        self.agent = SRTMacroAgent(
+            config.model_copy(update={"enable_telegram_notification": False}),
+            capture_backend=self._capture,
+            input_backend=self._input,
+            target_dir=target_dir,
+            result_region_file=region_file,
+        )
+        # 준비 비용이 첫 프레임 반응 시간에 섞이지 않도록 리플레이 시작 전에 끝낸다.
+        self.agent.prepare()
+
+    def run(self) -> ReplayReport:
+        try:
+            return self._run()
+        finally:
+            self.agent.close()
+            self._state_dir.cleanup()
+
+    def _run(self) -> ReplayReport:
+        self._capture.start()
+        self._started_at = time.monotonic()
+        self.agent.start_cycle()
+        self._record_phase()
+
+        while True:
+            if not self.agent.is_running:
+                self._report.outcome = "success" if self._report.clicks else "stopped"
+                break
+            now = time.monotonic()
+            if now - self._started_at >= self._timeout_sec:
+                self._report.outcome = "timeout"
+                break
+            if (
+                self._capture.is_last_frame
+                and now - self._capture.current_shown_at >= self._idle_after_last_frame_sec
+            ):
+                self._report.outcome = "exhausted"
+                break
+
+            self.agent.run_tick()
+            self._report.ticks += 1
+            self._record_phase()
+
+        self._report.elapsed_sec = time.monotonic() - self._started_at
+        return self._report
+
+    def _on_click(self, click: RecordedClick):
+        self._report.clicks.append(
+            ReplayClick(
+                at_sec=click.at - self._started_at,
+                x=click.x,
+                y=click.y,
+                frame_index=self._capture.index,
+                page=self._capture.current.page,
+                latency_sec=click.at - self._capture.current_shown_at,
+            )
+        )
+        self._capture.on_click(click)
+
+    def _record_phase(self):
+        phase = self.agent.phase.value
+        if self._report.phase_transitions and self._report.phase_transitions[-1][1] == phase:
+            return
+        self._report.phase_transitions.append((time.monotonic() - self._started_at, phase))
+
+
+def run_replay(
+    session_dir: Path,
+    config: SRTConfig,
+    report_file: Path | None = None,
+) -> ReplayReport:
+    print(f"\n리플레이를 시작합니다: {session_dir}")
+    report = ReplayHarness(ReplaySession.load(session_dir), config).run()
+
+    print("\n리플레이 결과")
+    for line in report.summary_lines():
+        print(line)
+
+    if report_file is not None:
+        report_file.parent.mkdir(parents=True, exist_ok=True)
+        report_file.write_text(json.dumps(report.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"- 리포트 저장: {report_file}")
+    return report
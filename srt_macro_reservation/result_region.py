@@ -0,0 +1,174 @@
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from srt_macro_reservation.models import Region, TemplateMatch
+
+if TYPE_CHECKING:
+    # 에이전트가 ROI 파일만 읽을 때 OpenCV/PIL까지 import하지 않도록 타입 확인용으로만 가져온다.
+    from srt_macro_reservation.capture_backend import Frame
+
+# 배경(가장 흔한 밝기)과 이 값 이상 차이 나는 픽셀을 글자/버튼/테두리로 본다.
+_INK_THRESHOLD = 24
+# 열/행 안에서 잉크 픽셀 비율이 이 값을 넘어야 내용이 있는 열/행으로 본다.
+_MIN_INK_RATIO = 0.01
+# 조회하기 버튼 위치가 이보다 많이 움직이면(입력 좌표 px) 창이 이동한 것으로 본다.
+ANCHOR_MOVE_TOLERANCE = 8
+
+
+@dataclass(frozen=True)
+class DiscoveredRegion:
+    """자동으로 찾은 결과 영역과, 그 영역을 측정했을 때의 화면 조건 (좌표는 모두 입력 좌표)."""
+
+    region: Region
+    anchor: tuple[int, int]
+    screen_size: tuple[int, int]
+    coordinate_scale: tuple[float, float]
+
+    def matches_display(self, screen_size: tuple[int, int], coordinate_scale: tuple[float, float]) -> bool:
+        if tuple(screen_size) != self.screen_size:
+            return False
+        return all(abs(current - saved) < 0.02 for current, saved in zip(coordinate_scale, self.coordinate_scale))
+
+    def anchor_moved(self, anchor: tuple[int, int]) -> bool:
+        return max(abs(anchor[0] - self.anchor[0]), abs(anchor[1] - self.anchor[1])) > ANCHOR_MOVE_TOLERANCE
+
+    def to_dict(self) -> dict:
+        left, top, width, height = self.region
+        return {
+            "x": left,
+            "y": top,
+            "width": width,
+            "height": height,
+            "anchor": {"x": self.anchor[0], "y": self.anchor[1]},
+            "screen": {"width": self.screen_size[0], "height": self.screen_size[1]},
+            "scale": {"x": round(self.coordinate_scale[0], 4), "y": round(self.coordinate_scale[1], 4)},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DiscoveredRegion":
+        return cls(
+            region=(int(data["x"]), int(data["y"]), int(data["width"]), int(data["height"])),
+            anchor=(int(data["anchor"]["x"]), int(data["anchor"]["y"])),
+            screen_size=(int(data["screen"]["width"]), int(data["screen"]["height"])),
+            coordinate_scale=(float(data["scale"]["x"]), float(data["scale"]["y"])),
+        )
+
+
+def load_manual_region(region_file: Path) -> Region | None:
+    """calculate_result_region.py로 저장한 ROI 파일을 읽는다 (입력 좌표)."""
+
+    if not region_file.exists():
+        return None
+
+    try:
+        data = json.loads(region_file.read_text(encoding="utf-8"))
+        left = int(data["x"])
+        top = int(data["y"])
+        width = int(data["width"])
+        height = int(data["height"])
+    except (ValueError, TypeError, KeyError, json.JSONDecodeError) as error:
+        print(f"\nROI 설정 파일 파싱 실패: {error}")
+        return None
+
+    if width <= 0 or height <= 0:
+        print("\nROI 설정 파일의 width/height 값이 잘못되었습니다.")
+        return None
+
+    return (left, top, width, height)
+
+
+def load_discovered_region(region_file: Path) -> DiscoveredRegion | None:
+    if not region_file.exists():
+        return None
+    try:
+        discovered = DiscoveredRegion.from_dict(json.loads(region_file.read_text(encoding="utf-8")))
+    except (ValueError, TypeError, KeyError, json.JSONDecodeError) as error:
+        print(f"\n자동 ROI 파일 파싱 실패: {error}")
+        return None
+    if discovered.region[2] <= 0 or discovered.region[3] <= 0:
+        return None
+    return discovered
+
+
+def save_discovered_region(region_file: Path, discovered: DiscoveredRegion):
+    region_file.parent.mkdir(parents=True, exist_ok=True)
+    region_file.write_text(json.dumps(discovered.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def discover_result_region(frame: "Frame", anchor: TemplateMatch) -> Region | None:
+    """조회하기 버튼 아래에서 결과 표 영역을 찾는다 (좌표는 frame과 같은 캡처 좌표).
+
+    조회하기 버튼 중심 열에서 시작해 내용이 있는 열을 좌우로 이어 붙이고(버튼 너비 2배 넘게 빈 열이
+    이어지면 표의 끝), 그 열 범위 안에서 내용이 있는 행을 아래로 이어 붙인다(버튼 높이 3배 넘게
+    빈 행이 이어지면 표의 끝). 행 묶음이 2개 미만이면 표가 아직 그려지지 않은 것으로 보고 None.
+    """
+
+    image = frame.image
+    band_top = max(0, anchor.top - frame.top + anchor.height)
+    band = image[band_top:]
+    if band.shape[0] < anchor.height * 2 or band.shape[1] < anchor.width:
+        return None
+
+    background = int(np.bincount(band.ravel(), minlength=256).argmax())
+    ink = np.abs(band.astype(np.int16) - background) > _INK_THRESHOLD
+
+    content_columns = ink.mean(axis=0) > _MIN_INK_RATIO
+    anchor_column = anchor.left - frame.left + anchor.width // 2
+    column_span = _grow_span(content_columns, anchor_column, max_gap=anchor.width * 2)
+    if column_span is None:
+        return None
+    left, right = column_span
+
+    content_rows = ink[:, left:right].mean(axis=1) > _MIN_INK_RATIO
+    first_row = int(np.argmax(content_rows)) if content_rows.any() else None
+    if first_row is None:
+        return None
+    row_span = _grow_span(content_rows, first_row, max_gap=anchor.height * 3)
+    if row_span is None:
+        return None
+    top, bottom = row_span
+    if _count_runs(content_rows[top:bottom]) < 2:
+        return None
+
+    width, height = right - left, bottom - top
+    if width < anchor.width or height < anchor.height * 2:
+        return None
+
+    padding = max(2, anchor.height // 2)
+    region_left = max(0, left - padding)
+    region_top = max(0, band_top + top - padding)
+    region_right = min(image.shape[1], right + padding)
+    region_bottom = min(image.shape[0], band_top + bottom + padding)
+    return (
+        frame.left + region_left,
+        frame.top + region_top,
+        region_right - region_left,
+        region_bottom - region_top,
+    )
+
+
+def _grow_span(mask: np.ndarray, start: int, max_gap: int) -> tuple[int, int] | None:
+    """start에서 가장 가까운 True 위치부터 max_gap 이하의 빈 구간을 건너뛰며 양쪽으로 넓힌 [begin, end)."""
+
+    indices = np.flatnonzero(mask)
+    if indices.size == 0:
+        return None
+    begin = end = int(np.argmin(np.abs(indices - start)))
+    if abs(int(indices[begin]) - start) > max_gap:
+        return None
+
+    while begin > 0 and indices[begin] - indices[begin - 1] <= max_gap:
+        begin -= 1
+    while end + 1 < indices.size and indices[end + 1] - indices[end] <= max_gap:
+        end += 1
+    return int(indices[begin]), int(indices[end]) + 1
+
+
+def _count_runs(mask: np.ndarray) -> int:
+    if mask.size == 0:
+        return 0
+    return int(mask[0]) + int(np.count_nonzero(mask[1:] & ~mask[:-1]))
@@ -1,24 +1,63 @@
-import math
-import platform
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import pyautogui
-import pyscreeze
-from pynput import keyboard
-from PIL import Image, UnidentifiedImageError
+import numpy as np
 
-from srt_macro_reservation.models import Region
+from srt_macro_reservation.capture_backend import CaptureBackend, Frame, PyAutoGuiCaptureBackend
+from srt_macro_reservation.frame_fingerprint import downsample_region, frame_digest
+from srt_macro_reservation.latency_tracer import LatencyTracer
+from srt_macro_reservation.input_backend import InputBackend, PyAutoGuiInputBackend, warn_if_cursor_missed
+from srt_macro_reservation.models import DetectorSearch, Region, TemplateMatch, TemplateSet
+from srt_macro_reservation.result_region import discover_result_region
+from srt_macro_reservation.spatial_memory import SpatialMemory
+from srt_macro_reservation.template_cache import PreparedTemplate, TemplateCache
+from srt_macro_reservation.template_matcher import FramePyramid, MultiTemplateMatcher, pick_first_in_template_order
 
 
 class ScreenController:
-    def __init__(self, base_confidence: float):
-        pyautogui.FAILSAFE = True
-        pyautogui.PAUSE = 0.03
+    def __init__(
+        self,
+        base_confidence: float,
+        template_cache_size: int = 64,
+        capture_backend: CaptureBackend | None = None,
+        input_backend: InputBackend | None = None,
+        tracer: LatencyTracer | None = None,
+        pyramid_matching: bool = True,
+        spatial_memory_file: Path | None = None,
+        detector_workers: int = 0,
+        template_cache: TemplateCache | None = None,
+        search_bounds: Region | None = None,
+        coordinate_scale: tuple[float, float] | None = None,
+    ):
         self._base_confidence = base_confidence
-        self._coord_scale_x, self._coord_scale_y = self._detect_coordinate_scale()
-        self._keyboard_controller = self._create_keyboard_controller()
-        self._template_cache: dict[Path, Image.Image] = {}
+        self._pyramid_matching = pyramid_matching
+        self._pyramid: FramePyramid | None = None
+        self._tracer = tracer if tracer is not None else LatencyTracer()
+        self._input = input_backend if input_backend is not None else PyAutoGuiInputBackend()
+        self._capture = capture_backend if capture_backend is not None else PyAutoGuiCaptureBackend()
+        if coordinate_scale is not None:
+            # 탐지 프로필에 저장된 배율로 시작하고, 첫 전체 화면 캡처에서 맞는지 확인한다 (시작 시 스크린샷 생략).
+            self._coord_scale_x, self._coord_scale_y = coordinate_scale
+            self._scale_verified = False
+        else:
+            self._coord_scale_x, self._coord_scale_y = self._detect_coordinate_scale()
+            self._scale_verified = True
+        self._template_cache = template_cache if template_cache is not None else TemplateCache(max_entries=template_cache_size)
+        # 여러 창을 함께 쓰는 세션 모드에서 이 컨트롤러가 맡은 창 (입력 좌표). region=None 탐색을 이 안으로 제한한다.
+        self._search_bounds = search_bounds
+        # 브라우저 확대/HiDPI 차이를 맞추기 위해 모든 템플릿에 곱하는 배율
+        self._template_scale = 1.0
+        self._frame: Frame | None = None
+        self._pre_click_frame: Frame | None = None
+        self._last_click: TemplateMatch | None = None
+        self._detector_workers = detector_workers
+        self._detector_pool: ThreadPoolExecutor | None = None
+        self._spatial_memory = (
+            SpatialMemory.load(spatial_memory_file, self._input.screen_size(), self.coordinate_scale)
+            if spatial_memory_file is not None
+            else None
+        )
 
     def locate_and_click(
         self,
@@ -28,110 +67,471 @@ class ScreenController:
         retries: int = 2,
         confidence: float | None = None,
         move_duration: float = 0.08,
+        whole_region: bool = False,
     ) -> bool:
-        location = self.locate_image(
-            image_path=image_path,
+        return self.locate_any_and_click(
+            image_paths=(image_path,),
+            description=description,
             region=region,
             retries=retries,
             confidence=confidence,
+            move_duration=move_duration,
+            whole_region=whole_region,
+        )
+
+    def locate_any_and_click(
+        self,
+        image_paths: tuple[Path, ...],
+        description: str,
+        region: Region | None,
+        retries: int = 2,
+        confidence: float | None = None,
+        move_duration: float = 0.08,
+        whole_region: bool = False,
+    ) -> bool:
+        location = self.locate_any(
+            image_paths=image_paths,
+            region=region,
+            retries=retries,
+            confidence=confidence,
+            whole_region=whole_region,
         )
         if not location:
             return False
 
-        center = pyautogui.center(location)
-        click_x, click_y = self._to_input_coordinates(center.x, center.y)
-        pyautogui.moveTo(click_x, click_y, duration=move_duration)
-        pyautogui.click()
-
-        current_x, current_y = pyautogui.position()
-        if math.hypot(current_x - click_x, current_y - click_y) > 16:
-            print("\n마우스 이동이 요청 좌표와 다릅니다. 손쉬운 사용/입력 모니터링 권한을 확인하세요.")
-        print(f"\n{description} 클릭(raw=({center.x}, {center.y}), click=({click_x}, {click_y}))")
+        self.click_match(location, description, move_duration)
         return True
 
+    def click_match(self, location: TemplateMatch, description: str, move_duration: float = 0.08):
+        center_x, center_y = location.center
+        click_x, click_y = self._to_input_coordinates(center_x, center_y)
+        with self._tracer.span("click"):
+            current_x, current_y = self._input.click(click_x, click_y, move_duration)
+        self._pre_click_frame = self._frame
+        self._last_click = location
+        self.invalidate_frame()
+
+        warn_if_cursor_missed((click_x, click_y), (current_x, current_y))
+        print(f"\n{description} 클릭(raw=({center_x}, {center_y}), click=({click_x}, {click_y}))")
+
     def locate_image(
         self,
         image_path: Path,
         region: Region | None,
         retries: int,
         confidence: float | None = None,
-    ):
-        search_region = self._to_search_region(region)
+    ) -> TemplateMatch | None:
+        return self.locate_any(
+            image_paths=(image_path,),
+            region=region,
+            retries=retries,
+            confidence=confidence,
+        )
+
+    def locate_any(
+        self,
+        image_paths: tuple[Path, ...],
+        region: Region | None,
+        retries: int,
+        confidence: float | None = None,
+        whole_region: bool = False,
+    ) -> TemplateMatch | None:
+        """여러 템플릿을 한 프레임에서 한 번에 비교해 우선순위가 가장 높은 결과를 반환."""
+
+        hits = self.match_templates(image_paths, region, retries, confidence, whole_region)
+        return pick_first_in_template_order(hits, image_paths)
+
+    def match_templates(
+        self,
+        image_paths: tuple[Path, ...],
+        region: Region | None,
+        retries: int,
+        confidence: float | None = None,
+        whole_region: bool = False,
+    ) -> list[TemplateMatch]:
+        """region에서 템플릿을 찾는다. 기억된 위치가 있으면 그 주변 창을 먼저 보고, 없을 때만 넓힌다.
+
+        whole_region=True이면 기억된 창으로 좁히지 않고 region 전체를 본다 (모든 칸이 필요한 결과 표 스캔용).
+        """
+
+        search_region = self._bounded_search_region(region)
         effective_confidence = confidence if confidence is not None else self._base_confidence
-        template_image = self._load_template_image(image_path)
-        if template_image is None:
-            return None
+        matcher = self._build_matcher(image_paths)
+        if matcher is None:
+            return []
 
         for attempt in range(retries):
             try:
-                location = pyautogui.locateOnScreen(
-                    template_image,
-                    region=search_region,
-                    confidence=effective_confidence,
-                    grayscale=True,
-                )
-            except (pyautogui.ImageNotFoundException, pyscreeze.ImageNotFoundException):
-                location = None
+                frame = self.capture_frame(search_region)
+                window = self._memory_window(image_paths, search_region, frame, whole_region)
+                pyramid = self._frame_pyramid(frame) if region is None else None
+                hits = self._search_frame(matcher, frame, search_region, window, pyramid, effective_confidence)
             except OSError as error:
                 print(f"\n이미지 탐색 중 OS 오류가 발생했습니다: {error}")
-                return None
+                return []
 
-            if location:
-                return location
+            if hits:
+                if self._spatial_memory is not None and not whole_region:
+                    self._spatial_memory.remember(hits)
+                return hits
             if attempt + 1 < retries:
                 time.sleep(0.12)
-        return None
+                self.invalidate_frame()
+        return []
+
+    def match_at(self, location: TemplateMatch, confidence: float, slack: int = 4) -> TemplateMatch | None:
+        """location(캡처 좌표) 둘레 slack px만 보고 같은 템플릿이 아직 그 자리에 있는지 확인.
 
-    def _load_template_image(self, image_path: Path) -> Image.Image | None:
-        cached_image = self._template_cache.get(image_path)
-        if cached_image is not None:
-            return cached_image
+        전체 탐색 대신 버튼 크기 조각 하나만 비교하므로, 위치를 아는 버튼을 다시 누르기 전 확인용으로 쓴다.
+        """
 
+        template = self._template_cache.get(location.image_path, self._template_scale)
+        if template is None:
+            return None
+        left, top = max(0, location.left - slack), max(0, location.top - slack)
+        region = (left, top, location.left + location.width + slack - left, location.top + location.height + slack - top)
         try:
-            with Image.open(image_path) as image:
-                loaded_image = image.convert("RGB")
-        except FileNotFoundError:
-            print(f"\n이미지 파일을 찾을 수 없습니다: {image_path}")
+            frame = self.capture_frame(region)
+        except OSError as error:
+            print(f"\n이미지 탐색 중 OS 오류가 발생했습니다: {error}")
             return None
-        except PermissionError:
-            print(f"\n이미지 파일 권한이 없습니다: {image_path}")
+        matcher = MultiTemplateMatcher((template,), max_hits_per_template=1, tracer=self._tracer)
+        hits = matcher.match(frame.image, region, confidence, origin=(frame.left, frame.top))
+        return hits[0] if hits else None
+
+    def match_concurrently(self, searches: tuple[DetectorSearch, ...]) -> list[list[TemplateMatch]]:
+        """여러 탐색을 같은 틱의 프레임에서 템플릿 단위로 나눠 스레드 풀에서 동시에 실행.
+
+        cv2.matchTemplate는 실행 중 GIL을 놓으므로 탐색들이 실제로 병렬로 돈다.
+        결과는 searches와 같은 순서이고, 각 결과 안의 순서도 템플릿 순서를 따르므로 순차 실행과 같다.
+        못 찾은 탐색은 match_templates처럼 화면을 새로 캡처해 search.retries번까지 다시 본다.
+        """
+
+        results: list[list[TemplateMatch]] = [[] for _ in searches]
+        pending = list(range(len(searches)))
+        for attempt in range(max((search.retries for search in searches), default=0)):
+            if attempt > 0:
+                pending = [index for index in pending if not results[index] and attempt < searches[index].retries]
+                if not pending:
+                    break
+                time.sleep(0.12)
+                self.invalidate_frame()
+            attempt_results = self._match_once(searches, pending)
+            if attempt_results is None:
+                break
+            for index, hits in attempt_results.items():
+                results[index] = hits
+        return results
+
+    def _match_once(
+        self,
+        searches: tuple[DetectorSearch, ...],
+        indices: list[int],
+    ) -> dict[int, list[TemplateMatch]] | None:
+        """searches 중 indices만 현재 프레임에서 한 번 매칭한다. 캡처 OS 오류면 None."""
+
+        # 캡처/피라미드/템플릿 준비는 호출 스레드에서 끝내고, 작업 스레드는 매칭만 한다.
+        jobs = []
+        try:
+            for search_index in indices:
+                search = searches[search_index]
+                search_region = self._bounded_search_region(search.region)
+                frame = self.capture_frame(search_region)
+                window = self._memory_window(search.image_paths, search_region, frame, search.whole_region)
+                pyramid = self._frame_pyramid(frame) if search.region is None else None
+                for image_path in search.image_paths:
+                    template = self._template_cache.get(image_path, self._template_scale)
+                    if template is None:
+                        continue
+                    matcher = MultiTemplateMatcher((template,), tracer=self._tracer)
+                    jobs.append((search_index, matcher, frame, search_region, window, pyramid, search.confidence))
+        except OSError as error:
+            print(f"\n이미지 탐색 중 OS 오류가 발생했습니다: {error}")
             return None
-        except UnidentifiedImageError:
-            print(f"\n이미지 파일 형식을 인식할 수 없습니다: {image_path}")
+
+        def run(job) -> list[TemplateMatch]:
+            return self._search_frame(*job[1:])
+
+        pool = self._executor() if len(jobs) > 1 else None
+        job_hits = list(pool.map(run, jobs)) if pool is not None else [run(job) for job in jobs]
+
+        results: dict[int, list[TemplateMatch]] = {index: [] for index in indices}
+        for job, hits in zip(jobs, job_hits):
+            results[job[0]].extend(hits)
+        if self._spatial_memory is not None:
+            self._spatial_memory.remember(
+                [hit for job, hits in zip(jobs, job_hits) if not searches[job[0]].whole_region for hit in hits]
+            )
+        return results
+
+    def close(self):
+        if self._detector_pool is not None:
+            self._detector_pool.shutdown(wait=False, cancel_futures=True)
+            self._detector_pool = None
+        if self._spatial_memory is not None:
+            self._spatial_memory.flush()
+
+    def _executor(self) -> ThreadPoolExecutor | None:
+        if self._detector_workers <= 1:
             return None
-        except OSError as error:
-            print(f"\n이미지 파일 로드 중 OS 오류가 발생했습니다: {error}")
+        if self._detector_pool is None:
+            self._detector_pool = ThreadPoolExecutor(max_workers=self._detector_workers, thread_name_prefix="SRTDetector")
+        return self._detector_pool
+
+    def _search_frame(
+        self,
+        matcher: MultiTemplateMatcher,
+        frame: Frame,
+        search_region: Region | None,
+        window: Region | None,
+        pyramid: FramePyramid | None,
+        confidence: float,
+    ) -> list[TemplateMatch]:
+        origin = (frame.left, frame.top)
+        if window is not None:
+            hits = matcher.match(frame.image, window, confidence, origin=origin, pyramid=pyramid)
+            if hits:
+                return hits
+        return matcher.match(frame.image, search_region, confidence, origin=origin, pyramid=pyramid)
+
+    def _memory_window(
+        self,
+        image_paths: tuple[Path, ...],
+        search_region: Region | None,
+        frame: Frame,
+        whole_region: bool,
+    ) -> Region | None:
+        # 창 안에서 하나라도 찾으면 나머지 영역은 보지 않으므로, 표 스캔에 쓰면 다른 열/행의 칸을 놓친다.
+        if self._spatial_memory is None or whole_region:
             return None
+        bounds = search_region if search_region is not None else (frame.left, frame.top, frame.width, frame.height)
+        return self._spatial_memory.window_for(image_paths, bounds)
 
-        self._template_cache[image_path] = loaded_image
-        return loaded_image
+    def capture_frame(self, region: Region | None = None) -> Frame:
+        """현재 틱의 공유 프레임(그레이스케일)을 반환하고, 요청 영역을 덮지 못할 때만 새로 캡처.
 
-    def scroll_to_top(self):
-        for _ in range(3):
-            pyautogui.scroll(3000)
-            time.sleep(0.05)
+        ROI 전용 백엔드는 요청 영역만 캡처하고, 그 외 백엔드는 항상 전체 화면을 캡처한다.
+        """
 
+        if self._frame is None or not self._frame.covers(region):
+            capture_region = region if self._capture.captures_region_only else None
+            with self._tracer.span("capture"):
+                self._frame = self._capture.grab(capture_region)
+            if not self._scale_verified and not self._frame.partial:
+                self._verify_coordinate_scale(self._frame)
+        return self._frame
+
+    def region_fingerprint(self, region: Region | None) -> np.ndarray | None:
+        """현재 화면의 region(입력 좌표) 썸네일을 새로 캡처해 반환 (클릭 후 화면 변화 감지용)."""
+
+        region = self._bounded_search_region(region)
+        self.invalidate_frame()
         try:
-            if platform.system() == "Darwin" and self._keyboard_controller is not None:
-                with self._keyboard_controller.pressed(keyboard.Key.cmd):
-                    self._keyboard_controller.press(keyboard.Key.up)
-                    self._keyboard_controller.release(keyboard.Key.up)
-            elif platform.system() != "Darwin":
-                pyautogui.press("home")
-        except Exception:
-            pass
+            return downsample_region(self.capture_frame(region), region)
+        except OSError:
+            return None
 
-        time.sleep(0.08)
+    def frame_digest(self, region: Region | None = None) -> bytes | None:
+        """현재 틱 프레임에서 region(입력 좌표) 부분의 지문 (화면 변화 여부 판단용).
 
-    @staticmethod
-    def top_search_region() -> Region:
-        screen_width, screen_height = pyautogui.size()
+        region이 없으면 전체 화면(세션 모드에서는 맡은 창)을 쓴다.
+        """
+
+        bounds = self._bounded_search_region(region)
+        try:
+            frame = self.capture_frame(bounds)
+            return frame_digest(frame.crop(bounds) if bounds is not None else frame)
+        except OSError:
+            return None
+
+    def pre_click_fingerprint(self, region: Region | None) -> np.ndarray | None:
+        """마지막 클릭 직전 프레임의 region(입력 좌표) 썸네일. 클릭 전 프레임이 region을 덮지 못하면 None."""
+
+        region = self._bounded_search_region(region)
+        frame = self._pre_click_frame
+        if frame is None or not frame.covers(region):
+            return None
+        return downsample_region(frame, region)
+
+    def click_snapshot(self, region: Region | None) -> tuple[np.ndarray, Region | None] | None:
+        """마지막 클릭 직전 프레임을 region(입력 좌표)으로 자른 이미지(복사하지 않은 뷰)와, 그 이미지 안에서 클릭한 버튼 영역."""
+
+        frame = self._pre_click_frame
+        if frame is None:
+            return None
+        region = self._bounded_search_region(region)
+        if region is not None:
+            frame = frame.crop(region)
+        if frame.image.size == 0:
+            return None
+        click = self._last_click
+        highlight = (click.left - frame.left, click.top - frame.top, click.width, click.height) if click else None
+        return frame.image, highlight
+
+    def discover_result_region(self, anchor: TemplateMatch) -> Region | None:
+        """현재 화면에서 조회하기 버튼(anchor) 아래 결과 표 영역을 찾아 입력 좌표로 반환."""
+
+        bounds = self._bounded_search_region(None)
+        try:
+            frame = self.capture_frame(bounds)
+            region = discover_result_region(frame.crop(bounds) if bounds is not None else frame, anchor)
+        except OSError:
+            return None
+        return self._to_input_region(region) if region is not None else None
+
+    def input_point(self, location: TemplateMatch) -> tuple[int, int]:
+        return self._to_input_coordinates(*location.center)
+
+    def screen_size(self) -> tuple[int, int]:
+        return self._input.screen_size()
+
+    @property
+    def coordinate_scale(self) -> tuple[float, float]:
+        return self._coord_scale_x, self._coord_scale_y
+
+    @property
+    def spatial_memory_revision(self) -> int:
+        return self._spatial_memory.revision if self._spatial_memory is not None else 0
+
+    @property
+    def last_click(self) -> TemplateMatch | None:
+        """마지막으로 클릭한 템플릿 매칭 결과 (캡처 좌표)."""
+
+        return self._last_click
+
+    @property
+    def capture_backend_name(self) -> str:
+        return self._capture.name
+
+    @property
+    def input_backend_name(self) -> str:
+        return self._input.name
+
+    def invalidate_frame(self):
+        """클릭/스크롤 등 화면이 바뀌는 동작 이후 다음 탐색에서 새로 캡처하도록 표시."""
+
+        self._frame = None
+        self._pyramid = None
+
+    def _frame_pyramid(self, frame: Frame) -> FramePyramid | None:
+        if not self._pyramid_matching:
+            return None
+        if self._pyramid is None or self._pyramid.image is not frame.image:
+            self._pyramid = FramePyramid(frame.image)
+        return self._pyramid
+
+    def preload_templates(self, templates: TemplateSet) -> int:
+        return self._template_cache.preload(templates.all_paths(), self._template_scale)
+
+    def preload_template_images(self, template_images: dict[Path, np.ndarray]):
+        for image_path, gray in template_images.items():
+            self._template_cache.put(image_path, gray)
+
+    def preload_scale_bank(self, image_path: Path, scales: tuple[float, ...]):
+        """배율 탐색에 쓸 템플릿 배율별 변환본을 미리 만들어 둔다."""
+
+        for scale in scales:
+            self._template_cache.get(image_path, scale)
+
+    @property
+    def template_scale(self) -> float:
+        return self._template_scale
+
+    def set_template_scale(self, scale: float):
+        self._template_scale = scale
+
+    def find_template_scale(self, image_path: Path, confidence: float, scales: tuple[float, ...]) -> float | None:
+        """현재 화면(맡은 창)에서 image_path 템플릿을 배율별로 찾아, confidence 이상 중 가장 잘 맞는 배율."""
+
+        search_region = self._bounded_search_region(None)
+        try:
+            frame = self.capture_frame(search_region)
+        except OSError as error:
+            print(f"\n이미지 탐색 중 OS 오류가 발생했습니다: {error}")
+            return None
+
+        pyramid = self._frame_pyramid(frame)
+        best_scale, best_score = None, confidence
+        for scale in scales:
+            template = self._template_cache.get(image_path, scale)
+            if template is None:
+                return None
+            matcher = MultiTemplateMatcher((template,), max_hits_per_template=1, tracer=self._tracer)
+            for hit in matcher.match(frame.image, search_region, best_score, origin=(frame.left, frame.top), pyramid=pyramid):
+                if best_scale is None or hit.score > best_score:
+                    best_scale, best_score = scale, hit.score
+        return best_scale
+
+    def warm_up(self, image_paths: tuple[Path, ...]) -> int:
+        """템플릿을 붙여 만든 작은 합성 프레임에서 매칭을 한 번 돌리고 결과는 버린다.
+
+        화면을 캡처하지 않고 템플릿 캐시(LRU), 탐지 스레드 풀, OpenCV/NumPy 매칭 경로만 데워 둔다.
+        매칭한 템플릿 수를 반환.
+        """
+
+        templates = tuple(
+            template
+            for template in (self._template_cache.get(image_path, self._template_scale) for image_path in image_paths)
+            if template is not None and not template.is_flat
+        )
+        if not templates:
+            return 0
+
+        frame = np.full(
+            (max(template.height for template in templates) * 2, sum(template.width for template in templates) * 2),
+            255,
+            dtype=np.uint8,
+        )
+        left = 0
+        for template in templates:
+            frame[: template.height, left : left + template.width] = template.image
+            left += template.width * 2
+        pyramid = FramePyramid(frame) if self._pyramid_matching else None
+
+        def run(template: PreparedTemplate) -> list[TemplateMatch]:
+            # 매칭 구간 통계에 섞이지 않도록 비활성 tracer로 돌린다.
+            matcher = MultiTemplateMatcher((template,), max_hits_per_template=1)
+            return matcher.match(frame, None, self._base_confidence, pyramid=pyramid)
+
+        # 예약 단계 탐지처럼 템플릿마다 작업을 나눠, 첫 틱에서 풀 스레드를 만드는 비용도 미리 치른다.
+        pool = self._executor() if len(templates) > 1 else None
+        if pool is not None:
+            list(pool.map(run, templates))
+        else:
+            for template in templates:
+                run(template)
+        return len(templates)
+
+    def _build_matcher(self, image_paths: tuple[Path, ...]) -> MultiTemplateMatcher | None:
+        templates = tuple(
+            template
+            for template in (self._template_cache.get(image_path, self._template_scale) for image_path in image_paths)
+            if template is not None
+        )
+        if not templates:
+            return None
+        return MultiTemplateMatcher(templates, tracer=self._tracer)
+
+    def scroll_to_top(self):
+        if self._search_bounds is not None:
+            left, top, width, height = self._search_bounds
+            self._input.scroll_to_top(at=(left + width // 2, top + height // 2))
+        else:
+            self._input.scroll_to_top()
+        self.invalidate_frame()
+
+    def top_search_region(self) -> Region:
+        if self._search_bounds is not None:
+            left, top, width, height = self._search_bounds
+            return (left, top, width, min(height, max(220, int(height * 0.45))))
+        screen_width, screen_height = self._input.screen_size()
         return (0, 0, screen_width, max(220, int(screen_height * 0.45)))
 
     def _detect_coordinate_scale(self) -> tuple[float, float]:
         try:
-            screen_width, screen_height = pyautogui.size()
-            screenshot_width, screenshot_height = pyautogui.screenshot().size
+            screen_width, screen_height = self._input.screen_size()
+            full_frame = self._capture.grab(None)
+            screenshot_width, screenshot_height = full_frame.width, full_frame.height
         except Exception:
             return 1.0, 1.0
 
@@ -146,21 +546,32 @@ class ScreenController:
         print(f"- 좌표 보정 스케일 감지: x{scale_x:.3f}, y{scale_y:.3f}")
         return scale_x, scale_y
 
-    @staticmethod
-    def _create_keyboard_controller() -> keyboard.Controller | None:
-        try:
-            return keyboard.Controller()
-        except Exception:
-            return None
+    def _verify_coordinate_scale(self, frame: Frame):
+        self._scale_verified = True
+        screen_width, screen_height = self._input.screen_size()
+        if frame.width <= 0 or frame.height <= 0:
+            return
+        scale_x, scale_y = screen_width / frame.width, screen_height / frame.height
+        if abs(scale_x - self._coord_scale_x) < 0.02 and abs(scale_y - self._coord_scale_y) < 0.02:
+            return
+        if abs(scale_x - 1.0) < 0.02 and abs(scale_y - 1.0) < 0.02:
+            scale_x, scale_y = 1.0, 1.0
+        print(f"\n좌표 보정 스케일이 탐지 프로필과 달라 다시 설정합니다: x{scale_x:.3f}, y{scale_y:.3f}")
+        self._coord_scale_x, self._coord_scale_y = scale_x, scale_y
 
     def _to_input_coordinates(self, x: int, y: int) -> tuple[int, int]:
-        screen_width, screen_height = pyautogui.size()
+        screen_width, screen_height = self._input.screen_size()
         scaled_x = int(round(x * self._coord_scale_x))
         scaled_y = int(round(y * self._coord_scale_y))
         scaled_x = max(0, min(screen_width - 1, scaled_x))
         scaled_y = max(0, min(screen_height - 1, scaled_y))
         return scaled_x, scaled_y
 
+    def _bounded_search_region(self, region: Region | None) -> Region | None:
+        """캡처 좌표 탐색 영역. region이 없으면(전체 화면 탐색) 맡은 창이 있을 때 그 창으로 제한한다."""
+
+        return self._to_search_region(region if region is not None else self._search_bounds)
+
     def _to_search_region(self, region: Region | None) -> Region | None:
         if region is None:
             return None
@@ -174,3 +585,15 @@ class ScreenController:
         mapped_width = max(1, int(round(width / self._coord_scale_x)))
         mapped_height = max(1, int(round(height / self._coord_scale_y)))
         return (mapped_left, mapped_top, mapped_width, mapped_height)
+
+    def _to_input_region(self, region: Region) -> Region:
+        if abs(self._coord_scale_x - 1.0) < 0.02 and abs(self._coord_scale_y - 1.0) < 0.02:
+            return region
+
+        left, top, width, height = region
+        return (
+            int(round(left * self._coord_scale_x)),
+            int(round(top * self._coord_scale_y)),
+            max(1, int(round(width * self._coord_scale_x))),
+            max(1, int(round(height * self._coord_scale_y))),
+        )
@@ -0,0 +1,140 @@
+import json
+from pathlib import Path
+
+from srt_macro_reservation.models import Region, TemplateMatch
+
+# 저장된 위치에서 이보다 많이 움직였을 때만(캡처 좌표 px) 새 위치로 기억한다.
+_MOVE_TOLERANCE = 8
+# 기억된 버튼 둘레에 두는 여유 (버튼 크기에 비례하되 이 범위로 제한, 캡처 좌표 px)
+_MIN_MARGIN = 48
+_MAX_MARGIN = 160
+
+
+class SpatialMemory:
+    """템플릿별 마지막 발견 위치를 기억해, 다음 탐색을 그 주변 작은 창에서 먼저 하도록 돕는다.
+
+    좌표는 캡처 좌표 기준이며, 측정 당시 화면 크기/좌표 배율과 함께 파일에 저장된다.
+    remember()는 탐지와 클릭 사이(틱 스레드)에서 불리므로 메모리만 고치고, 파일은 flush()에서 쓴다.
+    """
+
+    def __init__(
+        self,
+        memory_file: Path | None,
+        screen_size: tuple[int, int],
+        coordinate_scale: tuple[float, float],
+    ):
+        self._memory_file = memory_file
+        self._screen_size = tuple(screen_size)
+        self._coordinate_scale = tuple(coordinate_scale)
+        self._positions: dict[str, Region] = {}
+        self._dirty = False
+        # 기억한 위치가 바뀔 때마다 1씩 늘어난다 (위치 기록에 따라 탐색 결과가 달라질 수 있음을 알리는 용도).
+        self.revision = 0
+
+    @classmethod
+    def load(
+        cls,
+        memory_file: Path,
+        screen_size: tuple[int, int],
+        coordinate_scale: tuple[float, float],
+    ) -> "SpatialMemory":
+        memory = cls(memory_file, screen_size, coordinate_scale)
+        if not memory_file.exists():
+            return memory
+
+        try:
+            data = json.loads(memory_file.read_text(encoding="utf-8"))
+            saved_screen = (int(data["screen"]["width"]), int(data["screen"]["height"]))
+            saved_scale = (float(data["scale"]["x"]), float(data["scale"]["y"]))
+            positions = {
+                name: (int(box["x"]), int(box["y"]), int(box["width"]), int(box["height"]))
+                for name, box in data["templates"].items()
+            }
+        except (ValueError, TypeError, KeyError, AttributeError, json.JSONDecodeError) as error:
+            print(f"\n버튼 위치 기록 파일 파싱 실패: {error}")
+            return memory
+
+        same_scale = all(abs(current - saved) < 0.02 for current, saved in zip(memory._coordinate_scale, saved_scale))
+        if saved_screen != memory._screen_size or not same_scale:
+            print("\n화면 해상도/배율이 달라 저장된 버튼 위치 기록을 사용하지 않습니다.")
+            return memory
+
+        memory._positions = positions
+        return memory
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def position(self, image_path: Path) -> Region | None:
+        return self._positions.get(image_path.name)
+
+    def window_for(
+        self,
+        image_paths: tuple[Path, ...],
+        bounds: Region,
+    ) -> Region | None:
+        """모든 템플릿의 기억된 위치를 감싸는 탐색 창 (bounds 안으로 자름).
+
+        하나라도 기억이 없으면 None을 돌려 원래 영역을 그대로 탐색하게 한다.
+        """
+
+        boxes = [self._positions.get(image_path.name) for image_path in image_paths]
+        if not boxes or any(box is None for box in boxes):
+            return None
+
+        bounds_left, bounds_top, bounds_width, bounds_height = bounds
+        bounds_right, bounds_bottom = bounds_left + bounds_width, bounds_top + bounds_height
+        left, top, right, bottom = bounds_right, bounds_bottom, bounds_left, bounds_top
+        for box_left, box_top, box_width, box_height in boxes:
+            margin_x = min(_MAX_MARGIN, max(_MIN_MARGIN, box_width // 2))
+            margin_y = min(_MAX_MARGIN, max(_MIN_MARGIN, box_height))
+            left = min(left, box_left - margin_x)
+            right = max(right, box_left + box_width + margin_x)
+            top = min(top, box_top - margin_y)
+            bottom = max(bottom, box_top + box_height + margin_y)
+
+        left, top = max(left, bounds_left), max(top, bounds_top)
+        right, bottom = min(right, bounds_right), min(bottom, bounds_bottom)
+        if right <= left or bottom <= top:
+            return None
+        if (right - left) * (bottom - top) >= bounds_width * bounds_height:
+            return None
+        return (left, top, right - left, bottom - top)
+
+    def remember(self, hits: list[TemplateMatch]):
+        """템플릿별로 가장 위(같으면 왼쪽) 결과의 위치를 기억한다. 위치가 바뀌었으면 저장 대상으로 표시."""
+
+        topmost: dict[str, TemplateMatch] = {}
+        for hit in hits:
+            current = topmost.get(hit.image_path.name)
+            if current is None or (hit.top, hit.left) < (current.top, current.left):
+                topmost[hit.image_path.name] = hit
+
+        for hit in topmost.values():
+            box = (hit.left, hit.top, hit.width, hit.height)
+            saved = self._positions.get(hit.image_path.name)
+            if saved is not None and max(abs(box[0] - saved[0]), abs(box[1] - saved[1])) <= _MOVE_TOLERANCE:
+                continue
+            self._positions[hit.image_path.name] = box
+            self._dirty = True
+            self.revision += 1
+
+    def flush(self):
+        """바뀐 위치가 있으면 파일에 쓴다 (종료 시 호출)."""
+
+        if not self._dirty or self._memory_file is None:
+            return
+        self._dirty = False
+        data = {
+            "screen": {"width": self._screen_size[0], "height": self._screen_size[1]},
+            "scale": {"x": round(self._coordinate_scale[0], 4), "y": round(self._coordinate_scale[1], 4)},
+            "templates": {
+                name: {"x": left, "y": top, "width": width, "height": height}
+                for name, (left, top, width, height) in sorted(self._positions.items())
+            },
+        }
+        try:
+            self._memory_file.parent.mkdir(parents=True, exist_ok=True)
+            self._memory_file.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        except OSError as error:
+            print(f"\n버튼 위치 기록 저장 실패: {error}")
@@ -1,180 +1,508 @@
-import json
+import asyncio
 import platform
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from pynput import keyboard
-
+from srt_macro_reservation.booking_priority import parse_priority
+from srt_macro_reservation.change_gate import ChangeGate
 from srt_macro_reservation.config import SRTConfig
-from srt_macro_reservation.models import RefreshOutcome, ScanPhase
+from srt_macro_reservation.input_backend import InputBackend, create_input_backend
+from srt_macro_reservation.latency_tracer import LatencyTracer
+from srt_macro_reservation.models import DetectorSearch, RefreshOutcome, Region, ScanPhase
 from srt_macro_reservation.notifier import ReservationNotifier
-from srt_macro_reservation.screen_controller import ScreenController
+from srt_macro_reservation.refresh_governor import RefreshGovernor
+from srt_macro_reservation.result_region import (
+    DiscoveredRegion,
+    load_discovered_region,
+    load_manual_region,
+    save_discovered_region,
+)
+from srt_macro_reservation.startup_report import startup_report
+from srt_macro_reservation.table_scanner import CellKind, TableScanner, TableSnapshot
+from srt_macro_reservation.template_scale import TEMPLATE_SCALES, display_key, load_template_scale, save_template_scale
 from srt_macro_reservation.template_store import TemplateStore
 
+if TYPE_CHECKING:
+    # 캡처/매칭 모듈은 OpenCV/PIL을 끌어오므로 prepare()에서 처음 쓸 때 import한다.
+    from srt_macro_reservation.capture_backend import CaptureBackend
+    from srt_macro_reservation.detection_profile import DetectionProfile
+    from srt_macro_reservation.template_cache import TemplateCache
+
+
+def _load_keyboard_module():
+    # pynput은 import 시점에 디스플레이에 연결하므로, 헤드리스 리플레이에서도 import 가능하도록 지연 로드한다.
+    from pynput import keyboard  # noqa: PLC0415
+
+    return keyboard
+
+
+def key_to_name(key) -> str | None:
+    keyboard = _load_keyboard_module()
+    if isinstance(key, keyboard.KeyCode) and key.char:
+        return key.char.lower()
+    if isinstance(key, keyboard.Key):
+        return key.name.lower()
+    return None
+
 
 class SRTMacroAgent:
-    def __init__(self, config: SRTConfig):
+    def __init__(
+        self,
+        config: SRTConfig,
+        capture_backend: "CaptureBackend | None" = None,
+        input_backend: InputBackend | None = None,
+        target_dir: Path | None = None,
+        result_region_file: Path | None = None,
+        window_region: Region | None = None,
+        template_cache: "TemplateCache | None" = None,
+        session_name: str | None = None,
+    ):
         self.config = config
         self.refresh_count = 0
+        # 멀티 세션 모드에서만 설정된다. 이 세션이 맡은 브라우저 창(입력 좌표)과 이름.
+        self.session_name = session_name
+        self._window_region = window_region
 
         self._base_dir = Path(__file__).resolve().parents[1]
-        self._target_dir = self._base_dir / "targets"
+        self._target_dir = target_dir if target_dir is not None else self._base_dir / "targets"
         self._runtime_dir = self._base_dir / "runtime"
         self._runtime_dir.mkdir(exist_ok=True)
 
-        self._result_region = self._load_result_region()
-        self._templates = TemplateStore(self._target_dir).load()
-        self._screen = ScreenController(base_confidence=self.config.image_match_confidence)
+        self._tracer = LatencyTracer(
+            enabled=self.config.enable_latency_stats,
+            report_interval_sec=self.config.latency_stats_interval_sec,
+            trace_file=self._create_trace_file() if self.config.enable_latency_trace else None,
+        )
+        self._change_gate = ChangeGate() if self.config.change_gate_enabled else None
+        self._refresh_governor = (
+            RefreshGovernor(self.config.refresh_rate_per_minute) if self.config.refresh_rate_per_minute > 0 else None
+        )
+        if self._refresh_governor is not None:
+            self._tracer.add_status_source(self._refresh_governor.status)
+        region_file = result_region_file or self._runtime_dir / "result_region.json"
+        self._profile_file = region_file.with_name("detection_profile.npz")
+        # 유효한 탐지 프로필이 있으면 targets/ 해석과 ROI 파일 파싱 대신 프로필에 묶인 템플릿 목록/ROI를 쓴다.
+        with startup_report.phase("탐지 프로필 확인"):
+            self._profile = self._load_detection_profile() if self.config.detection_profile_enabled else None
+        if self._profile is not None:
+            self._result_region = self._profile.result_region if self.config.roi_enabled else None
+            self._templates = self._profile.templates
+        else:
+            self._result_region = self._load_result_region(region_file)
+            self._templates = TemplateStore(self._target_dir).load()
+        self._auto_roi_file = region_file.with_name("result_region_auto.json")
+        self._auto_roi_enabled = self._result_region is None and self.config.roi_enabled and self.config.auto_roi_enabled
+        self._table_scanner = self._create_table_scanner()
+        self._last_snapshot = TableSnapshot(rows=())
+
+        # 화면/입력 장치 확인과 템플릿 디코딩은 prepare()에서 한다 (첫 틱, 또는 --warmup이면 단축키 대기 전).
+        self._prepared = False
+        self._prepare_lock = threading.Lock()
+        self._capture_backend = capture_backend
+        self._input_backend = input_backend
+        self._owned_input_backend: InputBackend | None = None
+        self._template_cache = template_cache
+        self._screen = None
+        self._adaptive_settle = None
+        self._auto_roi = None
+        self._spatial_memory_file = region_file.with_name("spatial_memory.json")
+        self._template_scale_file = region_file.with_name("template_scale.json")
+        # 프로필로 시작한 실행에서 ROI/배율 파일을 새로 저장하면 종료할 때 프로필도 다시 만든다.
+        self._profile_loaded = False
+        self._profile_outdated = False
+        self._display_key = ""
+        self._last_scale_probe_at = 0.0
+        self._warm_up_failed = False
         self._notifier = ReservationNotifier(
             enable_telegram=self.config.enable_telegram_notification,
             telegram_bot_token=self.config.telegram_bot_token,
             telegram_chat_id=self.config.telegram_chat_id,
+            session_name=session_name,
         )
 
         self._running_event = threading.Event()
-        self._shutdown_event = threading.Event()
+        # 중지/종료 요청 시 set되어 진행 중인 대기를 즉시 깨운다.
+        self._interrupt_event = threading.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._start_signal: asyncio.Event | None = None
+        self._shutdown_signal: asyncio.Event | None = None
         self._phase = ScanPhase.REFRESH
-        self._listener: keyboard.Listener | None = None
+        self._listener = None
         self._last_key_press_at: dict[str, float] = {}
 
         self._reservation_wait_deadline: float | None = None
         self._last_refresh_wait_log_at = 0.0
         self._last_reservation_wait_log_at = 0.0
         self._last_connection_wait_log_at = 0.0
+        # 마지막으로 누른 조회하기 버튼 (캡처 좌표). 있으면 다음 조회는 스크롤/탐색 없이 그 자리만 확인한다.
+        self._refresh_anchor = None
 
     def run(self):
         print("\nSRT 이미지 매크로 대기 중입니다.")
         print(f"- 시작 단축키: {self.config.start_hotkey}")
         print(f"- 중지 단축키: {self.config.stop_hotkey}")
+        print(f"- 화면 캡처 방식: {self._capture_backend_name()}")
         print("- 종료: 터미널에서 Ctrl+C")
         self._print_permission_guide()
-        self._print_target_status()
+        if self.config.warmup_enabled and self._templates.refresh:
+            self.prepare()
+        self.print_target_status()
 
         if not self._templates.refresh:
             print("\n조회하기 템플릿이 없어 매크로를 시작할 수 없습니다. targets/조회하기.png를 추가하세요.")
             return
 
-        worker = threading.Thread(target=self._macro_loop, name="SRTMacroWorker", daemon=True)
-        worker.start()
+        try:
+            asyncio.run(self._run_async())
+        except KeyboardInterrupt:
+            print("\n프로그램을 종료합니다.")
+
+    async def _run_async(self):
+        """단축키/틱 실행/알림을 하나의 이벤트 루프에서 관리.
+
+        틱(캡처/매칭/클릭)은 블로킹 작업이라 전용 스레드 1개에서 실행하고, 루프는 단축키와
+        시작/중지 신호를 즉시 처리한다. 중지 요청은 틱 안의 대기를 바로 깨운다.
+        """
+
+        loop = self._loop = asyncio.get_running_loop()
+        self._start_signal = asyncio.Event()
+        self._shutdown_signal = asyncio.Event()
+        tick_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="SRTMacroWorker")
+        macro_task = asyncio.create_task(self._macro_task(tick_executor))
 
         try:
-            self._listener = keyboard.Listener(on_press=self._on_key_press)
+            keyboard = _load_keyboard_module()
+            self._listener = keyboard.Listener(
+                on_press=lambda key: loop.call_soon_threadsafe(self._on_key_press, key),
+            )
             self._listener.start()
+            startup_report.print_report("단축키 대기까지")
         except Exception as error:
             print(f"\n전역 단축키 리스너를 시작할 수 없습니다: {error}")
             print("macOS에서 Python/터미널 앱을 손쉬운 사용 및 입력 모니터링에 추가한 뒤 다시 실행하세요.")
-            self._shutdown_event.set()
-            self._running_event.clear()
-            worker.join(timeout=2)
-            return
+            self._shutdown_signal.set()
 
         try:
-            while True:
-                time.sleep(0.2)
-        except KeyboardInterrupt:
-            print("\n프로그램을 종료합니다.")
+            await self._shutdown_signal.wait()
         finally:
-            self._shutdown_event.set()
-            self._running_event.clear()
+            self._stop_running()
+            macro_task.cancel()
             if self._listener:
                 self._listener.stop()
-            worker.join(timeout=2)
+            tick_executor.shutdown(wait=False, cancel_futures=True)
+            self.close()
+            self._loop = None
+
+    async def _macro_task(self, tick_executor: ThreadPoolExecutor):
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._running_event.is_set():
+                self._start_signal.clear()
+                await self.wait_armed(self._start_signal, tick_executor)
+            await loop.run_in_executor(tick_executor, self.run_tick)
+
+    async def wait_armed(self, start_signal: asyncio.Event, tick_executor: ThreadPoolExecutor):
+        """시작 신호를 기다리는 동안 armed_warm_interval_sec마다 틱 스레드에서 warm_up()을 실행.
+
+        틱과 같은 스레드에서 돌려야 그 스레드의 OpenCV 버퍼까지 데워져, 시작 직후 첫 틱도 이후 틱과 같은 속도가 된다.
+        """
+
+        interval = self.config.armed_warm_interval_sec
+        if interval <= 0:
+            await start_signal.wait()
+            return
+
+        loop = asyncio.get_running_loop()
+        while not start_signal.is_set():
+            await loop.run_in_executor(tick_executor, self.warm_up)
+            try:
+                await asyncio.wait_for(start_signal.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def warm_up(self):
+        """준비(prepare)가 안 됐으면 준비하고, 모든 템플릿으로 버리는 매칭을 한 번 돌린다."""
+
+        if not self._templates.refresh or self._running_event.is_set() or self._warm_up_failed:
+            return
+        try:
+            self.prepare()
+            self._screen.warm_up(self._templates.all_paths())
+        except Exception as error:
+            # 같은 오류를 매 주기 출력하지 않도록 예열만 멈춘다. 시작 단축키를 누르면 첫 틱에서 다시 준비한다.
+            self._warm_up_failed = True
+            print(f"\n대기 중 예열 실패 (예열 중단): {error}")
+
+    def prepare(self):
+        """입력/캡처 장치 확인, 탐지 프로필, 템플릿 디코딩 등 무거운 초기화를 한 번만 실행.
+
+        보통 첫 틱에서 실행되고, warmup_enabled이면 단축키를 받기 전에 미리 실행한다.
+        """
+
+        with self._prepare_lock:
+            if self._prepared:
+                return
+            self._prepare()
+            self._prepared = True
+
+    def _prepare(self):
+        from srt_macro_reservation.adaptive_settle import AdaptiveSettle  # noqa: PLC0415
+        from srt_macro_reservation.screen_controller import ScreenController  # noqa: PLC0415
+
+        with startup_report.phase("입력 장치 확인"):
+            if self._input_backend is None and self._owned_input_backend is None:
+                # 직접 만든 입력 백엔드만 close()에서 닫는다 (멀티 세션은 러너가 공유 백엔드를 닫음).
+                self._owned_input_backend = create_input_backend(self.config.input_backend)
+            input_backend = self._input_backend if self._input_backend is not None else self._owned_input_backend
+            screen_size = input_backend.screen_size()
+        # 템플릿/ROI는 화면과 무관하므로 그대로 쓰고, 화면에 묶인 값(좌표 배율/템플릿 배율/자동 ROI)은 해상도가 같을 때만 쓴다.
+        profile = self._profile
+        if profile is not None and profile.screen_size != tuple(screen_size):
+            print(
+                "\n화면 해상도가 탐지 프로필과 달라 배율/자동 ROI는 다시 확인합니다."
+                " (python compile_profile.py로 다시 만드세요)"
+            )
+            profile = None
+        self._profile_loaded = profile is not None
+        with startup_report.phase("화면 캡처 준비"):
+            self._screen = ScreenController(
+                base_confidence=self.config.image_match_confidence,
+                capture_backend=self._capture_backend if self._capture_backend is not None else self._create_capture_backend(),
+                input_backend=input_backend,
+                tracer=self._tracer,
+                pyramid_matching=self.config.pyramid_matching_enabled,
+                spatial_memory_file=self._spatial_memory_file if self.config.spatial_memory_enabled else None,
+                detector_workers=self.config.detector_workers,
+                template_cache=self._template_cache,
+                search_bounds=self._window_region,
+                coordinate_scale=profile.coordinate_scale if profile is not None else None,
+            )
+        with startup_report.phase("템플릿 준비"):
+            if self._profile is not None:
+                self._screen.preload_template_images(self._profile.template_images)
+                # 디코딩된 배열은 템플릿 캐시로 옮겼으므로 프로필은 더 들고 있지 않는다.
+                self._profile = None
+            self._display_key = display_key(screen_size, self._screen.coordinate_scale)
+            if self.config.template_scale_enabled:
+                self._load_template_scale(profile)
+            self._screen.preload_templates(self._templates)
+        self._auto_roi = self._load_auto_roi(profile) if self._auto_roi_enabled else None
+        if self._auto_roi is not None:
+            self._result_region = self._auto_roi.region
+        if self.config.adaptive_settle_enabled:
+            self._adaptive_settle = AdaptiveSettle(
+                base_delay_sec=self.config.refresh_settle_delay_sec,
+                max_delay_sec=self.config.settle_max_delay_sec,
+            )
+
+    def close(self):
+        if self._screen is not None:
+            self._screen.close()
+        if self._owned_input_backend is not None:
+            self._owned_input_backend.close()
+        self._tracer.flush()
+        self._notifier.close()
+        if self._profile_loaded and self._profile_outdated:
+            self._refresh_detection_profile()
+
+    def _refresh_detection_profile(self):
+        from srt_macro_reservation.detection_profile import compile_detection_profile  # noqa: PLC0415
+
+        try:
+            compile_detection_profile(
+                self._profile_file,
+                self._target_dir,
+                self._screen.screen_size(),
+                self._screen.coordinate_scale,
+            )
+        except (OSError, ValueError) as error:
+            print(f"\n탐지 프로필 갱신 실패: {error}")
+            return
+        print("\n새로 찾은 ROI/템플릿 배율을 탐지 프로필에 반영했습니다.")
 
     def _on_key_press(self, key):
-        key_name = self._key_to_name(key)
+        key_name = key_to_name(key)
         if not key_name:
             return
         if self._is_debounced(key_name):
             return
 
         if key_name == self.config.start_hotkey:
-            self._reset_cycle_state()
-            self._running_event.set()
+            self.start_cycle()
+            if self._start_signal is not None:
+                self._start_signal.set()
             print("\n매크로를 시작합니다.")
             return
 
         if key_name == self.config.stop_hotkey:
-            self._running_event.clear()
+            self._stop_running()
             print("\n매크로를 중지했습니다.")
 
-    def _macro_loop(self):
-        while not self._shutdown_event.is_set():
-            if not self._running_event.wait(timeout=0.2):
-                continue
-            if self._shutdown_event.is_set():
-                return
+    def run_tick(self):
+        """매크로 한 틱(현재 단계의 탐색 1회)을 실행."""
 
+        if not self._prepared:
             try:
-                if self._phase == ScanPhase.REFRESH:
-                    refresh_outcome = self._refresh_results()
-                    if refresh_outcome == RefreshOutcome.READY:
-                        self._start_reservation_phase()
-                    elif refresh_outcome == RefreshOutcome.WAIT_CONNECTION:
-                        self._phase = ScanPhase.WAIT_CONNECTION
-                        self._last_connection_wait_log_at = 0.0
-                    else:
-                        self._interruptible_sleep(0.15)
-                    continue
-
-                if self._phase == ScanPhase.WAIT_CONNECTION:
-                    if self._is_connection_wait_detected():
-                        self._log_connection_waiting()
-                        self._interruptible_sleep(0.15)
-                        continue
-
-                    print("\n접속대기 화면이 사라졌습니다. 예약 단계로 이동합니다.")
+                self.prepare()
+            except Exception as error:
+                # 화면/입력 장치를 못 여는 경우 등. 틱 작업이 조용히 죽지 않도록 여기서 멈춘다.
+                print(f"\n매크로 준비 중 예외가 발생했습니다: {error}")
+                print("매크로를 자동 중지했습니다. 화면/권한/이미지 설정을 확인 후 다시 시작하세요.")
+                self._stop_running()
+                return
+        with self._tracer.span("tick"):
+            self._run_tick_body()
+        self._tracer.maybe_report()
+
+    def _run_tick_body(self):
+        self._screen.invalidate_frame()
+        try:
+            if self._phase == ScanPhase.REFRESH:
+                if self._refresh_governor is not None:
+                    delay = self._refresh_governor.delay_sec()
+                    if delay > 0:
+                        self._interruptible_sleep(delay)
+                        return
+                refresh_outcome = self._refresh_results()
+                if refresh_outcome == RefreshOutcome.READY:
                     self._start_reservation_phase()
-                    continue
+                elif refresh_outcome == RefreshOutcome.WAIT_CONNECTION:
+                    self._set_phase(ScanPhase.WAIT_CONNECTION)
+                    self._last_connection_wait_log_at = 0.0
+                else:
+                    self._interruptible_sleep(0.15)
+                return
 
-                if self._attempt_booking():
-                    self._on_reservation_success("booking")
-                    continue
+            if self._phase == ScanPhase.WAIT_CONNECTION:
+                if self._is_connection_wait_detected():
+                    self._log_connection_waiting()
+                    self._interruptible_sleep(0.15)
+                    return
 
-                if self._attempt_waiting_list():
-                    self._on_reservation_success("waitlist")
-                    continue
+                print("\n접속대기 화면이 사라졌습니다. 예약 단계로 이동합니다.")
+                self._start_reservation_phase()
+                return
 
-                if self._is_connection_wait_detected():
-                    print("\n접속대기 화면을 감지했습니다. 접속대기 해제까지 대기합니다.")
-                    self._phase = ScanPhase.WAIT_CONNECTION
-                    self._last_connection_wait_log_at = 0.0
-                    self._interruptible_sleep(0.1)
-                    continue
-
-                if self._is_sold_out_detected():
-                    print("\n매진 상태를 감지했습니다. 조회하기 단계로 이동합니다.")
-                    self._phase = ScanPhase.REFRESH
-                    self._reservation_wait_deadline = None
-                    continue
-
-                if self._reservation_wait_deadline is not None and time.time() >= self._reservation_wait_deadline:
-                    print(f"\n예약 탐색 {self.config.reservation_scan_timeout_sec:.1f}초가 경과했습니다. 조회하기 단계로 이동합니다.")
-                    self._phase = ScanPhase.REFRESH
-                    self._reservation_wait_deadline = None
-                    continue
-
-                self._log_reservation_waiting()
-                self._interruptible_sleep(0.05)
-            except Exception as error:
-                print(f"\n매크로 루프 예외가 발생했습니다: {error}")
-                print("매크로를 자동 중지했습니다. 화면/권한/이미지 설정을 확인 후 다시 시작하세요.")
-                self._running_event.clear()
-                self._reset_cycle_state()
+            screen_digest = None
+            if self._change_gate is not None:
+                self._change_gate.sync_context(
+                    (self._screen.template_scale, self._result_region, self._screen.spatial_memory_revision)
+                )
+                # ROI 밖의 움직임(시계, 광고 등)에 휘둘리지 않고, ROI 전용 캡처도 그대로 쓰도록 결과 영역만 본다.
+                screen_digest = self._screen.frame_digest(self._result_region)
+            if screen_digest is not None and self._change_gate.is_known_idle(screen_digest):
+                self._tracer.event("change_gate_skip")
+            elif self._run_reservation_detectors():
+                return
+            elif screen_digest is not None:
+                self._change_gate.remember_idle(screen_digest)
 
-    def _on_reservation_success(self, success_type: str):
+            if self._reservation_wait_deadline is not None and time.time() >= self._reservation_wait_deadline:
+                print(f"\n예약 탐색 {self.config.reservation_scan_timeout_sec:.1f}초가 경과했습니다. 조회하기 단계로 이동합니다.")
+                self._set_phase(ScanPhase.REFRESH)
+                self._reservation_wait_deadline = None
+                return
+
+            self._log_reservation_waiting()
+            self._interruptible_sleep(0.05)
+        except Exception as error:
+            print(f"\n매크로 루프 예외가 발생했습니다: {error}")
+            print("매크로를 자동 중지했습니다. 화면/권한/이미지 설정을 확인 후 다시 시작하세요.")
+            self._stop_running()
+            self._reset_cycle_state()
+
+    def _run_reservation_detectors(self) -> bool:
+        """결과 표/접속대기/매진 탐지를 같은 프레임에서 동시에 돌리고, 예약 > 예약대기 > 접속대기 > 매진
+        순서로 결과를 처리해 단계가 바뀌었으면 True."""
+
+        snapshot, connection_wait_detected, sold_out_detected = self._detect_reservation_state()
+        if self._attempt_booking(snapshot):
+            self._on_reservation_success("booking")
+            return True
+
+        if self._attempt_waiting_list(snapshot):
+            self._on_reservation_success("waitlist")
+            return True
+
+        if connection_wait_detected:
+            if self._refresh_governor is not None:
+                self._refresh_governor.record_connection_wait()
+            print("\n접속대기 화면을 감지했습니다. 접속대기 해제까지 대기합니다.")
+            self._set_phase(ScanPhase.WAIT_CONNECTION)
+            self._last_connection_wait_log_at = 0.0
+            self._interruptible_sleep(0.1)
+            return True
+
+        if snapshot.cells(CellKind.SOLD_OUT) or sold_out_detected:
+            print("\n매진 상태를 감지했습니다. 조회하기 단계로 이동합니다.")
+            self._set_phase(ScanPhase.REFRESH)
+            self._reservation_wait_deadline = None
+            return True
+        return False
+
+    def _set_phase(self, phase: ScanPhase):
+        if phase == self._phase:
+            return
+        self._tracer.event("phase", source=self._phase.value, target=phase.value)
+        self._phase = phase
+
+    def start_cycle(self):
+        self._reset_cycle_state()
+        self._interrupt_event.clear()
+        self._running_event.set()
+
+    def stop_cycle(self):
+        self._stop_running()
+
+    def _stop_running(self):
         self._running_event.clear()
-        self._phase = ScanPhase.REFRESH
+        self._interrupt_event.set()
+
+    @property
+    def is_running(self) -> bool:
+        return self._running_event.is_set()
+
+    @property
+    def phase(self) -> ScanPhase:
+        return self._phase
+
+    @property
+    def has_refresh_template(self) -> bool:
+        return self._templates.refresh is not None
+
+    def _on_reservation_success(self, success_type: str):
+        self._stop_running()
+        self._set_phase(ScanPhase.REFRESH)
         self._reservation_wait_deadline = None
-        self._notifier.notify_success(success_type)
+        self._notify_success(success_type)
+
+    def _notify_success(self, success_type: str):
+        # 텔레그램 전송은 알림 전송 스레드 큐에 넣기만 하므로 틱 스레드를 막지 않는다.
+        # 첨부 화면도 클릭 직전에 이미 캡처한 프레임을 ROI로 자른 뷰라 새로 캡처/복사하지 않는다.
+        snapshot = None
+        config = self.config
+        if config.enable_telegram_notification and config.telegram_screenshot_enabled and self._screen is not None:
+            snapshot = self._screen.click_snapshot(self._result_region)
+        if snapshot is None:
+            self._notifier.notify_success(success_type)
+            return
+        screenshot, highlight = snapshot
+        self._notifier.notify_success(success_type, screenshot, highlight)
 
     def _start_reservation_phase(self):
-        self._phase = ScanPhase.RESERVATION
+        self._set_phase(ScanPhase.RESERVATION)
         self._reservation_wait_deadline = time.time() + self.config.reservation_scan_timeout_sec
         self._last_reservation_wait_log_at = 0.0
 
     def _reset_cycle_state(self):
-        self._phase = ScanPhase.REFRESH
+        # 멈춘 사이 페이지를 옮겼을 수 있으므로 새 주기의 첫 조회는 스크롤 후 찾기부터 한다.
+        self._refresh_anchor = None
+        if self._change_gate is not None:
+            self._change_gate.clear()
+        self._set_phase(ScanPhase.REFRESH)
         self._reservation_wait_deadline = None
         self._last_refresh_wait_log_at = 0.0
         self._last_reservation_wait_log_at = 0.0
@@ -185,6 +513,14 @@ class SRTMacroAgent:
             print("\n조회하기 템플릿이 없어 매크로를 계속할 수 없습니다.")
             return RefreshOutcome.NOT_FOUND
 
+        if self._refresh_anchor is not None:
+            # 직전에 누른 조회하기 자리만 확인하고 바로 누른다. 버튼이 그 자리에 없으면 스크롤부터 다시 찾는다.
+            location = self._screen.match_at(self._refresh_anchor, self._confidence_for("조회하기"))
+            self._refresh_anchor = None
+            if location is not None:
+                self._screen.click_match(location, "조회하기")
+                return self._handle_refresh_click_success("조회 버튼(위치 기억)")
+
         self._screen.scroll_to_top()
         refresh_region = self._screen.top_search_region()
 
@@ -206,60 +542,210 @@ class SRTMacroAgent:
         ):
             return self._handle_refresh_click_success("조회 버튼(전체 화면)")
 
+        if self._probe_template_scale() and self._screen.locate_and_click(
+            image_path=self._templates.refresh,
+            description="조회하기",
+            region=None,
+            retries=1,
+            confidence=self._confidence_for("조회하기"),
+        ):
+            return self._handle_refresh_click_success("조회 버튼(배율 보정)")
+
         self._log_refresh_waiting()
         return RefreshOutcome.NOT_FOUND
 
     def _handle_refresh_click_success(self, source_label: str) -> RefreshOutcome:
+        if self.config.fast_refresh_enabled:
+            self._refresh_anchor = self._screen.last_click
         self.refresh_count += 1
         print(f"\r{source_label}으로 새로고침 {self.refresh_count}회", end="")
-        time.sleep(self.config.refresh_settle_delay_sec)
+        with self._tracer.span("settle"):
+            self._wait_for_results_to_settle()
 
-        if self._is_connection_wait_detected():
+        connection_wait = self._is_connection_wait_detected()
+        if self._refresh_governor is not None:
+            self._refresh_governor.record_refresh(connection_wait)
+        if connection_wait:
             print("\n접속대기 화면 감지. 접속대기 해제까지 대기합니다.")
             return RefreshOutcome.WAIT_CONNECTION
+        if self._auto_roi_enabled:
+            self._update_auto_roi()
         return RefreshOutcome.READY
 
-    def _attempt_booking(self) -> bool:
-        if not self._templates.booking:
+    def _load_template_scale(self, profile: "DetectionProfile | None"):
+        if profile is not None:
+            saved_scale = profile.template_scale
+        else:
+            saved_scale = load_template_scale(self._template_scale_file, self._display_key)
+        if saved_scale is not None and saved_scale != 1.0:
+            self._screen.set_template_scale(saved_scale)
+            print(f"- 템플릿 배율: x{saved_scale:.2f} (저장된 값, 화면 {self._display_key})")
+        if self._templates.refresh:
+            self._screen.preload_scale_bank(self._templates.refresh, TEMPLATE_SCALES)
+
+    def _probe_template_scale(self) -> bool:
+        """조회하기를 현재 배율로 못 찾으면 배율 후보 전체로 찾아보고, 다른 배율에서 찾으면 모든 템플릿을 그 배율로 바꾼다.
+
+        화면이 바뀌지 않았을 때 매 틱 다시 찾지 않도록 2초에 한 번만 시도한다.
+        """
+
+        if not self.config.template_scale_enabled:
+            return False
+        now = time.time()
+        if now - self._last_scale_probe_at < 2.0:
             return False
+        self._last_scale_probe_at = now
 
-        for booking_template in self._templates.booking:
-            if self._screen.locate_and_click(
-                image_path=booking_template,
-                description="예약하기",
+        with self._tracer.span("scale_probe"):
+            scale = self._screen.find_template_scale(
+                self._templates.refresh,
+                self._confidence_for("조회하기"),
+                TEMPLATE_SCALES,
+            )
+        if scale is None or scale == self._screen.template_scale:
+            return False
+
+        self._screen.set_template_scale(scale)
+        self._screen.preload_templates(self._templates)
+        try:
+            save_template_scale(self._template_scale_file, self._display_key, scale)
+            self._profile_outdated = True
+        except OSError as error:
+            print(f"\n템플릿 배율 저장 실패: {error}")
+        print(f"\n템플릿 배율 자동 설정: x{scale:.2f} (화면 {self._display_key})")
+        return True
+
+    def _update_auto_roi(self):
+        """조회하기 클릭 위치를 기준으로 결과 영역(ROI)을 찾고, 창이 움직였으면 다시 찾는다."""
+
+        anchor = self._screen.last_click
+        if anchor is None:
+            return
+        anchor_point = self._screen.input_point(anchor)
+        if self._auto_roi is not None:
+            if not self._auto_roi.anchor_moved(anchor_point):
+                return
+            print("\n조회하기 버튼 위치가 바뀌어 결과 영역(ROI)을 다시 찾습니다.")
+            self._auto_roi = None
+            self._result_region = None
+
+        region = self._screen.discover_result_region(anchor)
+        if region is None:
+            return
+
+        self._auto_roi = DiscoveredRegion(
+            region=region,
+            anchor=anchor_point,
+            screen_size=self._screen.screen_size(),
+            coordinate_scale=self._screen.coordinate_scale,
+        )
+        self._result_region = region
+        try:
+            save_discovered_region(self._auto_roi_file, self._auto_roi)
+            self._profile_outdated = True
+        except OSError as error:
+            print(f"\n자동 ROI 저장 실패: {error}")
+        left, top, width, height = region
+        print(f"\n결과 영역(ROI) 자동 설정: x={left}, y={top}, width={width}, height={height}")
+
+    def _wait_for_results_to_settle(self):
+        # 결과 영역(수동/자동/프로필 ROI)이 없으면 화면 전체의 움직임을 결과 변화로 볼 수 없으므로 고정 대기한다.
+        if self._adaptive_settle is None or self._result_region is None:
+            self._interruptible_sleep(self.config.refresh_settle_delay_sec)
+            return
+
+        result = self._adaptive_settle.wait(
+            baseline=self._screen.pre_click_fingerprint(self._result_region),
+            sample=lambda: self._screen.region_fingerprint(self._result_region),
+            sleep=self._interruptible_sleep,
+            should_stop=self._interrupt_event.is_set,
+        )
+        self._tracer.event("settle_stabilized" if result.stabilized else "settle_bounded")
+
+    def _detect_reservation_state(self) -> tuple[TableSnapshot, bool, bool]:
+        searches: dict[str, DetectorSearch] = {}
+        if self._table_scanner.image_paths:
+            searches["table"] = DetectorSearch(
+                image_paths=self._table_scanner.image_paths,
                 region=self._result_region,
-                retries=1,
-                confidence=self._confidence_for("예약하기"),
-                move_duration=0.01,
-            ):
-                return True
-        return False
+                confidence=self._table_scanner.min_confidence,
+                whole_region=True,
+            )
+        if self._templates.connection_wait:
+            searches["connection_wait"] = DetectorSearch(
+                image_paths=(self._templates.connection_wait,),
+                region=None,
+                confidence=self._confidence_for("접속대기"),
+                # 한 프레임 놓쳤다고 예약/매진 처리로 넘어가지 않도록 _is_connection_wait_detected와 같이 두 번 본다.
+                retries=2,
+            )
+        if self._templates.sold_out:
+            searches["sold_out"] = DetectorSearch(
+                image_paths=(self._templates.sold_out,),
+                region=None,
+                confidence=self._confidence_for("매진"),
+            )
+
+        results = dict(zip(searches, self._screen.match_concurrently(tuple(searches.values()))))
+        self._last_snapshot = self._table_scanner.scan(results.get("table", []))
+        return self._last_snapshot, bool(results.get("connection_wait")), bool(results.get("sold_out"))
+
+    def _scan_result_table(self) -> TableSnapshot:
+        """ROI 안의 예약하기/예약대기/매진 칸을 한 프레임, 한 번의 매칭으로 찾아 행별로 묶는다."""
+
+        if not self._table_scanner.image_paths:
+            return TableSnapshot(rows=())
+        hits = self._screen.match_templates(
+            image_paths=self._table_scanner.image_paths,
+            region=self._result_region,
+            retries=1,
+            confidence=self._table_scanner.min_confidence,
+            whole_region=True,
+        )
+        self._last_snapshot = self._table_scanner.scan(hits)
+        return self._last_snapshot
+
+    def _attempt_booking(self, snapshot: TableSnapshot | None = None) -> bool:
+        if not self._templates.booking:
+            return False
+
+        if snapshot is None:
+            snapshot = self._scan_result_table()
+        cell = self._table_scanner.best(snapshot, CellKind.BOOKING)
+        if cell is None:
+            return False
+        seat_label = "특실" if cell.seat_class == "first" else "일반실"
+        self._screen.click_match(cell.match, f"예약하기({cell.row + 1}행, {seat_label})", move_duration=0.01)
+        return True
 
-    def _attempt_waiting_list(self) -> bool:
+    def _attempt_waiting_list(self, snapshot: TableSnapshot | None = None) -> bool:
         if not self.config.enable_waiting_list:
             return False
         if not self._templates.waiting:
             return False
-        return self._screen.locate_and_click(
-            image_path=self._templates.waiting,
-            description="예약대기",
-            region=self._result_region,
-            retries=1,
-            confidence=self._confidence_for("예약대기"),
-            move_duration=0.01,
-        )
 
-    def _is_sold_out_detected(self) -> bool:
-        if not self._templates.sold_out:
+        if snapshot is None:
+            snapshot = self._scan_result_table()
+        cell = self._table_scanner.best(snapshot, CellKind.WAITLIST)
+        if cell is None:
             return False
-        return (
-            self._screen.locate_image(
-                image_path=self._templates.sold_out,
-                region=None,
-                retries=1,
-                confidence=self._confidence_for("매진"),
-            )
-            is not None
+        self._screen.click_match(cell.match, f"예약대기({cell.row + 1}행)", move_duration=0.01)
+        return True
+
+    def _create_table_scanner(self) -> TableScanner:
+        kinds = {image_path: CellKind.BOOKING for image_path in self._templates.booking}
+        if self.config.enable_waiting_list and self._templates.waiting:
+            kinds[self._templates.waiting] = CellKind.WAITLIST
+        if self._templates.sold_out:
+            kinds[self._templates.sold_out] = CellKind.SOLD_OUT
+        return TableScanner(
+            kinds=kinds,
+            confidences={
+                CellKind.BOOKING: self._confidence_for("예약하기"),
+                CellKind.WAITLIST: self._confidence_for("예약대기"),
+                CellKind.SOLD_OUT: self._confidence_for("매진"),
+            },
+            priority=parse_priority(self.config.booking_priority),
         )
 
     def _is_connection_wait_detected(self) -> bool:
@@ -299,7 +785,8 @@ class SRTMacroAgent:
         if now - self._last_reservation_wait_log_at < 1.0:
             return
         self._last_reservation_wait_log_at = now
-        print("\n예약/매진 상태 확인 중...")
+        snapshot = self._last_snapshot
+        print(f"\n예약/매진 상태 확인 중... (결과 {len(snapshot.rows)}행, 예약 가능 {snapshot.bookable_rows}행)")
 
     def _log_connection_waiting(self):
         now = time.time()
@@ -309,14 +796,11 @@ class SRTMacroAgent:
         print("\n접속대기 화면 유지 중...")
 
     def _interruptible_sleep(self, duration: float):
-        end_at = time.time() + duration
-        while time.time() < end_at:
-            if self._shutdown_event.is_set() or not self._running_event.is_set():
-                return
-            remaining = end_at - time.time()
-            if remaining <= 0:
-                return
-            time.sleep(min(0.05, remaining))
+        """중지/종료 요청이 오면 즉시 깨어나는 대기."""
+
+        if not self._running_event.is_set():
+            return
+        self._interrupt_event.wait(duration)
 
     def _is_debounced(self, key_name: str, cooldown: float = 0.25) -> bool:
         now = time.time()
@@ -324,39 +808,46 @@ class SRTMacroAgent:
         self._last_key_press_at[key_name] = now
         return (now - last_pressed_at) < cooldown
 
-    @staticmethod
-    def _key_to_name(key) -> str | None:
-        if isinstance(key, keyboard.KeyCode) and key.char:
-            return key.char.lower()
-        if isinstance(key, keyboard.Key):
-            return key.name.lower()
-        return None
-
-    def _load_result_region(self) -> tuple[int, int, int, int] | None:
-        if not self.config.roi_enabled:
-            return None
+    def _create_trace_file(self) -> Path:
+        # 다중 세션은 runtime 폴더를 함께 쓰므로, 같은 초에 만들어진 세션끼리 한 파일에 섞이지 않게 세션 이름을 붙인다.
+        suffix = f"-{self.session_name}" if self.session_name is not None else ""
+        return self._runtime_dir / "traces" / f"trace-{time.strftime('%Y%m%d-%H%M%S')}{suffix}.jsonl"
 
-        region_file = self._runtime_dir / "result_region.json"
-        if not region_file.exists():
-            return None
+    def _create_capture_backend(self) -> "CaptureBackend":
+        from srt_macro_reservation.capture_backend import create_capture_backend  # noqa: PLC0415
 
-        try:
-            data = json.loads(region_file.read_text(encoding="utf-8"))
-            left = int(data["x"])
-            top = int(data["y"])
-            width = int(data["width"])
-            height = int(data["height"])
-        except (ValueError, TypeError, KeyError, json.JSONDecodeError) as error:
-            print(f"\nROI 설정 파일 파싱 실패: {error}")
+        synthetic_frames_dir = Path(self.config.synthetic_frames_dir) if self.config.synthetic_frames_dir else None
+        return create_capture_backend(self.config.capture_backend, synthetic_frames_dir)
+
+    def _capture_backend_name(self) -> str:
+        if self._capture_backend is not None:
+            return self._capture_backend.name
+        return self.config.capture_backend
+
+    def _load_detection_profile(self) -> "DetectionProfile | None":
+        from srt_macro_reservation.detection_profile import load_detection_profile  # noqa: PLC0415
+
+        return load_detection_profile(self._profile_file, self._target_dir)
+
+    def _load_result_region(self, region_file: Path) -> tuple[int, int, int, int] | None:
+        if not self.config.roi_enabled:
             return None
+        return load_manual_region(region_file)
 
-        if width <= 0 or height <= 0:
-            print("\nROI 설정 파일의 width/height 값이 잘못되었습니다.")
+    def _load_auto_roi(self, profile: "DetectionProfile | None") -> DiscoveredRegion | None:
+        discovered = profile.auto_roi if profile is not None else load_discovered_region(self._auto_roi_file)
+        if discovered is None:
+            return None
+        if not discovered.matches_display(self._screen.screen_size(), self._screen.coordinate_scale):
+            print("\n화면 해상도/배율이 저장된 자동 ROI와 달라 첫 조회 후 다시 찾습니다.")
             return None
+        return discovered
 
-        return (left, top, width, height)
+    def print_target_status(self):
+        if self.session_name is not None and self._window_region is not None:
+            left, top, width, height = self._window_region
+            print(f"- 세션 창: x={left}, y={top}, width={width}, height={height}")
 
-    def _print_target_status(self):
         if self.config.enable_telegram_notification:
             print("- 알림 방식: 텔레그램")
         else:
@@ -391,7 +882,10 @@ class SRTMacroAgent:
 
         if self._result_region:
             left, top, width, height = self._result_region
-            print(f"- ROI: x={left}, y={top}, width={width}, height={height}")
+            source = " (자동)" if self._auto_roi_enabled else ""
+            print(f"- ROI{source}: x={left}, y={top}, width={width}, height={height}")
+        elif self._auto_roi_enabled:
+            print("- ROI: 자동 (첫 조회 후 조회하기 버튼 아래 결과 표를 찾아 설정)")
         else:
             print("- ROI: 사용 안 함 (전체 화면 탐색)")
 
@@ -0,0 +1,42 @@
+import time
+from contextlib import contextmanager
+
+# main.py가 가장 먼저 import하므로 프로세스 시작 시각 대신 쓴다.
+_IMPORTED_AT = time.perf_counter()
+
+
+class StartupReport:
+    """실행부터 단축키 대기까지 import/초기화 단계별 소요 시간 기록.
+
+    enabled가 꺼져 있어도 기록은 하고(비용은 단계당 perf_counter 두 번), 출력만 생략한다.
+    """
+
+    def __init__(self, started_at: float | None = None):
+        self.enabled = False
+        self._started_at = _IMPORTED_AT if started_at is None else started_at
+        self._phases: list[tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._phases.append((name, time.perf_counter() - started_at))
+
+    @property
+    def phases(self) -> tuple[tuple[str, float], ...]:
+        return tuple(self._phases)
+
+    def elapsed_sec(self) -> float:
+        return time.perf_counter() - self._started_at
+
+    def print_report(self, title: str):
+        if not self.enabled:
+            return
+        print(f"\n시작 시간 분석 ({title}: {self.elapsed_sec() * 1000:.0f}ms)")
+        for name, duration in self._phases:
+            print(f"- {name}: {duration * 1000:.1f}ms")
+
+
+startup_report = StartupReport()
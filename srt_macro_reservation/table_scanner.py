@@ -0,0 +1,182 @@
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+
+import numpy as np
+
+from srt_macro_reservation.booking_priority import DEFAULT_PRIORITY
+from srt_macro_reservation.models import TemplateMatch
+
+
+class CellKind(Enum):
+    BOOKING = "booking"
+    WAITLIST = "waitlist"
+    SOLD_OUT = "sold_out"
+
+
+_KIND_LABELS = {CellKind.BOOKING: "예약", CellKind.WAITLIST: "대기", CellKind.SOLD_OUT: "매진"}
+
+
+@dataclass(frozen=True)
+class TableCell:
+    kind: CellKind
+    row: int
+    column: int
+    seat_class: str
+    match: TemplateMatch
+
+
+@dataclass(frozen=True)
+class TableRow:
+    index: int
+    top: int
+    bottom: int
+    cells: tuple[TableCell, ...]
+
+    def has(self, kind: CellKind) -> bool:
+        return any(cell.kind == kind for cell in self.cells)
+
+
+@dataclass(frozen=True)
+class TableSnapshot:
+    """조회 결과 표의 행별 좌석 상태 (한 프레임, 한 번의 매칭 결과)."""
+
+    rows: tuple[TableRow, ...]
+
+    def cells(self, kind: CellKind) -> list[TableCell]:
+        return [cell for row in self.rows for cell in row.cells if cell.kind == kind]
+
+    @property
+    def bookable_rows(self) -> int:
+        return sum(1 for row in self.rows if row.has(CellKind.BOOKING))
+
+    def summary(self) -> str:
+        if not self.rows:
+            return "결과 표 없음"
+        parts = []
+        for row in self.rows:
+            labels = "/".join(
+                f"{_KIND_LABELS[cell.kind]}({'특' if cell.seat_class == 'first' else '일'})"
+                if cell.kind != CellKind.WAITLIST
+                else _KIND_LABELS[cell.kind]
+                for cell in row.cells
+            )
+            parts.append(f"{row.index + 1}행 {labels}")
+        return ", ".join(parts)
+
+
+class TableScanner:
+    """한 번의 다중 템플릿 매칭 결과를 행/열로 묶어 표 스냅샷을 만들고, 우선순위에 맞는 칸을 고른다.
+
+    같은 행의 버튼은 세로 중심이 버튼 높이의 절반 이내, 같은 열은 가로 중심이 버튼 너비의 절반
+    이내로 모인다. 예약/매진 칸이 있는 열이 2개 이상이면 왼쪽 열을 특실, 나머지를 일반실로 본다
+    (템플릿 파일 이름에 '특실'이 들어가 있으면 항상 특실).
+    """
+
+    def __init__(
+        self,
+        kinds: dict[Path, CellKind],
+        confidences: dict[CellKind, float],
+        priority: tuple[str, ...] = DEFAULT_PRIORITY,
+    ):
+        self._kinds = kinds
+        self._confidences = confidences
+        self._priority = priority
+        self._template_rank = {image_path: index for index, image_path in enumerate(kinds)}
+
+    @property
+    def image_paths(self) -> tuple[Path, ...]:
+        return tuple(self._kinds)
+
+    @property
+    def min_confidence(self) -> float:
+        return min(self._confidences.values())
+
+    def scan(self, hits: list[TemplateMatch]) -> TableSnapshot:
+        accepted = [
+            hit
+            for hit in hits
+            if hit.image_path in self._kinds and hit.score >= self._confidences[self._kinds[hit.image_path]]
+        ]
+        if not accepted:
+            return TableSnapshot(rows=())
+
+        centers = np.array([hit.center for hit in accepted], dtype=np.float32)
+        sizes = np.array([(hit.width, hit.height) for hit in accepted], dtype=np.float32)
+        row_ids = _cluster(centers[:, 1], float(sizes[:, 1].min()) / 2)
+        column_ids = _cluster(centers[:, 0], float(sizes[:, 0].min()) / 2)
+
+        seat_columns = sorted(
+            {int(column_ids[index]) for index, hit in enumerate(accepted) if self._kinds[hit.image_path] != CellKind.WAITLIST}
+        )
+        first_class_column = seat_columns[0] if len(seat_columns) >= 2 else None
+
+        cells_by_row: dict[int, list[TableCell]] = {}
+        for index, hit in enumerate(accepted):
+            kind = self._kinds[hit.image_path]
+            column = int(column_ids[index])
+            is_first_class = "특실" in hit.image_path.stem or (kind != CellKind.WAITLIST and column == first_class_column)
+            cells_by_row.setdefault(int(row_ids[index]), []).append(
+                TableCell(
+                    kind=kind,
+                    row=int(row_ids[index]),
+                    column=column,
+                    seat_class="first" if is_first_class else "standard",
+                    match=hit,
+                )
+            )
+
+        rows = []
+        for row_index in sorted(cells_by_row):
+            cells = tuple(sorted(_dedupe(cells_by_row[row_index]), key=lambda cell: (cell.column, cell.match.left)))
+            rows.append(
+                TableRow(
+                    index=row_index,
+                    top=min(cell.match.top for cell in cells),
+                    bottom=max(cell.match.top + cell.match.height for cell in cells),
+                    cells=cells,
+                )
+            )
+        return TableSnapshot(rows=tuple(rows))
+
+    def best(self, snapshot: TableSnapshot, kind: CellKind) -> TableCell | None:
+        candidates = snapshot.cells(kind)
+        if not candidates:
+            return None
+        return min(candidates, key=self._sort_key)
+
+    def _sort_key(self, cell: TableCell) -> tuple:
+        keys = []
+        for rule in self._priority:
+            if rule == "template":
+                keys.append(self._template_rank[cell.match.image_path])
+            elif rule == "earliest":
+                keys.append(cell.row)
+            elif rule == "latest":
+                keys.append(-cell.row)
+            elif rule == "standard":
+                keys.append(0 if cell.seat_class == "standard" else 1)
+            elif rule == "first":
+                keys.append(0 if cell.seat_class == "first" else 1)
+        return (*keys, cell.row, cell.column)
+
+
+def _cluster(values: np.ndarray, max_gap: float) -> np.ndarray:
+    """1차원 좌표를 정렬해 max_gap보다 크게 떨어진 곳마다 묶음을 나눈 묶음 번호 (작은 좌표부터 0)."""
+
+    order = np.argsort(values, kind="stable")
+    breaks = np.diff(values[order]) > max_gap
+    group_of_sorted = np.concatenate(([0], np.cumsum(breaks)))
+    groups = np.empty(len(values), dtype=np.int64)
+    groups[order] = group_of_sorted
+    return groups
+
+
+def _dedupe(cells: list[TableCell]) -> list[TableCell]:
+    # 같은 칸에 여러 템플릿(예: 예약하기, 예약하기_특실)이 겹쳐 잡히면 점수가 높은 것만 남긴다.
+    best_by_column: dict[int, TableCell] = {}
+    for cell in cells:
+        current = best_by_column.get(cell.column)
+        if current is None or cell.match.score > current.match.score:
+            best_by_column[cell.column] = cell
+    return list(best_by_column.values())
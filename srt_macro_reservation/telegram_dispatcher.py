@@ -0,0 +1,296 @@
+import http.client
+import json
+import random
+import threading
+import uuid
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from urllib import parse as urllib_parse
+
+import numpy as np
+
+from srt_macro_reservation.models import Region
+
+TELEGRAM_API_URL = "https://api.telegram.org"
+# sendMessage 본문 / sendPhoto 캡션 최대 길이
+_MAX_TEXT_LENGTH = 4096
+_MAX_CAPTION_LENGTH = 1024
+# 서버가 닫은 keep-alive 연결을 재사용하다 나는 오류. 기다리지 않고 바로 다시 연결해 보낸다.
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+
+class TelegramAPIError(RuntimeError):
+    def __init__(self, message: str, retryable: bool, retry_after: float | None = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class _Message:
+    text: str
+    # 함께 보낼 화면 (그레이스케일 또는 BGR 배열)과 그 안에서 표시할 영역
+    photo: np.ndarray | None = None
+    highlight: Region | None = None
+
+
+class TelegramDispatcher:
+    """텔레그램 전송 전담 스레드. HTTP 연결 하나를 유지하며 큐에 쌓인 메시지를 순서대로 보낸다.
+
+    - 시작하자마자 미리 연결(TLS 핸드셰이크)해 두고, 한동안 보낼 것이 없으면 연결을 새로 열어 둔다.
+      그래서 첫 알림도 연결 비용 없이 바로 나간다.
+    - 전송하는 동안 쌓인 메시지는 다음 전송에 하나로 묶어 보낸다. 큐가 가득 차면 오래된 것부터 버린다.
+    - 실패하면 지터를 준 지수 백오프로 max_attempts번까지 다시 보낸다. 그래도 안 되면 on_failure를 부르고
+      다음 메시지는 다시 정상적으로 보낸다.
+    - 화면이 붙은 메시지는 전송 스레드에서 JPEG로 인코딩해 sendPhoto로 보내고, 사진 전송이 안 되면 글만 보낸다.
+    """
+
+    def __init__(
+        self,
+        bot_token: str,
+        chat_id: str,
+        api_base_url: str = TELEGRAM_API_URL,
+        max_pending: int = 32,
+        max_attempts: int = 4,
+        backoff_sec: float = 0.3,
+        timeout_sec: float = 5.0,
+        idle_reconnect_sec: float = 50.0,
+        on_sent: Callable[[], None] | None = None,
+        on_failure: Callable[[Exception, bool], None] | None = None,
+    ):
+        url = urllib_parse.urlsplit(api_base_url)
+        self._https = url.scheme == "https"
+        self._host = url.hostname or ""
+        self._port = url.port
+        self._method_prefix = f"{url.path.rstrip('/')}/bot{bot_token}/"
+        self._chat_id = chat_id
+        self._max_attempts = max(1, max_attempts)
+        self._backoff_sec = backoff_sec
+        self._timeout_sec = timeout_sec
+        self._idle_reconnect_sec = idle_reconnect_sec
+        self._on_sent = on_sent
+        self._on_failure = on_failure
+        self._connection: http.client.HTTPConnection | None = None
+        self._pending: deque[_Message] = deque(maxlen=max(1, max_pending))
+        self._dropped = 0
+        self._condition = threading.Condition()
+        self._closing = threading.Event()
+        self.sent_count = 0
+        self._thread = threading.Thread(target=self._run, name="SRTTelegramNotifier", daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str, photo: np.ndarray | None = None, highlight: Region | None = None) -> bool:
+        """메시지를 큐에 넣고 바로 돌아온다. 종료 중이면 False.
+
+        photo는 인코딩이 끝날 때까지 전송 스레드가 읽으므로, 호출한 쪽에서 그 배열을 고쳐 쓰면 안 된다.
+        """
+
+        with self._condition:
+            if self._closing.is_set():
+                return False
+            if len(self._pending) == self._pending.maxlen:
+                self._dropped += 1
+            self._pending.append(_Message(text, photo, highlight))
+            self._condition.notify()
+        return True
+
+    def close(self, timeout: float = 2.0):
+        """남은 메시지를 (재시도 없이) 보내 보고 전송 스레드를 멈춘다."""
+
+        with self._condition:
+            self._closing.set()
+            self._condition.notify()
+        self._thread.join(timeout)
+
+    def _run(self):
+        self._reconnect()
+        while True:
+            with self._condition:
+                if not self._pending and not self._closing.is_set():
+                    self._condition.wait(self._idle_reconnect_sec)
+                messages = list(self._pending)
+                dropped = self._dropped
+                self._pending.clear()
+                self._dropped = 0
+            for message in self._coalesce(messages, dropped):
+                self._deliver(message)
+            if messages:
+                continue
+            if self._closing.is_set():
+                break
+            # 오래 쉬는 동안 서버가 닫았을 수 있는 연결을 미리 새로 열어 둔다.
+            self._reconnect()
+        self._disconnect()
+
+    @staticmethod
+    def _coalesce(messages: list[_Message], dropped: int) -> list[_Message]:
+        """연달아 쌓인 글 메시지를 하나로 묶는다. 화면이 붙은 메시지는 따로 보낸다."""
+
+        texts = [f"(밀린 알림 {dropped}개 생략)"] if dropped else []
+        batches = []
+        for message in messages:
+            if message.photo is None:
+                texts.append(message.text)
+                continue
+            if texts:
+                batches.append(_Message("\n\n".join(texts)[:_MAX_TEXT_LENGTH]))
+                texts = []
+            batches.append(message)
+        if texts:
+            batches.append(_Message("\n\n".join(texts)[:_MAX_TEXT_LENGTH]))
+        return batches
+
+    def _deliver(self, message: _Message):
+        if message.photo is not None:
+            try:
+                body, content_type = _multipart_body(
+                    {"chat_id": self._chat_id, "caption": message.text[:_MAX_CAPTION_LENGTH]},
+                    "photo",
+                    "screen.jpg",
+                    encode_jpeg(message.photo, message.highlight),
+                    "image/jpeg",
+                )
+            except Exception as error:
+                # OpenCV 오류(cv2.error)도 여기로 온다. 사진이 없어도 알림 글은 보내야 한다.
+                print(f"\n알림 화면 인코딩 실패: {error}")
+            else:
+                if self._send("sendPhoto", body, content_type) is None:
+                    self._report_sent()
+                    return
+                print("\n알림 화면 전송에 실패해 글만 보냅니다.")
+
+        body = urllib_parse.urlencode({"chat_id": self._chat_id, "text": message.text}).encode("utf-8")
+        error = self._send("sendMessage", body, "application/x-www-form-urlencoded")
+        if error is None:
+            self._report_sent()
+        elif self._on_failure is not None:
+            self._on_failure(error, isinstance(error, TelegramAPIError) and not error.retryable)
+
+    def _send(self, method: str, body: bytes, content_type: str) -> Exception | None:
+        """성공하면 None, 재시도해도 실패하면 마지막 오류."""
+
+        attempt = 0
+        while True:
+            try:
+                self._post(method, body, content_type)
+            except TelegramAPIError as error:
+                if not error.retryable:
+                    return error
+                last_error: Exception = error
+                delay = error.retry_after
+            except _STALE_CONNECTION_ERRORS as error:
+                self._disconnect()
+                last_error = error
+                delay = 0.0
+            except (OSError, http.client.HTTPException, ValueError) as error:
+                self._disconnect()
+                last_error = error
+                delay = None
+            else:
+                return None
+
+            attempt += 1
+            if attempt >= self._max_attempts:
+                return last_error
+            if delay is None:
+                delay = self._backoff_sec * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+            # 종료 중이면 백오프를 기다리지 않고 포기한다.
+            if self._closing.wait(delay):
+                return last_error
+
+    def _report_sent(self):
+        self.sent_count += 1
+        if self._on_sent is not None:
+            self._on_sent()
+
+    def _post(self, method: str, body: bytes, content_type: str) -> dict:
+        if self._connection is None:
+            self._connection = self._new_connection()
+        self._connection.request(
+            "POST",
+            self._method_prefix + method,
+            body=body,
+            headers={"Content-Type": content_type, "Connection": "keep-alive"},
+        )
+        response = self._connection.getresponse()
+        raw = response.read()
+        if response.will_close:
+            self._disconnect()
+        data = json.loads(raw) if raw else {}
+        if response.status == 200 and data.get("ok"):
+            return data
+
+        description = data.get("description") or response.reason
+        retry_after = (data.get("parameters") or {}).get("retry_after")
+        # 429(요청 과다)와 5xx는 잠시 뒤 다시 보내면 되지만, 나머지 4xx는 토큰/chat_id 문제라 재시도해도 소용없다.
+        retryable = response.status == 429 or response.status >= 500
+        raise TelegramAPIError(
+            f"HTTP {response.status}: {description}",
+            retryable=retryable,
+            retry_after=float(retry_after) if retry_after is not None else None,
+        )
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        if self._https:
+            return http.client.HTTPSConnection(self._host, self._port, timeout=self._timeout_sec)
+        return http.client.HTTPConnection(self._host, self._port, timeout=self._timeout_sec)
+
+    def _reconnect(self):
+        self._disconnect()
+        connection = self._new_connection()
+        try:
+            connection.connect()
+        except OSError:
+            # 미리 연결해 두는 것뿐이라 실패해도 전송할 때 다시 시도한다.
+            connection.close()
+            return
+        self._connection = connection
+
+    def _disconnect(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def encode_jpeg(image: np.ndarray, highlight: Region | None = None, quality: int = 85) -> bytes:
+    """화면 배열을 메모리에서 JPEG로 인코딩한다. highlight 영역은 빨간 테두리로 표시한다."""
+
+    # 전송 스레드에서만 쓰므로, 알림 모듈을 import할 때 OpenCV까지 불러오지 않는다.
+    import cv2  # noqa: PLC0415
+
+    if highlight is not None:
+        canvas = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR) if image.ndim == 2 else image.copy()
+        left, top, width, height = highlight
+        cv2.rectangle(canvas, (left - 3, top - 3), (left + width + 2, top + height + 2), (0, 0, 255), 2)
+    else:
+        canvas = image
+    encoded, buffer = cv2.imencode(".jpg", canvas, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not encoded:
+        raise ValueError("JPEG 인코딩에 실패했습니다.")
+    return buffer.tobytes()
+
+
+def _multipart_body(
+    fields: dict[str, str],
+    file_field: str,
+    file_name: str,
+    content: bytes,
+    file_type: str,
+) -> tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    parts = [
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode("utf-8")
+        for name, value in fields.items()
+    ]
+    parts.append(
+        (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{file_field}"; filename="{file_name}"\r\n'
+            f"Content-Type: {file_type}\r\n\r\n"
+        ).encode("utf-8")
+        + content
+        + b"\r\n"
+    )
+    parts.append(f"--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
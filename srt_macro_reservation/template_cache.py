@@ -0,0 +1,141 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import cv2
+import numpy as np
+from PIL import Image, UnidentifiedImageError
+
+
+@dataclass(frozen=True)
+class PreparedTemplate:
+    image_path: Path
+    image: np.ndarray
+    # 모든 픽셀 값이 같은 템플릿은 정규화 상관계수를 정의할 수 없어 매칭에서 뺀다.
+    is_flat: bool
+    _scaled: dict[float, np.ndarray] = field(default_factory=dict, compare=False, repr=False)
+    _variants: dict[float, "PreparedTemplate"] = field(default_factory=dict, compare=False, repr=False)
+
+    @property
+    def width(self) -> int:
+        return int(self.image.shape[1])
+
+    @property
+    def height(self) -> int:
+        return int(self.image.shape[0])
+
+    @property
+    def variant_count(self) -> int:
+        return len(self._variants)
+
+    def scaled(self, scale: float) -> np.ndarray:
+        """scale 배율로 줄인 템플릿 (피라미드 매칭의 거친 단계용, 배율별로 한 번만 생성)."""
+
+        if scale == 1.0:
+            return self.image
+        scaled_image = self._scaled.get(scale)
+        if scaled_image is None:
+            size = (max(1, int(round(self.width * scale))), max(1, int(round(self.height * scale))))
+            scaled_image = cv2.resize(self.image, size, interpolation=cv2.INTER_AREA)
+            self._scaled[scale] = scaled_image
+        return scaled_image
+
+    def at_scale(self, scale: float) -> "PreparedTemplate":
+        """화면 배율(브라우저 확대/HiDPI)에 맞춰 크기를 바꾼 템플릿 (배율별로 한 번만 생성)."""
+
+        if scale == 1.0:
+            return self
+        variant = self._variants.get(scale)
+        if variant is None:
+            size = (max(1, int(round(self.width * scale))), max(1, int(round(self.height * scale))))
+            interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC
+            variant = PreparedTemplate.from_gray(self.image_path, cv2.resize(self.image, size, interpolation=interpolation))
+            self._variants[scale] = variant
+        return variant
+
+    @classmethod
+    def from_gray(cls, image_path: Path, gray: np.ndarray) -> "PreparedTemplate":
+        image = np.ascontiguousarray(gray, dtype=np.uint8)
+        image.setflags(write=False)
+        return cls(image_path=image_path, image=image, is_flat=bool(image.size == 0 or image.min() == image.max()))
+
+
+class TemplateCache:
+    """경로별 템플릿 LRU 캐시. max_entries는 원본과 배율별 변환본(at_scale)을 모두 합친 개수의 상한이다."""
+
+    def __init__(self, max_entries: int = 64):
+        self._max_entries = max(1, max_entries)
+        self._entries: OrderedDict[Path, PreparedTemplate] = OrderedDict()
+        self._size = 0
+        # 여러 세션이 같은 캐시를 나눠 쓸 수 있으므로 LRU 갱신을 잠금으로 보호한다.
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def preload(self, image_paths: tuple[Path, ...], scale: float = 1.0) -> int:
+        """시작 시점에 템플릿을 미리 변환해 두고, 캐시에 올라간 개수를 반환."""
+
+        return sum(1 for image_path in image_paths if self.get(image_path, scale) is not None)
+
+    def put(self, image_path: Path, gray: np.ndarray) -> PreparedTemplate:
+        """이미 그레이스케일로 변환된 템플릿(탐지 프로필 등)을 PNG 디코딩 없이 캐시에 올린다."""
+
+        prepared = PreparedTemplate.from_gray(image_path, gray)
+        with self._lock:
+            replaced = self._entries.pop(image_path, None)
+            if replaced is not None:
+                self._size -= 1 + replaced.variant_count
+            self._entries[image_path] = prepared
+            self._size += 1
+            self._evict()
+        return prepared
+
+    def get(self, image_path: Path, scale: float = 1.0) -> PreparedTemplate | None:
+        """image_path 템플릿을 scale 배율로 반환. 배율별 크기 변환본은 원본 항목에 함께 보관된다."""
+
+        with self._lock:
+            prepared = self._entries.get(image_path)
+            if prepared is not None:
+                self._entries.move_to_end(image_path)
+            else:
+                gray = self._load_gray(image_path)
+                if gray is None:
+                    return None
+                prepared = PreparedTemplate.from_gray(image_path, gray)
+                self._entries[image_path] = prepared
+                self._size += 1
+
+            variant_count = prepared.variant_count
+            scaled = prepared.at_scale(scale)
+            self._size += prepared.variant_count - variant_count
+            self._evict()
+            return scaled
+
+    def _evict(self):
+        """상한을 넘으면 가장 오래 안 쓴 원본을 변환본과 함께 버린다. 방금 쓴 항목은 남긴다."""
+
+        while self._size > self._max_entries and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= 1 + evicted.variant_count
+
+    @staticmethod
+    def _load_gray(image_path: Path) -> np.ndarray | None:
+        try:
+            with Image.open(image_path) as image:
+                rgb = np.asarray(image.convert("RGB"))
+        except FileNotFoundError:
+            print(f"\n이미지 파일을 찾을 수 없습니다: {image_path}")
+            return None
+        except PermissionError:
+            print(f"\n이미지 파일 권한이 없습니다: {image_path}")
+            return None
+        except UnidentifiedImageError:
+            print(f"\n이미지 파일 형식을 인식할 수 없습니다: {image_path}")
+            return None
+        except OSError as error:
+            print(f"\n이미지 파일 로드 중 OS 오류가 발생했습니다: {error}")
+            return None
+
+        return cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
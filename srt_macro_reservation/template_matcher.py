@@ -0,0 +1,209 @@
+import math
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from srt_macro_reservation.latency_tracer import LatencyTracer
+from srt_macro_reservation.models import Region, TemplateMatch
+from srt_macro_reservation.template_cache import PreparedTemplate
+
+
+class FramePyramid:
+    """한 프레임의 축소본을 배율별로 한 번만 만들어 두는 캐시."""
+
+    def __init__(self, image: np.ndarray):
+        self.image = image
+        self._levels: dict[float, np.ndarray] = {1.0: image}
+
+    def level(self, scale: float) -> np.ndarray:
+        # 탐지 스레드가 같은 배율을 동시에 요청하면 두 번 만들 수 있지만 결과는 같으므로 잠그지 않는다.
+        scaled_image = self._levels.get(scale)
+        if scaled_image is None:
+            height, width = self.image.shape[:2]
+            size = (max(1, int(round(width * scale))), max(1, int(round(height * scale))))
+            scaled_image = cv2.resize(self.image, size, interpolation=cv2.INTER_AREA)
+            self._levels[scale] = scaled_image
+        return scaled_image
+
+
+class MultiTemplateMatcher:
+    # 거친 단계에서 템플릿의 짧은 변이 이 크기 아래로 내려가지 않도록 배율을 고른다.
+    _MIN_COARSE_TEMPLATE_SIDE = 16
+    _MIN_COARSE_SCALE = 0.125
+
+    def __init__(
+        self,
+        templates: tuple[PreparedTemplate, ...],
+        max_hits_per_template: int = 16,
+        tracer: LatencyTracer | None = None,
+        coarse_margin: float = 0.2,
+        coarse_candidates: int = 5,
+    ):
+        self._templates = templates
+        self._max_hits_per_template = max_hits_per_template
+        self._tracer = tracer if tracer is not None else LatencyTracer()
+        self._coarse_margin = coarse_margin
+        self._coarse_candidates = coarse_candidates
+
+    def match(
+        self,
+        frame: np.ndarray,
+        region: Region | None,
+        confidence: float,
+        origin: tuple[int, int] = (0, 0),
+        pyramid: FramePyramid | None = None,
+    ) -> list[TemplateMatch]:
+        """한 프레임(그레이스케일)에서 모든 템플릿을 비교해 confidence 이상인 위치를 반환.
+
+        origin은 frame 좌상단의 화면 좌표이며, region과 결과 좌표는 모두 화면 좌표 기준이다.
+        pyramid가 주어지면 축소 프레임(region 부분)에서 후보를 찾은 뒤 상위 후보 주변만
+        원본 해상도로 검증한다.
+        """
+
+        offset_x, offset_y, haystack = self._crop(frame, region, origin)
+        hits: list[TemplateMatch] = []
+        if haystack.size == 0:
+            return hits
+
+        for template in self._templates:
+            template_height, template_width = template.height, template.width
+            if template.is_flat:
+                continue
+            if template_height > haystack.shape[0] or template_width > haystack.shape[1]:
+                continue
+
+            coarse_scale = self._coarse_scale(template) if pyramid is not None else 1.0
+            with self._tracer.span("match", template.image_path.stem):
+                if coarse_scale < 1.0:
+                    crop_offset = (offset_x - origin[0], offset_y - origin[1])
+                    peaks = self._match_coarse_to_fine(haystack, crop_offset, pyramid, template, coarse_scale, confidence)
+                else:
+                    result = cv2.matchTemplate(haystack, template.image, cv2.TM_CCOEFF_NORMED)
+                    peaks = self._pick_peaks(result, confidence, template_width, template_height)
+            for x, y, score in peaks:
+                hits.append(
+                    TemplateMatch(
+                        image_path=template.image_path,
+                        left=offset_x + x,
+                        top=offset_y + y,
+                        width=template_width,
+                        height=template_height,
+                        score=score,
+                    )
+                )
+        return hits
+
+    def _match_coarse_to_fine(
+        self,
+        haystack: np.ndarray,
+        crop_offset: tuple[int, int],
+        pyramid: FramePyramid,
+        template: PreparedTemplate,
+        scale: float,
+        confidence: float,
+    ) -> list[tuple[int, int, float]]:
+        # haystack은 프레임의 crop_offset 위치를 잘라낸 부분이므로, 축소 프레임도 같은 부분만 쓴다.
+        haystack_height, haystack_width = haystack.shape[:2]
+        crop_x, crop_y = crop_offset
+        small_left, small_top = int(math.ceil(crop_x * scale)), int(math.ceil(crop_y * scale))
+        small_right = int((crop_x + haystack_width) * scale)
+        small_bottom = int((crop_y + haystack_height) * scale)
+        small_haystack = pyramid.level(scale)[small_top:small_bottom, small_left:small_right]
+        small_template = template.scaled(scale)
+        small_height, small_width = small_template.shape[:2]
+        if small_height > small_haystack.shape[0] or small_width > small_haystack.shape[1]:
+            return []
+
+        coarse_result = cv2.matchTemplate(small_haystack, small_template, cv2.TM_CCOEFF_NORMED)
+        # 결과 표처럼 같은 버튼이 여러 행에 있을 수 있으므로, 후보는 최소 max_hits_per_template개까지 본다.
+        candidates = self._pick_peaks(
+            coarse_result,
+            confidence - self._coarse_margin,
+            small_width,
+            small_height,
+            limit=max(self._coarse_candidates, self._max_hits_per_template),
+        )
+
+        padding = math.ceil(1 / scale) + 2
+        verified: list[tuple[int, int, float]] = []
+        for coarse_x, coarse_y, _ in candidates:
+            guess_x = int((coarse_x + small_left) / scale) - crop_x
+            guess_y = int((coarse_y + small_top) / scale) - crop_y
+            left = max(0, guess_x - padding)
+            top = max(0, guess_y - padding)
+            right = min(haystack_width, guess_x + template.width + padding)
+            bottom = min(haystack_height, guess_y + template.height + padding)
+            if right - left < template.width or bottom - top < template.height:
+                continue
+
+            fine_result = cv2.matchTemplate(haystack[top:bottom, left:right], template.image, cv2.TM_CCOEFF_NORMED)
+            _, score, _, (fine_x, fine_y) = cv2.minMaxLoc(fine_result)
+            if score < confidence:
+                continue
+            x, y = left + fine_x, top + fine_y
+            if any(abs(x - kept_x) < template.width and abs(y - kept_y) < template.height for kept_x, kept_y, _ in verified):
+                continue
+            verified.append((x, y, float(score)))
+            if len(verified) >= self._max_hits_per_template:
+                break
+        return verified
+
+    def _coarse_scale(self, template: PreparedTemplate) -> float:
+        scale = 1.0
+        shorter_side = min(template.width, template.height)
+        while scale / 2 >= self._MIN_COARSE_SCALE and shorter_side * scale / 2 >= self._MIN_COARSE_TEMPLATE_SIDE:
+            scale /= 2
+        return scale
+
+    def _pick_peaks(
+        self,
+        result: np.ndarray,
+        confidence: float,
+        template_width: int,
+        template_height: int,
+        limit: int | None = None,
+    ) -> list[tuple[int, int, float]]:
+        ys, xs = np.nonzero(result >= confidence)
+        if len(xs) == 0:
+            return []
+
+        scores = result[ys, xs]
+        peaks: list[tuple[int, int, float]] = []
+        for index in np.argsort(-scores, kind="stable"):
+            x, y = int(xs[index]), int(ys[index])
+            overlaps = any(
+                abs(x - kept_x) < template_width and abs(y - kept_y) < template_height
+                for kept_x, kept_y, _ in peaks
+            )
+            if overlaps:
+                continue
+            peaks.append((x, y, float(scores[index])))
+            if len(peaks) >= (limit if limit is not None else self._max_hits_per_template):
+                break
+        return peaks
+
+    @staticmethod
+    def _crop(frame: np.ndarray, region: Region | None, origin: tuple[int, int]) -> tuple[int, int, np.ndarray]:
+        origin_x, origin_y = origin
+        if region is None:
+            return origin_x, origin_y, frame
+
+        left, top, width, height = region
+        left -= origin_x
+        top -= origin_y
+        frame_height, frame_width = frame.shape[:2]
+        left = max(0, min(frame_width, left))
+        top = max(0, min(frame_height, top))
+        right = max(left, min(frame_width, left + width))
+        bottom = max(top, min(frame_height, top + height))
+        return origin_x + left, origin_y + top, frame[top:bottom, left:right]
+
+
+def pick_first_in_template_order(hits: list[TemplateMatch], template_order: tuple[Path, ...]) -> TemplateMatch | None:
+    """템플릿 우선순위를 따르고, 같은 템플릿 안에서는 화면 위쪽 결과를 선택."""
+
+    if not hits:
+        return None
+    rank = {image_path: index for index, image_path in enumerate(template_order)}
+    return min(hits, key=lambda hit: (rank.get(hit.image_path, len(rank)), hit.top, hit.left))
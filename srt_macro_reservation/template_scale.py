@@ -0,0 +1,36 @@
+import json
+from pathlib import Path
+
+# 브라우저 확대 단계(50~200%)와 HiDPI 배율 차이를 덮는 템플릿 배율 후보
+TEMPLATE_SCALES = (0.5, 0.67, 0.75, 0.8, 0.9, 1.0, 1.1, 1.25, 1.5, 1.75, 2.0)
+
+
+def display_key(screen_size: tuple[int, int], coordinate_scale: tuple[float, float]) -> str:
+    """템플릿 배율을 화면별로 기억하기 위한 키 (해상도와 좌표 배율)."""
+
+    return f"{screen_size[0]}x{screen_size[1]}@{coordinate_scale[0]:.2f}x{coordinate_scale[1]:.2f}"
+
+
+def load_template_scale(scale_file: Path, key: str) -> float | None:
+    if not scale_file.exists():
+        return None
+    try:
+        scale = float(json.loads(scale_file.read_text(encoding="utf-8"))["displays"][key])
+    except KeyError:
+        return None
+    except (ValueError, TypeError, AttributeError, json.JSONDecodeError) as error:
+        print(f"\n템플릿 배율 파일 파싱 실패: {error}")
+        return None
+    return scale if scale in TEMPLATE_SCALES else None
+
+
+def save_template_scale(scale_file: Path, key: str, scale: float):
+    displays: dict[str, float] = {}
+    if scale_file.exists():
+        try:
+            displays = dict(json.loads(scale_file.read_text(encoding="utf-8"))["displays"])
+        except (ValueError, TypeError, KeyError, AttributeError, json.JSONDecodeError):
+            displays = {}
+    displays[key] = scale
+    scale_file.parent.mkdir(parents=True, exist_ok=True)
+    scale_file.write_text(json.dumps({"displays": displays}, ensure_ascii=False, indent=2), encoding="utf-8")
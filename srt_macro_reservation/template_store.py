@@ -9,39 +9,36 @@ class TemplateStore:
         self._target_dir = target_dir
 
     def load(self) -> TemplateSet:
+        # 폴더는 한 번만 읽고, 이름 규칙별 해석은 그 목록에서 한다.
+        image_paths = self.image_paths()
         return TemplateSet(
-            booking=self._resolve_booking_candidates("예약하기"),
-            waiting=self._resolve(("예약대기", "신청하기")),
-            refresh=self._resolve(("조회하기",)),
-            sold_out=self._resolve(("매진",)),
-            connection_wait=self._resolve(("접속대기",)),
+            booking=self._resolve_booking_candidates(image_paths, "예약하기"),
+            waiting=self._resolve(image_paths, ("예약대기", "신청하기")),
+            refresh=self._resolve(image_paths, ("조회하기",)),
+            sold_out=self._resolve(image_paths, ("매진",)),
+            connection_wait=self._resolve(image_paths, ("접속대기",)),
         )
 
-    def _resolve(self, names: tuple[str, ...]) -> Path | None:
+    def image_paths(self) -> tuple[Path, ...]:
         if not self._target_dir.exists():
-            return None
+            return ()
+        return tuple(sorted(self._target_dir.glob("*.png")))
 
+    def _resolve(self, image_paths: tuple[Path, ...], names: tuple[str, ...]) -> Path | None:
         normalized_targets = {self._normalize_text(name) for name in names}
-        for image_path in sorted(self._target_dir.glob("*.png")):
+        for image_path in image_paths:
             image_stem = self._normalize_text(image_path.stem)
             if image_stem in normalized_targets:
                 return image_path
         return None
 
-    def _resolve_booking_candidates(self, name: str) -> tuple[Path, ...]:
-        if not self._target_dir.exists():
-            return ()
-
+    def _resolve_booking_candidates(self, image_paths: tuple[Path, ...], name: str) -> tuple[Path, ...]:
         normalized_name = self._normalize_text(name)
         prefixed_name = f"{normalized_name}_"
         exact_matches: list[Path] = []
         prefixed_matches: list[Path] = []
 
-        image_paths = sorted(
-            self._target_dir.glob("*.png"),
-            key=lambda path: self._normalize_text(path.name),
-        )
-        for image_path in image_paths:
+        for image_path in sorted(image_paths, key=lambda path: self._normalize_text(path.name)):
             image_stem = self._normalize_text(image_path.stem)
             if image_stem == normalized_name:
                 exact_matches.append(image_path)
@@ -0,0 +1,84 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from srt_macro_reservation.adaptive_settle import AdaptiveSettle
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, duration: float):
+        self.now += duration
+
+
+class AdaptiveSettleTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = _FakeClock()
+        patcher = mock.patch("srt_macro_reservation.adaptive_settle.time.monotonic", self.clock.monotonic)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.old_table = np.zeros((10, 10), dtype=np.int16)
+        self.new_table = np.full((10, 10), 80, dtype=np.int16)
+
+    def test_returns_once_table_changed_and_stabilized(self):
+        settle = AdaptiveSettle(base_delay_sec=0.18, max_delay_sec=1.5, poll_interval_sec=0.01, stable_polls=2)
+        frames = iter([self.old_table, self.new_table, self.new_table, self.new_table])
+
+        result = settle.wait(self.old_table, sample=lambda: next(frames), sleep=self.clock.sleep)
+
+        self.assertTrue(result.stabilized)
+        self.assertAlmostEqual(result.elapsed_sec, 0.04)
+        self.assertAlmostEqual(settle.render_estimate_sec, 0.02)
+
+    def test_unchanged_table_waits_only_until_learned_upper_bound(self):
+        settle = AdaptiveSettle(base_delay_sec=0.18, max_delay_sec=1.5, poll_interval_sec=0.01)
+
+        result = settle.wait(self.old_table, sample=lambda: self.old_table, sleep=self.clock.sleep)
+
+        self.assertFalse(result.changed)
+        self.assertAlmostEqual(result.elapsed_sec, 0.18)
+
+    def test_upper_bound_grows_with_slow_renders_but_respects_max(self):
+        settle = AdaptiveSettle(base_delay_sec=0.18, max_delay_sec=0.5)
+        settle._render_times.extend([0.3] * 10)
+
+        self.assertAlmostEqual(settle.upper_bound_sec, 0.375)
+
+        settle._render_times.extend([0.8] * 10)
+
+        self.assertAlmostEqual(settle.upper_bound_sec, 0.5)
+
+    def test_stop_request_ends_wait_without_sampling_again(self):
+        settle = AdaptiveSettle(base_delay_sec=0.18, max_delay_sec=1.5, poll_interval_sec=0.01)
+        sample = mock.Mock(return_value=self.old_table)
+        stop_requested = iter([False, False, True])
+
+        result = settle.wait(
+            self.old_table,
+            sample=sample,
+            sleep=self.clock.sleep,
+            should_stop=lambda: next(stop_requested),
+        )
+
+        self.assertEqual(sample.call_count, 2)
+        self.assertFalse(result.stabilized)
+        self.assertAlmostEqual(result.elapsed_sec, 0.03)
+
+    def test_missing_baseline_falls_back_to_fixed_delay(self):
+        settle = AdaptiveSettle(base_delay_sec=0.18, max_delay_sec=1.5)
+        sample = mock.Mock()
+
+        result = settle.wait(None, sample=sample, sleep=self.clock.sleep)
+
+        sample.assert_not_called()
+        self.assertAlmostEqual(result.elapsed_sec, 0.18)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import sys
+import threading
+import types
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from srt_macro_reservation.capture_backend import MssCaptureBackend
+
+
+class _FakeShot:
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+
+    def __array__(self, dtype=None, copy=None):
+        return np.zeros((self.height, self.width, 4), dtype=np.uint8)
+
+
+class _FakeGrabber:
+    monitors = [None, {"left": 0, "top": 0, "width": 8, "height": 6}]
+
+    def __init__(self):
+        self.closed = False
+
+    def grab(self, monitor: dict) -> _FakeShot:
+        return _FakeShot(monitor["width"], monitor["height"])
+
+    def close(self):
+        self.closed = True
+
+
+class MssCaptureBackendTests(unittest.TestCase):
+    def test_close_releases_grabbers_of_every_thread(self):
+        fake_mss = types.ModuleType("mss")
+        grabbers = []
+        fake_mss.mss = lambda: grabbers.append(_FakeGrabber()) or grabbers[-1]
+        with mock.patch.dict(sys.modules, {"mss": fake_mss}):
+            backend = MssCaptureBackend()
+
+        backend.grab(None)
+        worker = threading.Thread(target=backend.grab, args=((0, 0, 4, 3),))
+        worker.start()
+        worker.join()
+        backend.close()
+
+        self.assertEqual(len(grabbers), 2)
+        self.assertTrue(all(grabber.closed for grabber in grabbers))
+
+        # 닫힌 뒤에 다시 캡처하면 닫힌 인스턴스를 쓰지 않고 새로 만든다.
+        backend.grab(None)
+        self.assertEqual(len(grabbers), 3)
+        self.assertFalse(grabbers[-1].closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
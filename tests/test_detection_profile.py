@@ -0,0 +1,86 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from PIL import Image
+
+from srt_macro_reservation.detection_profile import compile_detection_profile, load_detection_profile
+from srt_macro_reservation.template_scale import display_key, save_template_scale
+
+
+class DetectionProfileTests(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        root = Path(self._tmpdir.name)
+        self.target_dir = root / "targets"
+        self.state_dir = root / "runtime"
+        self.target_dir.mkdir()
+        self.state_dir.mkdir()
+        rng = np.random.default_rng(4)
+        for name in ("조회하기.png", "예약하기.png", "예약하기_특실.png", "매진.png"):
+            Image.fromarray(rng.integers(0, 256, size=(20, 40), dtype=np.uint8)).save(self.target_dir / name)
+        (self.state_dir / "result_region.json").write_text(
+            json.dumps({"x": 10, "y": 20, "width": 300, "height": 200}),
+            encoding="utf-8",
+        )
+        save_template_scale(self.state_dir / "template_scale.json", display_key((1920, 1080), (1.0, 1.0)), 1.25)
+        self.profile_file = self.state_dir / "detection_profile.npz"
+
+    def _load(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return load_detection_profile(self.profile_file, self.target_dir)
+
+    def test_loaded_profile_matches_compiled_templates_scale_and_roi(self):
+        compiled = compile_detection_profile(self.profile_file, self.target_dir, (1920, 1080), (1.0, 1.0))
+
+        loaded = self._load()
+
+        self.assertEqual(loaded.templates, compiled.templates)
+        self.assertEqual(
+            loaded.templates.booking,
+            (self.target_dir / "예약하기.png", self.target_dir / "예약하기_특실.png"),
+        )
+        self.assertEqual(list(loaded.template_images), list(compiled.template_images))
+        for image_path, image in compiled.template_images.items():
+            np.testing.assert_array_equal(loaded.template_images[image_path], image)
+        self.assertEqual(loaded.template_scale, 1.25)
+        self.assertEqual(loaded.result_region, (10, 20, 300, 200))
+        self.assertEqual(loaded.coordinate_scale, (1.0, 1.0))
+
+    def test_profile_is_ignored_when_targets_or_state_files_change(self):
+        compile_detection_profile(self.profile_file, self.target_dir, (1920, 1080), (1.0, 1.0))
+        self.assertEqual(self._load().screen_size, (1920, 1080))
+
+        (self.state_dir / "result_region.json").write_text(
+            json.dumps({"x": 0, "y": 0, "width": 640, "height": 480}),
+            encoding="utf-8",
+        )
+        self.assertIsNone(self._load())
+
+        compile_detection_profile(self.profile_file, self.target_dir, (1920, 1080), (1.0, 1.0))
+        self.assertIsNotNone(self._load())
+        Image.fromarray(np.zeros((20, 40), dtype=np.uint8)).save(self.target_dir / "매진.png")
+        self.assertIsNone(self._load())
+
+    def test_unchanged_targets_are_checked_by_stat_and_touched_copies_by_hash(self):
+        compile_detection_profile(self.profile_file, self.target_dir, (1920, 1080), (1.0, 1.0))
+
+        with mock.patch("srt_macro_reservation.detection_profile._target_hashes") as target_hashes:
+            self.assertIsNotNone(self._load())
+        target_hashes.assert_not_called()
+
+        refresh = self.target_dir / "조회하기.png"
+        stat = refresh.stat()
+        os.utime(refresh, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertIsNotNone(self._load())
+
+
+if __name__ == "__main__":
+    unittest.main()
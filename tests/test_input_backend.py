@@ -0,0 +1,89 @@
+import contextlib
+import io
+import sys
+import types
+import unittest
+from unittest import mock
+
+from srt_macro_reservation import input_backend
+from srt_macro_reservation.input_backend import RecordingInputBackend, TeleportInputBackend
+
+
+class _FakeMouseController:
+    def __init__(self):
+        self.events = []
+        self.stuck = False
+        self._position = (0, 0)
+
+    @property
+    def position(self):
+        return self._position
+
+    @position.setter
+    def position(self, value):
+        self.events.append(("move", value))
+        if not self.stuck:
+            self._position = value
+
+    def press(self, button):
+        self.events.append(("press", button))
+
+    def release(self, button):
+        self.events.append(("release", button))
+
+
+class TeleportInputBackendTests(unittest.TestCase):
+    def _build_backend(self):
+        fake_mouse = types.ModuleType("pynput.mouse")
+        fake_mouse.Controller = _FakeMouseController
+        fake_mouse.Button = types.SimpleNamespace(left="left")
+        fake_pynput = types.ModuleType("pynput")
+        fake_pynput.mouse = fake_mouse
+
+        with (
+            mock.patch.dict(sys.modules, {"pynput": fake_pynput, "pynput.mouse": fake_mouse}),
+            mock.patch.object(TeleportInputBackend, "_open_xtest", return_value=None),
+        ):
+            backend = TeleportInputBackend(fallback=RecordingInputBackend((1920, 1080)))
+        self.addCleanup(backend.close)
+        return backend
+
+    def test_click_sends_one_press_release_pair_at_target_and_returns_immediately(self):
+        backend = self._build_backend()
+
+        position = backend.click(640, 360, move_duration=0.08)
+
+        self.assertEqual(position, (640, 360))
+        self.assertEqual(backend._mouse.events, [("move", (640, 360)), ("press", "left"), ("release", "left")])
+        self.assertEqual(backend.screen_size(), (1920, 1080))
+
+    def test_cursor_check_runs_off_the_click_path_and_warns_on_mismatch(self):
+        backend = self._build_backend()
+        backend._mouse.stuck = True
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            backend.click(640, 360, move_duration=0.0)
+            self.assertEqual(output.getvalue(), "")
+            backend._verifier.shutdown(wait=True)
+
+        self.assertIn("마우스 이동이 요청 좌표와 다릅니다", output.getvalue())
+
+
+class CreateInputBackendTests(unittest.TestCase):
+    def test_teleport_falls_back_to_pyautogui_when_display_connection_fails(self):
+        fallback = RecordingInputBackend((1920, 1080))
+        errors = (ImportError("No module named 'pynput'"), OSError("Can't connect to display"), RuntimeError("Xlib"))
+        for error in errors:
+            with (
+                self.subTest(error=type(error).__name__),
+                contextlib.redirect_stdout(io.StringIO()) as output,
+                mock.patch.object(input_backend, "TeleportInputBackend", side_effect=error),
+                mock.patch.object(input_backend, "PyAutoGuiInputBackend", return_value=fallback),
+            ):
+                self.assertIs(input_backend.create_input_backend("teleport"), fallback)
+                self.assertIn("pyautogui 입력으로 대체합니다", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from srt_macro_reservation.latency_tracer import LatencyTracer
+
+
+class LatencyTracerTests(unittest.TestCase):
+    def test_disabled_tracer_records_nothing(self):
+        tracer = LatencyTracer(enabled=False)
+
+        with tracer.span("capture"):
+            pass
+        tracer.event("phase", source="refresh", target="reservation")
+
+        self.assertIsNone(tracer.percentiles("capture"))
+        self.assertEqual(tracer.status_line(), "")
+
+    def test_ring_buffer_keeps_latest_samples_for_percentiles(self):
+        tracer = LatencyTracer(enabled=True, ring_size=100)
+        for value_ms in range(1, 201):
+            tracer.record("match:예약하기", value_ms / 1000)
+
+        p50, p95, p99 = tracer.percentiles("match:예약하기")
+
+        self.assertAlmostEqual(p50, 0.151, places=3)
+        self.assertAlmostEqual(p95, 0.195, places=3)
+        self.assertAlmostEqual(p99, 0.199, places=3)
+
+    def test_status_line_orders_spans_and_trace_file_gets_jsonl(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            trace_file = Path(tmpdir) / "traces" / "trace.jsonl"
+            tracer = LatencyTracer(enabled=True, report_interval_sec=0.0, trace_file=trace_file)
+            tracer.record("settle", 0.18)
+            tracer.record("capture", 0.02)
+            tracer.record("tick", 0.25)
+            tracer.event("phase", source="refresh", target="reservation")
+
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                tracer.maybe_report()
+
+            records = [json.loads(line) for line in trace_file.read_text(encoding="utf-8").splitlines()]
+
+        status = output.getvalue()
+        self.assertLess(status.index("tick"), status.index("capture"))
+        self.assertLess(status.index("capture"), status.index("settle"))
+        self.assertIn("phase 1회", status)
+        self.assertEqual([record.get("span", record.get("event")) for record in records], ["settle", "capture", "tick", "phase"])
+
+
+if __name__ == "__main__":
+    unittest.main()
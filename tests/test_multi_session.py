@@ -0,0 +1,144 @@
+import contextlib
+import io
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from srt_macro_reservation.capture_backend import SharedCaptureSource, SyntheticCaptureBackend
+from srt_macro_reservation.config import SRTConfig
+from srt_macro_reservation.input_backend import InputArbiter, RecordingInputBackend
+from srt_macro_reservation.models import ScanPhase
+from srt_macro_reservation.multi_session import MultiSessionRunner, load_session_specs
+
+
+class SharedCaptureTests(unittest.TestCase):
+    def test_sessions_share_one_capture_until_they_ask_again_or_input_happens(self):
+        capture = SyntheticCaptureBackend([np.zeros((4, 4), dtype=np.uint8)])
+        source = SharedCaptureSource(capture, max_age_sec=10.0)
+        first, second = source.view(), source.view()
+
+        first.grab(None)
+        second.grab((0, 0, 2, 2))
+        self.assertEqual(capture.grab_count, 1)
+
+        first.grab(None)
+        self.assertEqual(capture.grab_count, 2)
+
+        source.expire()
+        second.grab(None)
+        self.assertEqual(capture.grab_count, 3)
+
+
+class InputArbiterTests(unittest.TestCase):
+    def test_clicks_from_sessions_never_overlap_and_expire_shared_frame(self):
+        active = []
+        overlaps = []
+        expired = []
+
+        class SlowInput(RecordingInputBackend):
+            def click(self, x, y, move_duration):
+                active.append((x, y))
+                if len(active) > 1:
+                    overlaps.append(tuple(active))
+                time.sleep(0.01)
+                active.remove((x, y))
+                return super().click(x, y, move_duration)
+
+        inner = SlowInput((100, 100))
+        arbiter = InputArbiter(inner, on_input=lambda: expired.append(True))
+        threads = [threading.Thread(target=arbiter.click, args=(index, index, 0.0)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(overlaps, [])
+        self.assertEqual(len(inner.clicks), 4)
+        self.assertEqual(len(expired), 4)
+
+
+class MultiSessionRunnerTests(unittest.TestCase):
+    def test_load_session_specs_resolves_defaults_and_rejects_duplicate_names(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base_dir = Path(tmpdir)
+            sessions_file = base_dir / "sessions.json"
+            sessions_file.write_text(
+                json.dumps(
+                    {
+                        "sessions": [
+                            {"name": "부산", "window": {"x": 0, "y": 0, "width": 960, "height": 1080}},
+                            {
+                                "name": "광주",
+                                "window": {"x": 960, "y": 0, "width": 960, "height": 1080},
+                                "target_dir": "targets/gwangju",
+                            },
+                        ]
+                    }
+                ),
+                encoding="utf-8",
+            )
+            specs = load_session_specs(sessions_file, base_dir)
+
+            self.assertEqual([spec.window for spec in specs], [(0, 0, 960, 1080), (960, 0, 960, 1080)])
+            self.assertEqual(specs[0].target_dir, base_dir / "targets")
+            self.assertEqual(specs[0].state_dir, base_dir / "runtime" / "multi_session" / "부산")
+            self.assertEqual(specs[1].target_dir, base_dir / "targets" / "gwangju")
+
+            sessions_file.write_text(
+                json.dumps({"sessions": [{"name": "a", "window": {"x": 0, "y": 0, "width": 1, "height": 1}}] * 2}),
+                encoding="utf-8",
+            )
+            with self.assertRaises(ValueError):
+                load_session_specs(sessions_file, base_dir)
+
+    def test_each_session_clicks_refresh_inside_its_own_window(self):
+        refresh_button = np.random.default_rng(5).integers(0, 256, size=(20, 40), dtype=np.uint8)
+        screen = np.full((240, 640), 255, dtype=np.uint8)
+        screen[20:40, 140:180] = refresh_button
+        screen[60:80, 420:460] = refresh_button
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base_dir = Path(tmpdir)
+            target_dir = base_dir / "targets"
+            target_dir.mkdir()
+            Image.fromarray(refresh_button).save(target_dir / "조회하기.png")
+            sessions_file = base_dir / "sessions.json"
+            sessions_file.write_text(
+                json.dumps(
+                    {
+                        "sessions": [
+                            {"name": "left", "window": {"x": 0, "y": 0, "width": 320, "height": 240}},
+                            {"name": "right", "window": {"x": 320, "y": 0, "width": 320, "height": 240}},
+                        ]
+                    }
+                ),
+                encoding="utf-8",
+            )
+
+            capture = SyntheticCaptureBackend([screen])
+            recorder = RecordingInputBackend((640, 240))
+            config = SRTConfig(refresh_settle_delay_sec=0.05, auto_roi_enabled=False)
+            with contextlib.redirect_stdout(io.StringIO()):
+                runner = MultiSessionRunner(
+                    config,
+                    load_session_specs(sessions_file, base_dir),
+                    capture_backend=capture,
+                    input_backend=recorder,
+                )
+                for session in runner.sessions:
+                    session.start_cycle()
+                    session.run_tick()
+
+        self.assertEqual([(click.x, click.y) for click in recorder.clicks], [(160, 30), (440, 70)])
+        self.assertTrue(all(session.phase == ScanPhase.RESERVATION for session in runner.sessions))
+        self.assertEqual(recorder.scroll_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
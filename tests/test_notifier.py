@@ -0,0 +1,198 @@
+import contextlib
+import email
+import io
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib import parse as urllib_parse
+
+import cv2
+import numpy as np
+
+from srt_macro_reservation.notifier import ReservationNotifier
+from srt_macro_reservation.telegram_dispatcher import TelegramDispatcher
+
+
+def _parse_form(content_type: str, body: bytes) -> dict:
+    if not content_type.startswith("multipart/form-data"):
+        return dict(urllib_parse.parse_qsl(body.decode("utf-8")))
+    message = email.message_from_bytes(f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+    fields = {}
+    for part in message.get_payload():
+        payload = part.get_payload(decode=True)
+        name = part.get_param("name", header="content-disposition")
+        fields[name] = payload if part.get_filename() else payload.decode("utf-8")
+    return fields
+
+
+class _FakeTelegramServer:
+    """sendMessage/sendPhoto 요청을 기록하고, statuses에 넣어 둔 순서대로 응답 코드를 돌려주는 로컬 서버."""
+
+    def __init__(self):
+        self.requests: list[tuple[str, dict, tuple]] = []
+        self.statuses: list[int] = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.received = threading.Condition()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                fields = _parse_form(self.headers["Content-Type"], self.rfile.read(length))
+                fake.gate.wait(5.0)
+                with fake.received:
+                    fake.requests.append((self.path, fields, self.client_address))
+                    status = fake.statuses.pop(0) if fake.statuses else 200
+                    fake.received.notify_all()
+                body = json.dumps({"ok": status == 200, "description": "테스트 응답"}).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def wait_for(self, count: int, timeout: float = 3.0) -> bool:
+        with self.received:
+            return self.received.wait_for(lambda: len(self.requests) >= count, timeout)
+
+    def close(self):
+        self.gate.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class TelegramDispatcherTests(unittest.TestCase):
+    def setUp(self):
+        self.server = _FakeTelegramServer()
+        self.addCleanup(self.server.close)
+        self.failures = []
+        self.sent = threading.Semaphore(0)
+
+    def _build_dispatcher(self, **kwargs) -> TelegramDispatcher:
+        dispatcher = TelegramDispatcher(
+            bot_token="token",
+            chat_id="42",
+            api_base_url=self.server.url,
+            backoff_sec=0.01,
+            on_sent=self.sent.release,
+            on_failure=lambda error, permanent: self.failures.append(permanent),
+            **kwargs,
+        )
+        self.addCleanup(dispatcher.close)
+        return dispatcher
+
+    def test_messages_reuse_one_kept_alive_connection_and_submit_never_blocks(self):
+        dispatcher = self._build_dispatcher()
+
+        started_at = time.perf_counter()
+        self.assertTrue(dispatcher.submit("첫 알림"))
+        submit_sec = time.perf_counter() - started_at
+        self.assertTrue(self.sent.acquire(timeout=1.0))
+        self.assertTrue(dispatcher.submit("두 번째 알림"))
+        self.assertTrue(self.sent.acquire(timeout=1.0))
+
+        self.assertLess(submit_sec, 0.01)
+        self.assertEqual([fields["text"] for _, fields, _ in self.server.requests], ["첫 알림", "두 번째 알림"])
+        self.assertEqual(self.server.requests[0][0], "/bottoken/sendMessage")
+        self.assertEqual(self.server.requests[0][1]["chat_id"], "42")
+        self.assertEqual(len({client for _, _, client in self.server.requests}), 1)
+
+    def test_server_errors_are_retried_and_do_not_silence_later_messages(self):
+        dispatcher = self._build_dispatcher(max_attempts=2)
+        self.server.statuses = [500, 200, 502, 503]
+
+        dispatcher.submit("재시도 후 성공")
+        self.assertTrue(self.sent.acquire(timeout=2.0))
+        dispatcher.submit("재시도 모두 실패")
+        self.assertTrue(self.server.wait_for(4))
+        dispatcher.submit("다음 알림")
+        self.assertTrue(self.sent.acquire(timeout=2.0))
+
+        self.assertEqual(self.failures, [False])
+        self.assertEqual(dispatcher.sent_count, 2)
+        self.assertEqual(self.server.requests[-1][1]["text"], "다음 알림")
+
+    def test_messages_queued_during_a_send_are_coalesced_into_one_request(self):
+        dispatcher = self._build_dispatcher(max_pending=2)
+        self.server.gate.clear()
+
+        dispatcher.submit("첫 알림")
+        time.sleep(0.1)
+        for index in range(3):
+            dispatcher.submit(f"밀린 알림 {index}")
+        self.server.gate.set()
+        self.assertTrue(self.server.wait_for(2))
+        self.assertTrue(self.sent.acquire(timeout=1.0))
+        self.assertTrue(self.sent.acquire(timeout=1.0))
+
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(
+            self.server.requests[1][1]["text"],
+            "(밀린 알림 1개 생략)\n\n밀린 알림 1\n\n밀린 알림 2",
+        )
+
+    def test_screenshot_is_encoded_off_thread_and_uploaded_as_multipart_photo(self):
+        dispatcher = self._build_dispatcher(max_attempts=1)
+        screen = np.full((60, 120), 200, dtype=np.uint8)
+        self.server.statuses = [200, 400]
+
+        dispatcher.submit("예약하기 클릭", screen, highlight=(40, 20, 30, 12))
+        self.assertTrue(self.sent.acquire(timeout=2.0))
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            dispatcher.submit("사진 거부", screen)
+            self.assertTrue(self.sent.acquire(timeout=2.0))
+
+        path, fields, _ = self.server.requests[0]
+        self.assertTrue(path.endswith("/sendPhoto"))
+        self.assertEqual((fields["chat_id"], fields["caption"]), ("42", "예약하기 클릭"))
+        photo = cv2.imdecode(np.frombuffer(fields["photo"], dtype=np.uint8), cv2.IMREAD_COLOR)
+        self.assertEqual(photo.shape, (60, 120, 3))
+        blue, green, red = (int(value) for value in photo[20 - 3, 55])
+        self.assertGreater(red, 150)
+        self.assertLess(max(blue, green), 100)
+        # 사진 전송이 거부되면 같은 알림을 글로 보낸다.
+        self.assertEqual([path.rsplit("/", 1)[1] for path, _, _ in self.server.requests[1:]], ["sendPhoto", "sendMessage"])
+        self.assertEqual(self.server.requests[2][1]["text"], "사진 거부")
+        self.assertIn("글만 보냅니다", output.getvalue())
+        self.assertEqual(self.failures, [])
+
+
+class ReservationNotifierTests(unittest.TestCase):
+    def test_rejected_token_falls_back_to_local_beep_for_good(self):
+        server = _FakeTelegramServer()
+        self.addCleanup(server.close)
+        server.statuses = [401]
+        beeped = threading.Event()
+
+        with (
+            contextlib.redirect_stdout(io.StringIO()) as output,
+            mock.patch.object(ReservationNotifier, "_play_local_beep_async", side_effect=beeped.set),
+        ):
+            notifier = ReservationNotifier(True, "999:real-token", "777", telegram_api_url=server.url)
+            self.addCleanup(notifier.close)
+            notifier.notify_success("booking")
+            self.assertTrue(beeped.wait(2.0))
+            beeped.clear()
+            notifier.notify_success("waiting")
+
+        self.assertTrue(beeped.is_set())
+        self.assertEqual(len(server.requests), 1)
+        self.assertIn("텔레그램 알림 설정에 실패했습니다", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from srt_macro_reservation.latency_tracer import LatencyTracer
+from srt_macro_reservation.refresh_governor import RefreshGovernor
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class RefreshGovernorTests(unittest.TestCase):
+    def test_token_bucket_allows_burst_then_paces_to_target_rate(self):
+        clock = _FakeClock()
+        governor = RefreshGovernor(target_per_minute=30, burst=2, clock=clock)
+
+        for _ in range(2):
+            self.assertEqual(governor.delay_sec(), 0.0)
+            governor.record_refresh()
+        self.assertAlmostEqual(governor.delay_sec(), 2.0)
+
+        clock.now += 1.0
+        self.assertAlmostEqual(governor.delay_sec(), 1.0)
+        clock.now += 1.0
+        self.assertEqual(governor.delay_sec(), 0.0)
+
+    def test_connection_wait_halves_rate_and_clean_refreshes_recover_it(self):
+        clock = _FakeClock()
+        governor = RefreshGovernor(target_per_minute=40, min_per_minute=6, recovery_ratio=0.25, clock=clock)
+
+        governor.record_refresh(connection_wait=True)
+        self.assertEqual(governor.rate_per_minute, 20)
+        governor.record_connection_wait()
+        governor.record_connection_wait()
+        governor.record_connection_wait()
+        self.assertEqual(governor.rate_per_minute, 6)
+        self.assertEqual(governor.backoff_count, 4)
+
+        for _ in range(4):
+            governor.record_refresh()
+        self.assertEqual(governor.rate_per_minute, 40)
+
+    def test_status_reports_achieved_versus_target_in_latency_stats(self):
+        clock = _FakeClock()
+        governor = RefreshGovernor(target_per_minute=20, clock=clock)
+        for _ in range(5):
+            clock.now += 6.0
+            governor.record_refresh(connection_wait=False)
+        clock.now += 30.0
+        tracer = LatencyTracer(enabled=True)
+        tracer.add_status_source(governor.status)
+
+        status = tracer.status_line()
+
+        self.assertIn("조회 5.0/분", status)
+        self.assertIn("목표 20.0/분, 설정 20/분", status)
+        self.assertIn("접속대기 0%", status)
+
+
+if __name__ == "__main__":
+    unittest.main()
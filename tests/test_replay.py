@@ -0,0 +1,86 @@
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from srt_macro_reservation.config import SRTConfig
+from srt_macro_reservation.models import ScanPhase
+from srt_macro_reservation.replay import ReplayHarness, ReplaySession
+
+
+def _save(image: np.ndarray, path: Path):
+    Image.fromarray(image).save(path)
+
+
+class ReplayHarnessTests(unittest.TestCase):
+    def test_replay_clicks_refresh_then_booking_and_reports_phases(self):
+        rng = np.random.default_rng(3)
+        refresh_button = rng.integers(0, 256, size=(20, 40), dtype=np.uint8)
+        booking_button = rng.integers(0, 256, size=(20, 40), dtype=np.uint8)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            session_dir = Path(tmpdir)
+            target_dir = session_dir / "targets"
+            target_dir.mkdir()
+            _save(refresh_button, target_dir / "조회하기.png")
+            _save(booking_button, target_dir / "예약하기.png")
+
+            search_page = np.full((240, 320), 255, dtype=np.uint8)
+            search_page[20:40, 140:180] = refresh_button
+            result_page = search_page.copy()
+            result_page[150:170, 200:240] = booking_button
+            _save(search_page, session_dir / "0000.png")
+            _save(result_page, session_dir / "0001.png")
+            (session_dir / "session.json").write_text(
+                json.dumps(
+                    {
+                        "frames": [
+                            {"file": "0000.png", "advance_on_click": True, "page": "search"},
+                            {"file": "0001.png", "page": "results"},
+                        ]
+                    }
+                ),
+                encoding="utf-8",
+            )
+
+            recorded_files = sorted(path.name for path in session_dir.rglob("*"))
+
+            config = SRTConfig(capture_backend="pyautogui", refresh_settle_delay_sec=0.05)
+            reports = []
+            for _ in range(2):
+                harness = ReplayHarness(ReplaySession.load(session_dir), config, timeout_sec=5.0)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    reports.append(harness.run())
+            session_files = sorted(path.name for path in session_dir.rglob("*"))
+
+        report = reports[0]
+        # 리플레이 상태 파일은 녹화 폴더에 남지 않으므로 같은 세션을 다시 돌려도 결과가 같다.
+        self.assertEqual(session_files, recorded_files)
+        self.assertEqual([click.page for click in reports[1].clicks], [click.page for click in report.clicks])
+
+        self.assertEqual(report.outcome, "success")
+        self.assertEqual([(click.x, click.y, click.page) for click in report.clicks], [(160, 30, "search"), (220, 160, "results")])
+        self.assertEqual(
+            [phase for _, phase in report.phase_transitions],
+            [ScanPhase.REFRESH.value, ScanPhase.RESERVATION.value, ScanPhase.REFRESH.value],
+        )
+
+    def test_session_without_manifest_advances_on_every_click(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            session_dir = Path(tmpdir)
+            for name in ("b.png", "a.png"):
+                _save(np.zeros((4, 4), dtype=np.uint8), session_dir / name)
+
+            session = ReplaySession.load(session_dir)
+
+        self.assertEqual([frame.image_path.name for frame in session.frames], ["a.png", "b.png"])
+        self.assertTrue(all(frame.advance_on_click and frame.hold_sec is None for frame in session.frames))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from srt_macro_reservation.capture_backend import Frame
+from srt_macro_reservation.models import TemplateMatch
+from srt_macro_reservation.result_region import (
+    DiscoveredRegion,
+    discover_result_region,
+    load_discovered_region,
+    save_discovered_region,
+)
+
+
+def _results_page() -> tuple[np.ndarray, TemplateMatch]:
+    page = np.full((600, 800), 255, dtype=np.uint8)
+    page[:40] = 60  # 상단 메뉴
+    page[80:108, 340:460] = 50  # 조회하기 버튼
+    for row_top in range(180, 480, 60):
+        page[row_top : row_top + 12, 220:300] = 90  # 열차번호/시각 텍스트
+        page[row_top - 8 : row_top + 20, 480:560] = 40  # 좌석 버튼
+    anchor = TemplateMatch(image_path=Path("조회하기.png"), left=340, top=80, width=120, height=28, score=0.99)
+    return page, anchor
+
+
+class DiscoverResultRegionTests(unittest.TestCase):
+    def test_region_covers_table_rows_and_columns_below_anchor(self):
+        page, anchor = _results_page()
+
+        region = discover_result_region(Frame(page), anchor)
+
+        self.assertIsNotNone(region)
+        left, top, width, height = region
+        self.assertLessEqual(left, 220)
+        self.assertGreaterEqual(left + width, 560)
+        self.assertLessEqual(top, 172)
+        self.assertGreaterEqual(top + height, 440)
+        self.assertGreater(top, 108)
+        self.assertLess(top + height, 600)
+
+    def test_region_is_offset_by_frame_origin(self):
+        page, anchor = _results_page()
+        shifted_anchor = TemplateMatch(anchor.image_path, anchor.left + 100, anchor.top + 50, anchor.width, anchor.height, 0.99)
+
+        region = discover_result_region(Frame(page), anchor)
+        shifted = discover_result_region(Frame(page, left=100, top=50), shifted_anchor)
+
+        self.assertEqual(shifted, (region[0] + 100, region[1] + 50, region[2], region[3]))
+
+    def test_empty_results_area_is_not_a_table(self):
+        page, anchor = _results_page()
+        page[110:] = 255
+
+        self.assertIsNone(discover_result_region(Frame(page), anchor))
+
+
+class DiscoveredRegionTests(unittest.TestCase):
+    def test_saved_region_round_trips_and_checks_display(self):
+        discovered = DiscoveredRegion(
+            region=(210, 160, 360, 300),
+            anchor=(400, 94),
+            screen_size=(1440, 900),
+            coordinate_scale=(0.5, 0.5),
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            region_file = Path(tmpdir) / "result_region_auto.json"
+            save_discovered_region(region_file, discovered)
+            loaded = load_discovered_region(region_file)
+
+        self.assertEqual(loaded, discovered)
+        self.assertTrue(loaded.matches_display((1440, 900), (0.5, 0.5)))
+        self.assertFalse(loaded.matches_display((1920, 1080), (0.5, 0.5)))
+        self.assertFalse(loaded.matches_display((1440, 900), (1.0, 1.0)))
+        self.assertFalse(loaded.anchor_moved((404, 90)))
+        self.assertTrue(loaded.anchor_moved((520, 94)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,248 @@
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from srt_macro_reservation.capture_backend import RegionCaptureBackend, SyntheticCaptureBackend
+from srt_macro_reservation.input_backend import RecordingInputBackend
+from srt_macro_reservation.latency_tracer import LatencyTracer
+from srt_macro_reservation.models import DetectorSearch, TemplateMatch
+from srt_macro_reservation.screen_controller import ScreenController
+from srt_macro_reservation.spatial_memory import SpatialMemory
+from srt_macro_reservation.template_cache import PreparedTemplate, TemplateCache
+from srt_macro_reservation.template_scale import TEMPLATE_SCALES
+
+
+class ScreenControllerFrameTests(unittest.TestCase):
+    def setUp(self):
+        self.template = np.random.default_rng(7).integers(0, 256, size=(8, 12), dtype=np.uint8)
+        frame = np.full((48, 64), 255, dtype=np.uint8)
+        frame[30:38, 40:52] = self.template
+        self.capture = SyntheticCaptureBackend([frame])
+        self.screen = self._build_screen(self.capture)
+
+    def _build_screen(self, capture):
+        screen = object.__new__(ScreenController)
+        screen._base_confidence = 0.9
+        screen._coord_scale_x = 1.0
+        screen._coord_scale_y = 1.0
+        screen._capture = capture
+        screen._tracer = LatencyTracer()
+        screen._frame = None
+        screen._pyramid_matching = True
+        screen._pyramid = None
+        screen._spatial_memory = None
+        screen._detector_workers = 0
+        screen._detector_pool = None
+        screen._search_bounds = None
+        screen._template_scale = 1.0
+        screen._scale_verified = True
+        screen._template_cache = mock.Mock()
+        screen._template_cache.get.side_effect = lambda image_path, scale=1.0: PreparedTemplate.from_gray(
+            image_path,
+            self.template,
+        )
+        return screen
+
+    def test_detectors_in_same_tick_share_one_frame(self):
+        self.screen.locate_image(Path("매진.png"), region=None, retries=1)
+        self.screen.locate_image(Path("접속대기.png"), region=(0, 0, 64, 20), retries=1)
+
+        self.assertEqual(self.capture.grab_count, 1)
+
+    def test_invalidate_frame_forces_new_capture(self):
+        self.screen.locate_image(Path("매진.png"), region=None, retries=1)
+        self.screen.invalidate_frame()
+        self.screen.locate_image(Path("매진.png"), region=None, retries=1)
+
+        self.assertEqual(self.capture.grab_count, 2)
+
+    def test_match_at_confirms_button_in_place_and_misses_after_it_moves(self):
+        anchor = TemplateMatch(Path("조회하기.png"), left=40, top=30, width=12, height=8, score=0.99)
+
+        self.assertEqual(self.screen.match_at(anchor, 0.9).left, 40)
+        self.assertIsNone(self.screen.match_at(TemplateMatch(Path("조회하기.png"), 10, 5, 12, 8, 0.99), 0.9))
+        self.assertEqual(self.capture.grab_count, 1)
+
+    def test_click_snapshot_crops_pre_click_frame_to_roi_without_new_capture(self):
+        self.screen._input = RecordingInputBackend((64, 48))
+        self.screen._pre_click_frame = None
+        self.screen._last_click = None
+        self.assertIsNone(self.screen.click_snapshot(None))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(self.screen.locate_any_and_click((Path("예약하기.png"),), "예약하기", region=None, retries=1))
+        image, highlight = self.screen.click_snapshot((32, 24, 32, 24))
+
+        self.assertEqual(image.shape, (24, 32))
+        self.assertEqual(highlight, (8, 6, 12, 8))
+        np.testing.assert_array_equal(image[6:14, 8:20], self.template)
+        self.assertEqual(self.capture.grab_count, 1)
+
+    def test_click_snapshot_maps_roi_to_capture_pixels_on_hidpi_screen(self):
+        frame = np.full((96, 128), 255, dtype=np.uint8)
+        frame[60:68, 80:92] = self.template
+        screen = self._build_screen(SyntheticCaptureBackend([frame]))
+        screen._coord_scale_x = screen._coord_scale_y = 0.5
+        screen._input = RecordingInputBackend((64, 48))
+        screen._pre_click_frame = None
+        screen._last_click = None
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(screen.locate_any_and_click((Path("예약하기.png"),), "예약하기", region=None, retries=1))
+        image, highlight = screen.click_snapshot((32, 24, 32, 24))
+
+        self.assertEqual(image.shape, (48, 64))
+        self.assertEqual(highlight, (16, 12, 12, 8))
+        np.testing.assert_array_equal(image[12:20, 16:28], self.template)
+
+    def test_warm_up_matches_every_template_without_capturing_or_keeping_a_frame(self):
+        warmed = self.screen.warm_up((Path("조회하기.png"), Path("매진.png")))
+
+        self.assertEqual(warmed, 2)
+        self.assertEqual(self.capture.grab_count, 0)
+        self.assertIsNone(self.screen._frame)
+        self.assertEqual(self.screen._template_cache.get.call_count, 2)
+
+    def test_find_template_scale_picks_zoomed_size_and_matches_after_switching(self):
+        button = cv2.resize(
+            np.random.default_rng(11).integers(0, 256, size=(10, 20), dtype=np.uint8),
+            (40, 20),
+            interpolation=cv2.INTER_NEAREST,
+        )
+        frame = np.full((240, 320), 255, dtype=np.uint8)
+        frame[100:125, 150:200] = cv2.resize(button, (50, 25), interpolation=cv2.INTER_CUBIC)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            image_path = Path(tmpdir) / "조회하기.png"
+            Image.fromarray(button).save(image_path)
+            screen = self._build_screen(SyntheticCaptureBackend([frame]))
+            screen._template_cache = TemplateCache()
+
+            self.assertIsNone(screen.locate_image(image_path, region=None, retries=1))
+            scale = screen.find_template_scale(image_path, 0.9, TEMPLATE_SCALES)
+            screen.set_template_scale(scale)
+            location = screen.locate_image(image_path, region=None, retries=1)
+
+        self.assertEqual(scale, 1.25)
+        self.assertEqual((location.left, location.top, location.width, location.height), (150, 100, 50, 25))
+
+    def test_region_only_backend_captures_roi_and_reports_screen_coordinates(self):
+        screen = self._build_screen(RegionCaptureBackend(self.capture))
+
+        location = screen.locate_image(Path("예약하기.png"), region=(32, 24, 32, 24), retries=1)
+
+        self.assertEqual((location.left, location.top), (40, 30))
+        self.assertTrue(screen._frame.partial)
+        self.assertEqual(screen._frame.image.shape, (24, 32))
+
+    def test_frame_digest_covers_only_result_roi(self):
+        capture = RegionCaptureBackend(SyntheticCaptureBackend([np.full((48, 64), 255, dtype=np.uint8)]))
+        screen = self._build_screen(capture)
+        roi = (0, 24, 64, 24)
+
+        before = screen.frame_digest(roi)
+        self.assertTrue(screen._frame.partial)
+        clock = np.full((48, 64), 255, dtype=np.uint8)
+        clock[0:8, 0:16] = 0
+        capture._inner.set_frame(clock)
+        screen.invalidate_frame()
+
+        self.assertEqual(screen.frame_digest(roi), before)
+        self.assertNotEqual(screen.frame_digest(), before)
+
+    def test_search_widens_from_remembered_window_on_miss_and_remembers_new_position(self):
+        frame = np.full((300, 400), 255, dtype=np.uint8)
+        frame[200:208, 300:312] = self.template
+        screen = self._build_screen(SyntheticCaptureBackend([frame]))
+        screen._spatial_memory = SpatialMemory(None, (400, 300), (1.0, 1.0))
+        screen._spatial_memory.remember(
+            [TemplateMatch(image_path=Path("매진.png"), left=20, top=20, width=12, height=8, score=1.0)]
+        )
+        self.assertEqual(screen._spatial_memory.window_for((Path("매진.png"),), (0, 0, 400, 300)), (0, 0, 80, 76))
+
+        location = screen.locate_image(Path("매진.png"), region=None, retries=1)
+
+        self.assertEqual((location.left, location.top), (300, 200))
+        self.assertEqual(screen._spatial_memory.position(Path("매진.png")), (300, 200, 12, 8))
+
+    def test_table_scan_ignores_remembered_window_and_returns_every_cell(self):
+        frame = np.full((300, 400), 255, dtype=np.uint8)
+        frame[100:108, 100:112] = self.template
+        frame[100:108, 300:312] = self.template
+        frame[200:208, 300:312] = self.template
+        screen = self._build_screen(SyntheticCaptureBackend([frame]))
+        screen._spatial_memory = SpatialMemory(None, (400, 300), (1.0, 1.0))
+        screen._spatial_memory.remember(
+            [TemplateMatch(image_path=Path("예약하기.png"), left=100, top=100, width=12, height=8, score=1.0)]
+        )
+        search = DetectorSearch(image_paths=(Path("예약하기.png"),), region=None, confidence=0.9, whole_region=True)
+
+        scanned = screen.match_templates(search.image_paths, None, retries=1, confidence=0.9, whole_region=True)
+        (concurrent,) = screen.match_concurrently((search,))
+
+        for hits in (scanned, concurrent):
+            self.assertEqual(sorted((hit.left, hit.top) for hit in hits), [(100, 100), (300, 100), (300, 200)])
+        self.assertEqual(screen._spatial_memory.revision, 1)
+
+    def test_concurrent_detectors_share_frame_and_keep_search_order(self):
+        searches = (
+            DetectorSearch(image_paths=(Path("예약하기.png"),), region=(0, 0, 32, 24), confidence=0.9),
+            DetectorSearch(image_paths=(Path("접속대기.png"),), region=None, confidence=0.9),
+            DetectorSearch(image_paths=(Path("매진.png"), Path("예약대기.png")), region=(32, 24, 32, 24), confidence=0.9),
+        )
+        sequential = self.screen.match_concurrently(searches)
+
+        self.screen._detector_workers = 4
+        self.screen.invalidate_frame()
+        try:
+            parallel = self.screen.match_concurrently(searches)
+        finally:
+            self.screen.close()
+
+        self.assertEqual(parallel, sequential)
+        self.assertEqual([len(hits) for hits in parallel], [0, 1, 2])
+        self.assertEqual([hit.image_path.name for hit in parallel[2]], ["매진.png", "예약대기.png"])
+        self.assertEqual(self.capture.grab_count, 2)
+
+    def test_concurrent_search_recaptures_only_for_searches_with_retries_left(self):
+        blank = np.full((48, 64), 255, dtype=np.uint8)
+        waiting = blank.copy()
+        waiting[30:38, 40:52] = self.template
+        capture = SyntheticCaptureBackend([blank, waiting])
+        screen = self._build_screen(capture)
+        searches = (
+            DetectorSearch(image_paths=(Path("접속대기.png"),), region=None, confidence=0.9, retries=2),
+            DetectorSearch(image_paths=(Path("매진.png"),), region=(0, 0, 32, 24), confidence=0.9),
+        )
+
+        # 재시도 전 대기 동안 접속대기 화면이 뜬다.
+        with mock.patch("srt_macro_reservation.screen_controller.time.sleep", side_effect=lambda _: capture.advance()):
+            connection_wait, sold_out = screen.match_concurrently(searches)
+
+        self.assertEqual([(hit.left, hit.top) for hit in connection_wait], [(40, 30)])
+        self.assertEqual(sold_out, [])
+        self.assertEqual(capture.grab_count, 2)
+
+    def test_profile_coordinate_scale_is_corrected_on_first_full_capture(self):
+        screen = self._build_screen(SyntheticCaptureBackend([np.zeros((300, 400), dtype=np.uint8)]))
+        screen._input = mock.Mock()
+        screen._input.screen_size.return_value = (800, 600)
+        screen._coord_scale_x = screen._coord_scale_y = 1.0
+        screen._scale_verified = False
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            screen.capture_frame(None)
+
+        self.assertEqual(screen.coordinate_scale, (2.0, 2.0))
+        self.assertTrue(screen._scale_verified)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from srt_macro_reservation.models import TemplateMatch
+from srt_macro_reservation.spatial_memory import SpatialMemory
+
+SCREEN_SIZE = (1920, 1080)
+SCALE = (1.0, 1.0)
+BOUNDS = (0, 0, 1920, 1080)
+
+
+def _hit(name: str, left: int, top: int, width: int = 100, height: int = 30) -> TemplateMatch:
+    return TemplateMatch(image_path=Path(name), left=left, top=top, width=width, height=height, score=0.99)
+
+
+class SpatialMemoryTests(unittest.TestCase):
+    def test_window_surrounds_remembered_position_inside_bounds(self):
+        memory = SpatialMemory(None, SCREEN_SIZE, SCALE)
+        memory.remember([_hit("조회하기.png", 800, 130)])
+
+        window = memory.window_for((Path("조회하기.png"),), BOUNDS)
+
+        self.assertEqual(window, (750, 82, 200, 126))
+        memory.remember([_hit("조회하기.png", 803, 132)])
+        self.assertEqual(memory.revision, 1)
+        memory.remember([_hit("조회하기.png", 900, 130)])
+        self.assertEqual(memory.revision, 2)
+        self.assertIsNone(memory.window_for((Path("조회하기.png"), Path("매진.png")), BOUNDS))
+
+    def test_topmost_hit_is_remembered(self):
+        memory = SpatialMemory(None, SCREEN_SIZE, SCALE)
+        memory.remember([_hit("예약하기.png", 600, 700), _hit("예약하기.png", 600, 400)])
+
+        window = memory.window_for((Path("예약하기.png"),), (300, 250, 800, 600))
+
+        self.assertEqual(memory.position(Path("예약하기.png")), (600, 400, 100, 30))
+        self.assertEqual(window, (550, 352, 200, 126))
+
+    def test_positions_are_written_on_flush_and_persist_only_for_same_display(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            memory_file = Path(tmpdir) / "spatial_memory.json"
+            memory = SpatialMemory(memory_file, SCREEN_SIZE, SCALE)
+            memory.remember([_hit("매진.png", 900, 500)])
+            self.assertFalse(memory_file.exists())
+            memory.flush()
+
+            same_display = SpatialMemory.load(memory_file, SCREEN_SIZE, SCALE)
+            other_scale = SpatialMemory.load(memory_file, SCREEN_SIZE, (0.5, 0.5))
+
+        self.assertEqual(same_display.position(Path("매진.png")), (900, 500, 100, 30))
+        self.assertEqual(len(other_scale), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
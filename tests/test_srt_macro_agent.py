@@ -1,13 +1,27 @@
+import asyncio
 import contextlib
 import importlib
 import io
+import subprocess
 import sys
+import tempfile
+import threading
+import time
 import types
 import unittest
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from types import SimpleNamespace
 from unittest import mock
 
+import numpy as np
+from PIL import Image
+
+from srt_macro_reservation.capture_backend import SyntheticCaptureBackend
+from srt_macro_reservation.config import SRTConfig
+from srt_macro_reservation.input_backend import RecordingInputBackend
+from srt_macro_reservation.models import TemplateMatch
+
 
 def _import_agent_module():
     fake_pyautogui = types.ModuleType("pyautogui")
@@ -45,40 +59,226 @@ class SRTMacroAgentTests(unittest.TestCase):
         cls.agent_module = _import_agent_module()
         cls.agent_class = cls.agent_module.SRTMacroAgent
 
-    def test_attempt_booking_checks_templates_in_order_until_match(self):
+    def test_attempt_booking_scans_table_once_and_clicks_best_row(self):
         agent = object.__new__(self.agent_class)
-        agent._templates = SimpleNamespace(
-            booking=(Path("예약하기.png"), Path("예약하기_특실.png")),
+        booking = (Path("예약하기.png"), Path("예약하기_특실.png"))
+        agent._templates = SimpleNamespace(booking=booking)
+        agent._table_scanner = self.agent_module.TableScanner(
+            kinds={path: self.agent_module.CellKind.BOOKING for path in booking},
+            confidences={self.agent_module.CellKind.BOOKING: 0.95},
+            priority=("earliest",),
         )
+        lower_row = TemplateMatch(Path("예약하기.png"), left=300, top=200, width=80, height=30, score=0.99)
+        upper_row = TemplateMatch(Path("예약하기_특실.png"), left=200, top=100, width=80, height=30, score=0.97)
         agent._screen = mock.Mock()
-        agent._screen.locate_and_click.side_effect = (False, True)
+        agent._screen.match_templates.return_value = [lower_row, upper_row]
         agent._result_region = (10, 20, 30, 40)
-        agent._confidence_for = mock.Mock(return_value=0.95)
 
         result = agent._attempt_booking()
 
         self.assertTrue(result)
+        agent._screen.match_templates.assert_called_once_with(
+            image_paths=booking,
+            region=(10, 20, 30, 40),
+            retries=1,
+            confidence=0.95,
+            whole_region=True,
+        )
+        agent._screen.click_match.assert_called_once_with(upper_row, "예약하기(1행, 특실)", move_duration=0.01)
+
+    def test_reservation_detectors_prefer_booking_over_connection_wait_and_sold_out(self):
+        agent = object.__new__(self.agent_class)
+        booking = Path("예약하기.png")
+        agent._templates = SimpleNamespace(booking=(booking,), connection_wait=Path("접속대기.png"), sold_out=Path("매진.png"))
+        agent._table_scanner = self.agent_module.TableScanner(
+            kinds={booking: self.agent_module.CellKind.BOOKING},
+            confidences={self.agent_module.CellKind.BOOKING: 0.95},
+        )
+        agent._confidence_for = mock.Mock(return_value=0.8)
+        agent._result_region = None
+        button = TemplateMatch(booking, left=300, top=200, width=80, height=30, score=0.99)
+        overlay = TemplateMatch(Path("접속대기.png"), left=0, top=0, width=400, height=200, score=0.9)
+        agent._screen = mock.Mock()
+        agent._screen.match_concurrently.return_value = [[button], [overlay], []]
+        agent._on_reservation_success = mock.Mock()
+        agent._set_phase = mock.Mock()
+
+        self.assertTrue(agent._run_reservation_detectors())
+
+        searches = agent._screen.match_concurrently.call_args.args[0]
+        self.assertEqual([search.image_paths for search in searches], [(booking,), (Path("접속대기.png"),), (Path("매진.png"),)])
+        agent._screen.click_match.assert_called_once()
+        agent._on_reservation_success.assert_called_once_with("booking")
+        agent._set_phase.assert_not_called()
+
+    def test_success_notification_attaches_pre_click_roi_snapshot(self):
+        agent = object.__new__(self.agent_class)
+        agent.config = SRTConfig(enable_telegram_notification=True)
+        agent._result_region = (100, 150, 600, 300)
+        screenshot = np.zeros((300, 600), dtype=np.uint8)
+        agent._screen = mock.Mock()
+        agent._screen.click_snapshot.return_value = (screenshot, (200, 50, 80, 30))
+        agent._notifier = mock.Mock()
+
+        agent._notify_success("booking")
+        agent.config = SRTConfig(enable_telegram_notification=True, telegram_screenshot_enabled=False)
+        agent._notify_success("waitlist")
+
+        agent._screen.click_snapshot.assert_called_once_with((100, 150, 600, 300))
         self.assertEqual(
-            agent._screen.locate_and_click.call_args_list,
-            [
-                mock.call(
-                    image_path=Path("예약하기.png"),
-                    description="예약하기",
-                    region=(10, 20, 30, 40),
-                    retries=1,
-                    confidence=0.95,
-                    move_duration=0.01,
-                ),
-                mock.call(
-                    image_path=Path("예약하기_특실.png"),
-                    description="예약하기",
-                    region=(10, 20, 30, 40),
-                    retries=1,
-                    confidence=0.95,
-                    move_duration=0.01,
-                ),
-            ],
+            agent._notifier.notify_success.call_args_list,
+            [mock.call("booking", screenshot, (200, 50, 80, 30)), mock.call("waitlist")],
+        )
+
+    def test_refresh_reuses_verified_button_position_and_falls_back_to_scroll_when_it_moved(self):
+        agent = object.__new__(self.agent_class)
+        agent._templates = SimpleNamespace(refresh=Path("조회하기.png"))
+        agent._confidence_for = mock.Mock(return_value=0.9)
+        agent._handle_refresh_click_success = mock.Mock(return_value=self.agent_module.RefreshOutcome.READY)
+        anchor = TemplateMatch(Path("조회하기.png"), left=100, top=20, width=60, height=24, score=0.98)
+        agent._screen = mock.Mock()
+        agent._screen.match_at.return_value = anchor
+        agent._refresh_anchor = anchor
+
+        self.assertEqual(agent._refresh_results(), self.agent_module.RefreshOutcome.READY)
+        agent._screen.scroll_to_top.assert_not_called()
+        agent._screen.locate_and_click.assert_not_called()
+        agent._screen.click_match.assert_called_once_with(anchor, "조회하기")
+
+        agent._screen.match_at.return_value = None
+        agent._refresh_anchor = anchor
+        agent._refresh_results()
+        agent._screen.scroll_to_top.assert_called_once()
+        agent._screen.locate_and_click.assert_called_once()
+        self.assertIsNone(agent._refresh_anchor)
+
+    def test_reservation_tick_skips_detectors_on_unchanged_idle_screen(self):
+        agent = object.__new__(self.agent_class)
+        agent._phase = self.agent_module.ScanPhase.RESERVATION
+        agent._screen = mock.Mock()
+        agent._screen.frame_digest.return_value = b"idle"
+        agent._screen.template_scale = 1.0
+        agent._screen.spatial_memory_revision = 0
+        agent._result_region = (0, 0, 64, 48)
+        agent._change_gate = self.agent_module.ChangeGate()
+        agent._tracer = self.agent_module.LatencyTracer()
+        agent._reservation_wait_deadline = None
+        agent._run_reservation_detectors = mock.Mock(return_value=False)
+        agent._log_reservation_waiting = mock.Mock()
+        agent._interruptible_sleep = mock.Mock()
+
+        agent._run_tick_body()
+        agent._run_tick_body()
+        self.assertEqual(agent._run_reservation_detectors.call_count, 1)
+        self.assertEqual(agent._change_gate.skipped_count, 1)
+
+        # 같은 화면이어도 배율/ROI/버튼 위치 기록이 바뀌면 다시 매칭한다.
+        changes = (
+            lambda: setattr(agent._screen, "template_scale", 1.25),
+            lambda: setattr(agent, "_result_region", (0, 10, 64, 38)),
+            lambda: setattr(agent._screen, "spatial_memory_revision", 1),
         )
+        for change in changes:
+            change()
+            agent._run_tick_body()
+            agent._run_tick_body()
+        self.assertEqual(agent._run_reservation_detectors.call_count, 4)
+        self.assertEqual(agent._change_gate.skipped_count, 4)
+        agent._screen.frame_digest.return_value = b"changed"
+        agent._run_tick_body()
+        self.assertEqual(agent._run_reservation_detectors.call_count, 5)
+        agent._screen.frame_digest.assert_called_with((0, 10, 64, 38))
+
+    def test_macro_task_starts_on_signal_and_stop_cancels_in_flight_wait(self):
+        agent = object.__new__(self.agent_class)
+        agent.config = SimpleNamespace(armed_warm_interval_sec=0.01)
+        agent._running_event = threading.Event()
+        agent._interrupt_event = threading.Event()
+        agent._reset_cycle_state = mock.Mock()
+        warm_threads = []
+        agent.warm_up = lambda: warm_threads.append(threading.current_thread().name)
+        tick_started = threading.Event()
+        tick_threads = []
+        tick_durations = []
+
+        def run_tick():
+            tick_threads.append(threading.current_thread().name)
+            tick_started.set()
+            started_at = time.monotonic()
+            agent._interruptible_sleep(5.0)
+            tick_durations.append(time.monotonic() - started_at)
+
+        agent.run_tick = run_tick
+
+        async def scenario():
+            agent._start_signal = asyncio.Event()
+            executor = ThreadPoolExecutor(max_workers=1)
+            task = asyncio.create_task(agent._macro_task(executor))
+            await asyncio.sleep(0.05)
+            self.assertFalse(tick_started.is_set())
+            self.assertGreaterEqual(len(warm_threads), 2)
+
+            agent.start_cycle()
+            agent._start_signal.set()
+            await asyncio.to_thread(tick_started.wait, 1.0)
+            agent._stop_running()
+            while not tick_durations:
+                await asyncio.sleep(0.005)
+
+            task.cancel()
+            executor.shutdown(wait=True)
+
+        asyncio.run(scenario())
+
+        self.assertEqual(len(tick_durations), 1)
+        self.assertEqual(set(warm_threads), set(tick_threads))
+        self.assertLess(tick_durations[0], 0.5)
+        self.assertFalse(agent.is_running)
+
+    def test_stop_during_adaptive_settle_returns_without_polling_the_screen_again(self):
+        from srt_macro_reservation.adaptive_settle import AdaptiveSettle
+
+        agent = object.__new__(self.agent_class)
+        agent._running_event = threading.Event()
+        agent._interrupt_event = threading.Event()
+        agent._running_event.set()
+        agent._adaptive_settle = AdaptiveSettle(base_delay_sec=5.0, max_delay_sec=5.0, poll_interval_sec=0.5)
+        agent._tracer = self.agent_module.LatencyTracer()
+        agent._result_region = (0, 40, 160, 80)
+        agent._screen = mock.Mock()
+        agent._screen.pre_click_fingerprint.return_value = np.zeros((4, 4), dtype=np.int16)
+        agent._screen.region_fingerprint.return_value = np.zeros((4, 4), dtype=np.int16)
+
+        threading.Timer(0.05, agent._stop_running).start()
+        started_at = time.monotonic()
+        agent._wait_for_results_to_settle()
+
+        self.assertLess(time.monotonic() - started_at, 0.4)
+        agent._screen.region_fingerprint.assert_not_called()
+
+    def test_adaptive_settle_keeps_fixed_delay_until_a_result_roi_is_known(self):
+        agent = object.__new__(self.agent_class)
+        agent.config = SimpleNamespace(refresh_settle_delay_sec=0.18)
+        agent._adaptive_settle = mock.Mock()
+        agent._result_region = None
+        agent._interruptible_sleep = mock.Mock()
+
+        agent._wait_for_results_to_settle()
+
+        agent._interruptible_sleep.assert_called_once_with(0.18)
+        agent._adaptive_settle.wait.assert_not_called()
+
+    def test_sessions_sharing_runtime_dir_write_separate_trace_files(self):
+        trace_files = []
+        for session_name in ("left", "right", None):
+            agent = object.__new__(self.agent_class)
+            agent._runtime_dir = Path("runtime")
+            agent.session_name = session_name
+            trace_files.append(agent._create_trace_file())
+
+        self.assertEqual(len(set(trace_files)), 3)
+        self.assertTrue(trace_files[0].name.endswith("-left.jsonl"))
+        self.assertNotIn("None", trace_files[2].name)
 
     def test_print_target_status_reports_booking_template_count_and_names(self):
         agent = object.__new__(self.agent_class)
@@ -94,16 +294,130 @@ class SRTMacroAgentTests(unittest.TestCase):
             connection_wait=None,
         )
         agent._result_region = None
+        agent._auto_roi_enabled = False
+        agent.session_name = None
 
         output = io.StringIO()
         with contextlib.redirect_stdout(output):
-            agent._print_target_status()
+            agent.print_target_status()
 
         self.assertIn(
             "- 예약하기 템플릿: 2개 (예약하기.png, 예약하기_특실.png)",
             output.getvalue(),
         )
 
+    def test_agent_import_does_not_load_capture_or_input_libraries(self):
+        loaded = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, srt_macro_reservation.srt_macro_agent; "
+                "print(sorted(name for name in ('cv2', 'PIL', 'pyautogui', 'pynput') if name in sys.modules))",
+            ],
+            cwd=Path(__file__).resolve().parents[1],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        self.assertEqual(loaded.stdout.strip(), "[]")
+
+    def test_config_import_does_not_load_numpy(self):
+        loaded = subprocess.run(
+            [sys.executable, "-c", "import sys, srt_macro_reservation.config; print('numpy' in sys.modules)"],
+            cwd=Path(__file__).resolve().parents[1],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        self.assertEqual(loaded.stdout.strip(), "False")
+
+    def test_construction_defers_capture_until_prepare_or_first_tick(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            target_dir = Path(tmpdir) / "targets"
+            target_dir.mkdir()
+            Image.fromarray(np.full((20, 40), 128, dtype=np.uint8)).save(target_dir / "조회하기.png")
+            capture = SyntheticCaptureBackend([np.full((120, 160), 255, dtype=np.uint8)])
+
+            agent = self.agent_class(
+                SRTConfig(auto_roi_enabled=False),
+                capture_backend=capture,
+                input_backend=RecordingInputBackend((160, 120)),
+                target_dir=target_dir,
+                result_region_file=Path(tmpdir) / "result_region.json",
+            )
+            self.assertIsNone(agent._screen)
+            self.assertEqual(capture.grab_count, 0)
+
+            agent.prepare()
+            agent.prepare()
+            screen = agent._screen
+            self.assertIsNotNone(screen)
+            self.assertEqual(capture.grab_count, 1)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                agent.start_cycle()
+                agent.run_tick()
+            self.assertIs(agent._screen, screen)
+
+    def test_valid_detection_profile_supplies_templates_and_roi_without_scanning_targets(self):
+        from srt_macro_reservation.detection_profile import compile_detection_profile
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            target_dir = Path(tmpdir) / "targets"
+            target_dir.mkdir()
+            Image.fromarray(np.random.default_rng(5).integers(0, 256, (20, 40), dtype=np.uint8)).save(
+                target_dir / "조회하기.png"
+            )
+            region_file = Path(tmpdir) / "result_region.json"
+            region_file.write_text('{"x": 0, "y": 40, "width": 160, "height": 80}', encoding="utf-8")
+            compile_detection_profile(region_file.with_name("detection_profile.npz"), target_dir, (320, 240), (2.0, 2.0))
+
+            with (
+                mock.patch.object(self.agent_module.TemplateStore, "load", side_effect=AssertionError("targets/ 스캔")),
+                mock.patch.object(self.agent_module, "load_manual_region", side_effect=AssertionError("ROI 파싱")),
+            ):
+                agent = self.agent_class(
+                    SRTConfig(auto_roi_enabled=False),
+                    capture_backend=SyntheticCaptureBackend([np.full((120, 160), 255, dtype=np.uint8)]),
+                    input_backend=RecordingInputBackend((160, 120)),
+                    target_dir=target_dir,
+                    result_region_file=region_file,
+                )
+            self.assertEqual(agent._templates.refresh, target_dir / "조회하기.png")
+            self.assertEqual(agent._result_region, (0, 40, 160, 80))
+
+            # 해상도가 달라도 템플릿/ROI는 그대로 쓰고, 프로필의 좌표 배율만 버린다.
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                agent.prepare()
+            self.assertEqual(agent._screen.coordinate_scale, (1.0, 1.0))
+            self.assertFalse(agent._profile_loaded)
+            self.assertIn("화면 해상도가 탐지 프로필과 달라", output.getvalue())
+            agent.close()
+
+    def test_first_tick_stops_macro_and_reports_when_prepare_fails(self):
+        class _NoDisplayInput(RecordingInputBackend):
+            def screen_size(self):
+                raise OSError("디스플레이 없음")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            agent = self.agent_class(
+                SRTConfig(auto_roi_enabled=False),
+                capture_backend=SyntheticCaptureBackend([np.zeros((4, 4), dtype=np.uint8)]),
+                input_backend=_NoDisplayInput((160, 120)),
+                target_dir=Path(tmpdir),
+                result_region_file=Path(tmpdir) / "result_region.json",
+            )
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                agent.start_cycle()
+                agent.run_tick()
+
+        self.assertFalse(agent.is_running)
+        self.assertFalse(agent._prepared)
+        self.assertIn("매크로 준비 중 예외가 발생했습니다: 디스플레이 없음", output.getvalue())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from pathlib import Path
+
+from srt_macro_reservation.booking_priority import parse_priority
+from srt_macro_reservation.models import TemplateMatch
+from srt_macro_reservation.table_scanner import CellKind, TableScanner
+
+BOOKING = Path("예약하기.png")
+WAITLIST = Path("예약대기.png")
+SOLD_OUT = Path("매진.png")
+
+# 2열(특실/일반실) 버튼 + 예약대기 열, 행 간격 60px
+FIRST_CLASS_X, STANDARD_X, WAITLIST_X = 300, 420, 540
+
+
+def _cell(image_path: Path, left: int, row: int, score: float = 0.99) -> TemplateMatch:
+    return TemplateMatch(image_path=image_path, left=left, top=100 + row * 60 + (row % 2), width=80, height=30, score=score)
+
+
+class TableScannerTests(unittest.TestCase):
+    def setUp(self):
+        self.hits = [
+            _cell(SOLD_OUT, FIRST_CLASS_X, 0),
+            _cell(SOLD_OUT, STANDARD_X, 0),
+            _cell(BOOKING, FIRST_CLASS_X, 1),
+            _cell(SOLD_OUT, STANDARD_X, 1),
+            _cell(SOLD_OUT, FIRST_CLASS_X, 2),
+            _cell(BOOKING, STANDARD_X, 2),
+            _cell(WAITLIST, WAITLIST_X, 2),
+            _cell(BOOKING, STANDARD_X, 3, score=0.80),
+        ]
+
+    def _scanner(self, priority: str) -> TableScanner:
+        return TableScanner(
+            kinds={BOOKING: CellKind.BOOKING, WAITLIST: CellKind.WAITLIST, SOLD_OUT: CellKind.SOLD_OUT},
+            confidences={CellKind.BOOKING: 0.95, CellKind.WAITLIST: 0.9, CellKind.SOLD_OUT: 0.8},
+            priority=parse_priority(priority),
+        )
+
+    def test_scan_groups_cells_into_rows_with_seat_classes(self):
+        snapshot = self._scanner("earliest").scan(self.hits)
+
+        layout = [[(cell.kind, cell.seat_class) for cell in row.cells] for row in snapshot.rows]
+        self.assertEqual(
+            layout,
+            [
+                [(CellKind.SOLD_OUT, "first"), (CellKind.SOLD_OUT, "standard")],
+                [(CellKind.BOOKING, "first"), (CellKind.SOLD_OUT, "standard")],
+                [(CellKind.SOLD_OUT, "first"), (CellKind.BOOKING, "standard"), (CellKind.WAITLIST, "standard")],
+            ],
+        )
+        self.assertEqual(snapshot.bookable_rows, 2)
+
+    def test_priority_rules_choose_row_and_seat_class(self):
+        earliest = self._scanner("earliest")
+        standard_first = self._scanner("standard,earliest")
+        latest = self._scanner("latest")
+
+        def best_row(scanner: TableScanner) -> tuple[int, str]:
+            cell = scanner.best(scanner.scan(self.hits), CellKind.BOOKING)
+            return cell.row, cell.seat_class
+
+        self.assertEqual(best_row(earliest), (1, "first"))
+        self.assertEqual(best_row(standard_first), (2, "standard"))
+        self.assertEqual(best_row(latest), (2, "standard"))
+
+    def test_parse_priority_rejects_unknown_rules(self):
+        self.assertEqual(parse_priority(" Earliest , standard "), ("earliest", "standard"))
+        self.assertEqual(parse_priority(""), ("template", "earliest"))
+        with self.assertRaises(ValueError):
+            parse_priority("cheapest")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from srt_macro_reservation.template_cache import TemplateCache
+
+
+class TemplateCacheTests(unittest.TestCase):
+    def test_get_returns_contiguous_readonly_grayscale_array_with_stats(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            image_path = Path(tmpdir) / "조회하기.png"
+            Image.new("RGB", (6, 4), (255, 0, 0)).save(image_path)
+
+            prepared = TemplateCache().get(image_path)
+
+            self.assertEqual(prepared.image.shape, (4, 6))
+            self.assertEqual(prepared.image.dtype, np.uint8)
+            self.assertTrue(prepared.image.flags.c_contiguous)
+            self.assertFalse(prepared.image.flags.writeable)
+            self.assertTrue(prepared.is_flat)
+
+    def test_preload_evicts_least_recently_used_templates_beyond_limit(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            target_dir = Path(tmpdir)
+            image_paths = tuple(target_dir / f"예약하기_{index}.png" for index in range(3))
+            for image_path in image_paths:
+                Image.new("RGB", (4, 4), "white").save(image_path)
+            missing_path = target_dir / "매진.png"
+
+            cache = TemplateCache(max_entries=2)
+            loaded_count = cache.preload(image_paths + (missing_path,))
+
+            self.assertEqual(loaded_count, 3)
+            self.assertEqual(len(cache), 2)
+            self.assertEqual(list(cache._entries), list(image_paths[1:]))
+
+    def test_scaled_variants_are_built_once_and_kept_with_the_native_entry(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            image_path = Path(tmpdir) / "조회하기.png"
+            Image.fromarray(np.random.default_rng(1).integers(0, 256, size=(20, 40, 3), dtype=np.uint8)).save(image_path)
+            cache = TemplateCache()
+
+            enlarged = cache.get(image_path, 1.25)
+            shrunk = cache.get(image_path, 0.5)
+
+            self.assertEqual(enlarged.image.shape, (25, 50))
+            self.assertEqual(shrunk.image.shape, (10, 20))
+            self.assertIs(cache.get(image_path, 1.25), enlarged)
+            self.assertEqual(cache.get(image_path).image.shape, (20, 40))
+            self.assertEqual(len(cache), 1)
+
+    def test_scaled_variants_count_toward_the_entry_limit(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            image_paths = tuple(Path(tmpdir) / f"예약하기_{index}.png" for index in range(3))
+            for index, image_path in enumerate(image_paths):
+                Image.fromarray(np.full((8, 8), index * 50, dtype=np.uint8)).save(image_path)
+            cache = TemplateCache(max_entries=4)
+
+            cache.preload(image_paths[:2])
+            cache.get(image_paths[1], 1.25)
+            cache.get(image_paths[1], 1.5)
+
+            # 원본 2개 + 변환본 2개로 상한이 찼으므로, 새 템플릿은 가장 오래 안 쓴 원본을 밀어낸다.
+            self.assertEqual(list(cache._entries), list(image_paths[:2]))
+            cache.get(image_paths[2])
+            self.assertEqual(list(cache._entries), list(image_paths[1:]))
+            cache.get(image_paths[2], 2.0)
+            self.assertEqual(list(cache._entries), [image_paths[2]])
+            self.assertEqual(cache._size, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from srt_macro_reservation.template_cache import PreparedTemplate
+from srt_macro_reservation.template_matcher import FramePyramid, MultiTemplateMatcher, pick_first_in_template_order
+
+
+def _pattern(seed: int, size: tuple[int, int] = (12, 20)) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=size, dtype=np.uint8)
+
+
+class MultiTemplateMatcherTests(unittest.TestCase):
+    def setUp(self):
+        self.standard = _pattern(1)
+        self.first_class = _pattern(2)
+        self.frame = np.full((200, 160), 255, dtype=np.uint8)
+        self.frame[120:132, 30:50] = self.standard
+        self.frame[40:52, 100:120] = self.first_class
+        self.frame[150:162, 100:120] = self.first_class
+        self.matcher = MultiTemplateMatcher(
+            (
+                PreparedTemplate.from_gray(Path("예약하기.png"), self.standard),
+                PreparedTemplate.from_gray(Path("예약하기_특실.png"), self.first_class),
+            )
+        )
+
+    def test_match_returns_every_hit_of_every_template_with_scores(self):
+        hits = self.matcher.match(self.frame, region=None, confidence=0.95)
+
+        positions = sorted((hit.image_path.name, hit.left, hit.top) for hit in hits)
+        self.assertEqual(
+            positions,
+            [
+                ("예약하기.png", 30, 120),
+                ("예약하기_특실.png", 100, 40),
+                ("예약하기_특실.png", 100, 150),
+            ],
+        )
+        self.assertTrue(all(hit.score >= 0.95 for hit in hits))
+
+    def test_match_offsets_hits_found_inside_region(self):
+        hits = self.matcher.match(self.frame, region=(90, 140, 60, 40), confidence=0.95)
+
+        self.assertEqual([(hit.left, hit.top) for hit in hits], [(100, 150)])
+
+    def test_pick_first_in_template_order_prefers_template_order_then_topmost(self):
+        hits = self.matcher.match(self.frame, region=None, confidence=0.95)
+
+        first = pick_first_in_template_order(hits, (Path("예약하기.png"), Path("예약하기_특실.png")))
+        first_class = pick_first_in_template_order(hits, (Path("예약하기_특실.png"), Path("예약하기.png")))
+
+        self.assertEqual((first.left, first.top), (30, 120))
+        self.assertEqual((first_class.left, first_class.top), (100, 40))
+
+
+class PyramidMatchTests(unittest.TestCase):
+    def setUp(self):
+        # 축소해도 모양이 유지되도록 8x8 블록으로 키운 패턴 (64x96)
+        self.button = np.kron(_pattern(3, size=(8, 12)), np.ones((8, 8), dtype=np.uint8))
+        self.frame = np.full((480, 640), 255, dtype=np.uint8)
+        self.frame[217:281, 333:429] = self.button
+        self.matcher = MultiTemplateMatcher((PreparedTemplate.from_gray(Path("매진.png"), self.button),))
+
+    def test_full_screen_pyramid_match_finds_exact_position(self):
+        hits = self.matcher.match(self.frame, region=None, confidence=0.9, pyramid=FramePyramid(self.frame))
+
+        self.assertEqual([(hit.left, hit.top) for hit in hits], [(333, 217)])
+        self.assertGreaterEqual(hits[0].score, 0.9)
+
+    def test_pyramid_match_inside_region_reports_screen_coordinates(self):
+        hits = self.matcher.match(
+            self.frame[10:, 20:],
+            region=(301, 183, 170, 130),
+            confidence=0.9,
+            origin=(20, 10),
+            pyramid=FramePyramid(self.frame[10:, 20:]),
+        )
+
+        self.assertEqual([(hit.left, hit.top) for hit in hits], [(333, 217)])
+
+    def test_pyramid_match_rejects_candidates_below_full_resolution_confidence(self):
+        # 축소본에서는 평균으로 사라지는 체커보드 잡음: 거친 단계는 통과하지만 원본 점수는 0.9 미만
+        checkerboard = (np.indices(self.button.shape).sum(axis=0) % 2 * 2 - 1) * 60
+        self.frame[217:281, 333:429] = np.clip(self.button.astype(np.int16) + checkerboard, 0, 255)
+
+        exhaustive = self.matcher.match(self.frame, region=None, confidence=0.9)
+        pyramid = self.matcher.match(self.frame, region=None, confidence=0.9, pyramid=FramePyramid(self.frame))
+
+        self.assertEqual(exhaustive, [])
+        self.assertEqual(pyramid, [])
+
+    def test_pyramid_match_keeps_every_row_when_hits_outnumber_coarse_candidates(self):
+        frame = np.full((1440, 640), 255, dtype=np.uint8)
+        tops = [60 + 150 * row for row in range(8)]
+        for top in tops:
+            frame[top : top + 64, 333:429] = self.button
+
+        exhaustive = self.matcher.match(frame, region=None, confidence=0.95)
+        pyramid = self.matcher.match(frame, region=None, confidence=0.95, pyramid=FramePyramid(frame))
+
+        self.assertEqual(sorted(hit.top for hit in exhaustive), tops)
+        self.assertEqual(sorted(hit.top for hit in pyramid), tops)
+
+
+if __name__ == "__main__":
+    unittest.main()